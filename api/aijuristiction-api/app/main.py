@@ -1,15 +1,39 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from uuid import uuid4
 
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
 
 from fastapi import FastAPI, Request, Response
 from fastapi.responses import JSONResponse
 
 from app.chat.api import router as chat_router
 
-app = FastAPI(title="AI Juristiction API", version="0.1.0")
+try:
+    from aijurisdictionagents.llm import default_client_registry
+    from aijurisdictionagents.telemetry import configure_telemetry_from_env, request_span
+except ImportError:  # pragma: no cover - the agents package is optional for this service.
+    default_client_registry = None
+    configure_telemetry_from_env = None
+    request_span = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    if configure_telemetry_from_env is not None:
+        configure_telemetry_from_env()
+    # One pooled SDK client per LLM endpoint for the whole process.
+    registry = default_client_registry() if default_client_registry is not None else None
+    app.state.llm_clients = registry
+    try:
+        yield
+    finally:
+        if registry is not None:
+            await registry.aclose()
+
+
+app = FastAPI(title="AI Juristiction API", version="0.1.0", lifespan=lifespan)
 app.include_router(chat_router)
 
 
@@ -19,7 +43,17 @@ async def request_id_middleware(
 ) -> Response:
     request_id = request.headers.get("x-request-id", str(uuid4()))
     request.state.request_id = request_id
-    response = await call_next(request)
+    if request_span is None:
+        response = await call_next(request)
+    else:
+        # Orchestration spans started while handling the request nest under this one.
+        with request_span(
+            f"{request.method} {request.url.path}",
+            request_id,
+            headers=request.headers,
+            attributes={"http.request.method": request.method, "url.path": request.url.path},
+        ):
+            response = await call_next(request)
     response.headers["x-request-id"] = request_id
     return response
 
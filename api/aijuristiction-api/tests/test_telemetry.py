@@ -0,0 +1,83 @@
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+pytest.importorskip("opentelemetry.sdk")
+telemetry = pytest.importorskip("aijurisdictionagents.telemetry")
+
+from aijurisdictionagents.agents import create_judge, create_lawyer  # noqa: E402
+from aijurisdictionagents.llm import MockLLMClient  # noqa: E402
+from aijurisdictionagents.observability import TraceRecorder  # noqa: E402
+from aijurisdictionagents.orchestration import Orchestrator  # noqa: E402
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+@pytest.fixture
+def exporter() -> Iterator[InMemorySpanExporter]:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    telemetry.configure_telemetry(provider)
+    try:
+        yield exporter
+    finally:
+        telemetry.configure_telemetry()
+
+
+@pytest.fixture
+def test_routes() -> Iterator[None]:
+    # Routes added by a test must not leak into the shared app used by other test modules.
+    routes = list(app.router.routes)
+    try:
+        yield
+    finally:
+        app.router.routes[:] = routes
+        app.openapi_schema = None
+
+
+def test_request_span_propagates_into_orchestration(
+    tmp_path: Path, exporter: InMemorySpanExporter, test_routes: None
+) -> None:
+    def consult() -> dict[str, Any]:
+        trace = TraceRecorder(tmp_path)
+        try:
+            llm = MockLLMClient()
+            result = Orchestrator(
+                lawyer=create_lawyer(llm), judge=create_judge(llm), trace=trace
+            ).run("Unpaid invoice", [], country="SK")
+        finally:
+            trace.close()
+        return {"recommendation": result.final_recommendation}
+
+    app.add_api_route("/_test/consult", consult, methods=["POST"])
+    client = TestClient(app)
+
+    response = client.post(
+        "/_test/consult",
+        headers={
+            "x-request-id": "req-42",
+            "traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-01",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["x-request-id"] == "req-42"
+    spans = exporter.get_finished_spans()
+    server = next(span for span in spans if span.name == "POST /_test/consult")
+    run = next(span for span in spans if span.name == "orchestration.run")
+    assert format(server.context.trace_id, "032x") == TRACE_ID
+    assert server.attributes["request.id"] == "req-42"
+    assert run.context.trace_id == server.context.trace_id
+    assert run.parent.span_id == server.context.span_id
+    assert run.attributes["request.id"] == "req-42"
@@ -0,0 +1,492 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from aijurisdictionagents.agents import create_judge, create_lawyer
+from aijurisdictionagents.cases import CaseSearchIndex, CaseStore
+from aijurisdictionagents.documents import DocumentIndex, load_documents, select_sources
+from aijurisdictionagents.llm import LLMClient, MockLLMClient, ReplayLLMClient
+from aijurisdictionagents.observability import TraceRecorder
+from aijurisdictionagents.orchestration import Orchestrator
+from aijurisdictionagents.schemas import Document, Message, OrchestrationResult, Source
+
+DEFAULT_CORPUS_SIZES = (10, 1_000, 100_000)
+QUICK_CORPUS_SIZES = (10, 1_000)
+DEFAULT_THRESHOLD = 0.2
+
+VOCABULARY = (
+    "contract delivery invoice payment breach damages lease tenant landlord court "
+    "claim warranty defect notice termination deadline penalty interest employer "
+    "employee wage dismissal consumer refund seller buyer liability evidence appeal "
+    "jurisdiction statute clause obligation remedy settlement mediation insurance"
+).split()
+
+Timed = Callable[[], object]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    setup: Callable[[Path], Timed]
+    rounds: int = 5
+    operations: int = 1
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    baseline_seconds: float
+    current_seconds: float
+    ratio: float
+    regressed: bool
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run orchestration and storage benchmarks.")
+    parser.add_argument("--output", type=Path, help="Write JSON results to this path.")
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Smaller corpora and fewer rounds (skips the 100k-document corpus).",
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        default=[],
+        help="Run only benchmarks whose name contains this text (repeatable).",
+    )
+    parser.add_argument("--rounds", type=int, help="Override timed rounds per benchmark.")
+    parser.add_argument(
+        "--cassette",
+        type=Path,
+        help="Replay LLM responses from a recorded cassette instead of MockLLMClient.",
+    )
+    parser.add_argument(
+        "--simulate-latency",
+        action="store_true",
+        help="With --cassette, sleep for the recorded LLM latency.",
+    )
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare against.")
+    parser.add_argument(
+        "--current",
+        type=Path,
+        help="Compare this results JSON with --compare instead of running benchmarks.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown of the median before a benchmark counts as a regression.",
+    )
+    return parser
+
+
+def default_benchmarks(
+    corpus_sizes: Sequence[int],
+    llm_factory: Callable[[], LLMClient],
+) -> list[Benchmark]:
+    benchmarks = [
+        Benchmark("orchestrator.run[advice]", _orchestrator_run(llm_factory, "advice")),
+        Benchmark("orchestrator.run[court]", _orchestrator_run(llm_factory, "court")),
+    ]
+    for size in corpus_sizes:
+        rounds = 3 if size >= 100_000 else 5
+        benchmarks.append(
+            Benchmark(f"document_index.build[{size}]", _index_build(size), rounds=rounds)
+        )
+        benchmarks.append(
+            Benchmark(
+                f"select_sources[{size}]", _select_sources(size), rounds=rounds, operations=20
+            )
+        )
+        benchmarks.append(
+            Benchmark(f"case_search.search[{size}]", _case_search(size), operations=20)
+        )
+    benchmarks.append(Benchmark("load_documents[text]", _load_text_documents, operations=200))
+    if find_spec("pypdf") is not None:
+        benchmarks.append(Benchmark("load_documents[pdf]", _load_pdf_documents, operations=20))
+    benchmarks.extend(
+        [
+            Benchmark("case_store.create_case", _create_case, rounds=20),
+            Benchmark("case_store.append_discussion[200]", _append_discussion, rounds=20),
+            Benchmark("trace_recorder.record_event", _trace_events, operations=10_000),
+        ]
+    )
+    return benchmarks
+
+
+def run_benchmark(benchmark: Benchmark, rounds: int | None = None) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="aja-bench-") as tmp:
+        timed = benchmark.setup(Path(tmp))
+        timed()
+        samples = []
+        for _ in range(rounds or benchmark.rounds):
+            started = time.perf_counter()
+            timed()
+            samples.append(time.perf_counter() - started)
+    median = statistics.median(samples)
+    return {
+        "rounds": len(samples),
+        "min_seconds": min(samples),
+        "median_seconds": median,
+        "mean_seconds": statistics.fmean(samples),
+        "stdev_seconds": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "operations": benchmark.operations,
+        "ops_per_second": benchmark.operations / median if median else None,
+    }
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float,
+) -> list[Comparison]:
+    comparisons = []
+    for name, result in current["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            continue
+        ratio = result["median_seconds"] / base["median_seconds"] if base["median_seconds"] else 1.0
+        comparisons.append(
+            Comparison(
+                name=name,
+                baseline_seconds=base["median_seconds"],
+                current_seconds=result["median_seconds"],
+                ratio=ratio,
+                regressed=ratio > 1 + threshold,
+            )
+        )
+    return comparisons
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.current is not None:
+        if args.compare is None:
+            print("Error: --current requires --compare", file=sys.stderr)
+            return 2
+        results = _read_results(args.current)
+    else:
+        results = _run(args)
+        if args.output is not None:
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+            print(f"Results saved: {args.output}")
+
+    if args.compare is None:
+        return 0
+    comparisons = compare_results(_read_results(args.compare), results, args.threshold)
+    regressions = [comparison for comparison in comparisons if comparison.regressed]
+    for comparison in comparisons:
+        marker = "REGRESSION" if comparison.regressed else "ok"
+        print(
+            f"{comparison.name:<40} {comparison.baseline_seconds * 1000:>10.2f}ms "
+            f"-> {comparison.current_seconds * 1000:>10.2f}ms  x{comparison.ratio:.2f}  {marker}"
+        )
+    print(
+        f"{len(regressions)} regression(s) above {args.threshold:.0%} "
+        f"of {len(comparisons)} compared"
+    )
+    return 1 if regressions else 0
+
+
+def _run(args: argparse.Namespace) -> dict[str, Any]:
+    corpus_sizes = QUICK_CORPUS_SIZES if args.quick else DEFAULT_CORPUS_SIZES
+    rounds = args.rounds or (2 if args.quick else None)
+    benchmarks = default_benchmarks(corpus_sizes, _llm_factory(args))
+    if args.only:
+        benchmarks = [
+            benchmark
+            for benchmark in benchmarks
+            if any(pattern in benchmark.name for pattern in args.only)
+        ]
+
+    results: dict[str, Any] = {}
+    for benchmark in benchmarks:
+        results[benchmark.name] = run_benchmark(benchmark, rounds)
+        print(f"{benchmark.name:<40} {results[benchmark.name]['median_seconds'] * 1000:>10.2f}ms")
+    return {"meta": _metadata(args), "benchmarks": results}
+
+
+def _metadata(args: argparse.Namespace) -> dict[str, Any]:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "llm": "cassette" if args.cassette else "mock",
+    }
+
+
+def _git_commit() -> str:
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def _read_results(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _llm_factory(args: argparse.Namespace) -> Callable[[], LLMClient]:
+    if args.cassette is None:
+        return MockLLMClient
+    return lambda: ReplayLLMClient(args.cassette, simulate_latency=args.simulate_latency)
+
+
+def _orchestrator_run(
+    llm_factory: Callable[[], LLMClient],
+    discussion_type: str,
+) -> Callable[[Path], Timed]:
+    def setup(root: Path) -> Timed:
+        documents = _synthetic_documents(50, random.Random(7))
+        index = DocumentIndex(documents)
+        runs = iter(range(1_000_000))
+
+        def run() -> None:
+            run_dir = root / f"run-{next(runs)}"
+            run_dir.mkdir()
+            llm = llm_factory()
+            trace = TraceRecorder(run_dir)
+            try:
+                Orchestrator(
+                    lawyer=create_lawyer(llm),
+                    judge=create_judge(llm),
+                    trace=trace,
+                ).run(
+                    "The supplier delivered late and the invoice includes a contract penalty.",
+                    documents,
+                    country="SK",
+                    discussion_type=discussion_type,
+                    document_index=index,
+                )
+            finally:
+                trace.close()
+
+        return run
+
+    return setup
+
+
+def _index_build(size: int) -> Callable[[Path], Timed]:
+    def setup(root: Path) -> Timed:
+        documents = _synthetic_documents(size, random.Random(size))
+        return lambda: DocumentIndex(documents)
+
+    return setup
+
+
+def _select_sources(size: int) -> Callable[[Path], Timed]:
+    def setup(root: Path) -> Timed:
+        rng = random.Random(size)
+        documents = _synthetic_documents(size, rng)
+        index = DocumentIndex(documents)
+        queries = [" ".join(rng.sample(VOCABULARY, 4)) for _ in range(20)]
+
+        def run() -> None:
+            for query in queries:
+                select_sources(documents, query, index=index)
+
+        return run
+
+    return setup
+
+
+def _case_search(size: int) -> Callable[[Path], Timed]:
+    def setup(root: Path) -> Timed:
+        rng = random.Random(size)
+        parties = size // 10 + 1
+        index = CaseSearchIndex(root / "search.sqlite3")
+        for position in range(size):
+            case_id = f"CASE-{position:06d}"
+            party = f"party{rng.randrange(parties)}"
+            index.add_case(case_id, f"{_sentence(rng)} Dispute with {party}.")
+            index.add_discussion(
+                case_id,
+                {
+                    "summary": _sentence(rng),
+                    "questions_asked": [_sentence(rng)],
+                    "client_answers": [f"{_sentence(rng)} Signed by {party}."],
+                },
+            )
+        # A legal term plus a party name, like a lawyer looking up a client's earlier matter.
+        queries = [
+            f"{rng.choice(VOCABULARY)} party{rng.randrange(parties)}" for _ in range(20)
+        ]
+
+        def run() -> None:
+            for query in queries:
+                index.search(query)
+
+        return run
+
+    return setup
+
+
+def _load_text_documents(root: Path) -> Timed:
+    rng = random.Random(1)
+    for position in range(200):
+        (root / f"doc-{position:03d}.txt").write_text(_paragraphs(rng, 20), encoding="utf-8")
+    return lambda: load_documents(root)
+
+
+def _load_pdf_documents(root: Path) -> Timed:
+    rng = random.Random(2)
+    for position in range(20):
+        _write_pdf(root / f"doc-{position:02d}.pdf", [_sentence(rng) for _ in range(40)])
+    return lambda: load_documents(root, allow_pdf=True)
+
+
+def _create_case(root: Path) -> Timed:
+    store = CaseStore(root / "cases")
+    messages, result = _discussion()
+    case_ids = iter(range(1_000_000))
+
+    def run() -> None:
+        store.create_case(
+            instruction="Late delivery penalty",
+            country="SK",
+            language=None,
+            messages=messages,
+            result=result,
+            agent_name="Lawyer",
+            data_dir=None,
+            case_id=f"CASE-{next(case_ids):06d}",
+        )
+
+    return run
+
+
+def _append_discussion(root: Path) -> Timed:
+    store = CaseStore(root / "cases")
+    messages, result = _discussion()
+    case = store.create_case(
+        instruction="Late delivery penalty",
+        country="SK",
+        language=None,
+        messages=messages,
+        result=result,
+        agent_name="Lawyer",
+        data_dir=None,
+        case_id="CASE-000001",
+    )
+
+    def run() -> None:
+        store.append_discussion(
+            case_id=case.case_id,
+            messages=messages,
+            result=result,
+            agent_name="Lawyer",
+            data_dir=None,
+        )
+
+    for _ in range(200):
+        run()
+    return run
+
+
+def _trace_events(root: Path) -> Timed:
+    runs = iter(range(1_000_000))
+    payload = {"question": "Which court has jurisdiction?", "timeout_seconds": 300}
+
+    def run() -> None:
+        run_dir = root / f"trace-{next(runs)}"
+        run_dir.mkdir()
+        trace = TraceRecorder(run_dir)
+        try:
+            for _ in range(10_000):
+                trace.record_event("user_timeout", payload)
+        finally:
+            trace.close()
+
+    return run
+
+
+def _discussion() -> tuple[list[Message], OrchestrationResult]:
+    rng = random.Random(3)
+    sources = [Source(filename="contract.txt", snippet=_sentence(rng))]
+    messages = [Message(role="user", agent_name="User", content=_sentence(rng))]
+    for turn in range(6):
+        agent = "Lawyer" if turn % 2 == 0 else "Judge"
+        messages.append(
+            Message(
+                role="assistant",
+                agent_name=agent,
+                content=_paragraphs(rng, 2) + " Which deadline applies?",
+                sources=sources,
+            )
+        )
+    result = OrchestrationResult(
+        final_recommendation=_sentence(rng),
+        judge_rationale=_sentence(rng),
+        citations=sources,
+        messages=messages,
+    )
+    return messages, result
+
+
+def _synthetic_documents(count: int, rng: random.Random) -> list[Document]:
+    return [
+        Document(
+            doc_id=f"doc-{position}",
+            path=f"synthetic/doc-{position}.txt",
+            content=" ".join(rng.choices(VOCABULARY, k=60)),
+        )
+        for position in range(count)
+    ]
+
+
+def _sentence(rng: random.Random) -> str:
+    return " ".join(rng.choices(VOCABULARY, k=12)).capitalize() + "."
+
+
+def _paragraphs(rng: random.Random, count: int) -> str:
+    return "\n\n".join(" ".join(_sentence(rng) for _ in range(5)) for _ in range(count))
+
+
+def _write_pdf(path: Path, lines: Sequence[str]) -> None:
+    text = " ".join(f"({line}) '" for line in lines)
+    stream = f"BT /F1 10 Tf 40 760 Td 12 TL {text} ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    body = b"%PDF-1.4\n"
+    offsets = []
+    for number, content in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{content}\nendobj\n".encode("latin-1")
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    body += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    ).encode("latin-1")
+    path.write_bytes(body)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
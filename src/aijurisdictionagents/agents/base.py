@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Sequence
+from typing import AsyncIterator, Iterator, Sequence
 
-from ..llm import LLMClient
+from ..llm import LLMClient, complete_async, stream_completion, stream_completion_async
 from ..schemas import Document, Message, Source
 
 
@@ -28,3 +28,41 @@ class Agent:
             content=content,
             sources=list(sources),
         )
+
+    async def arespond(
+        self,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+        sources: Sequence[Source],
+        system_prompt_override: str | None = None,
+    ) -> Message:
+        prompt = system_prompt_override or self.system_prompt
+        content = await complete_async(self.llm, self.name, prompt, conversation, documents)
+        return Message(
+            role="assistant",
+            agent_name=self.name,
+            content=content,
+            sources=list(sources),
+        )
+
+    def respond_stream(
+        self,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+        system_prompt_override: str | None = None,
+    ) -> Iterator[Message]:
+        prompt = system_prompt_override or self.system_prompt
+        for delta in stream_completion(self.llm, self.name, prompt, conversation, documents):
+            yield Message(role="assistant", agent_name=self.name, content=delta)
+
+    async def arespond_stream(
+        self,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+        system_prompt_override: str | None = None,
+    ) -> AsyncIterator[Message]:
+        prompt = system_prompt_override or self.system_prompt
+        async for delta in stream_completion_async(
+            self.llm, self.name, prompt, conversation, documents
+        ):
+            yield Message(role="assistant", agent_name=self.name, content=delta)
@@ -0,0 +1,697 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Set, TextIO, Tuple
+
+from dotenv import load_dotenv
+
+from .agents import create_judge, create_lawyer_agent
+from .documents import DEFAULT_CHUNK_SIZE, DocumentIndex, load_documents
+from .llm import (
+    BatchEndpoint,
+    BatchResult,
+    DeadlineExceeded,
+    LLMClient,
+    LocalBatchEndpoint,
+    batch_request_body,
+    get_batch_llm_client,
+    get_llm_client,
+)
+from .llm.batch_api import TERMINAL_BATCH_STATUSES, batch_request_line, write_batch_file
+from .observability import TraceRecorder, create_run_dir, setup_logging
+from .orchestration import AgentTurn, Orchestrator, ParallelSteps, SummaryTurn, UserPrompt
+from .orchestration.orchestrator import OrchestrationStep, StepGenerator
+from .schemas import Document, Message, OrchestrationResult
+from .telemetry import configure_telemetry_from_env
+
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class BatchCase:
+    case_id: str
+    instruction: str
+    country: str
+    language: str | None = None
+    data_dir: str | None = None
+    discussion_type: str = "advice"
+
+
+@dataclass(frozen=True)
+class BatchOptions:
+    run_dir: Path
+    concurrency: int = 8
+    allow_pdf: bool = False
+    extraction_cache_dir: Path | None = None
+    chunk_size: int | None = DEFAULT_CHUNK_SIZE
+    max_discussion_minutes: float = 15
+    history_keep_messages: int | None = None
+    speculative_summary: bool = False
+
+
+def read_cases(path: Path) -> List[BatchCase]:
+    cases: List[BatchCase] = []
+    seen: Set[str] = set()
+    with path.open(encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            case_id = str(record.get("case_id") or f"line-{line_number}")
+            instruction = (record.get("instruction") or "").strip()
+            country = (record.get("country") or "").strip()
+            if not instruction or not country:
+                raise ValueError(f"{path}:{line_number}: instruction and country are required")
+            if case_id in seen:
+                raise ValueError(f"{path}:{line_number}: duplicate case_id '{case_id}'")
+            seen.add(case_id)
+            cases.append(
+                BatchCase(
+                    case_id=case_id,
+                    instruction=instruction,
+                    country=country,
+                    language=record.get("language") or None,
+                    data_dir=record.get("data_dir") or None,
+                    discussion_type=record.get("discussion_type") or "advice",
+                )
+            )
+    return cases
+
+
+def completed_case_ids(output_path: Path) -> Set[str]:
+    if not output_path.exists():
+        return set()
+    completed: Set[str] = set()
+    with output_path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash can leave a torn last line; that case simply runs again.
+                continue
+            if record.get("status") == COMPLETED:
+                completed.add(str(record.get("case_id")))
+    return completed
+
+
+def build_orchestrator(
+    case: BatchCase,
+    llm: LLMClient,
+    trace: TraceRecorder,
+    logger: logging.Logger,
+    options: BatchOptions,
+) -> Orchestrator:
+    judge = create_judge(llm) if case.discussion_type == "court" else None
+    return Orchestrator(
+        lawyer=create_lawyer_agent(llm, case.country),
+        judge=judge,
+        trace=trace,
+        logger=logger,
+        history_keep_messages=options.history_keep_messages,
+        speculative_summary=options.speculative_summary,
+    )
+
+
+def case_trace_dir(run_dir: Path, case_id: str) -> Path:
+    trace_dir = run_dir / "cases" / re.sub(r"[^\w.-]", "_", case_id)
+    trace_dir.mkdir(parents=True, exist_ok=True)
+    return trace_dir
+
+
+def result_record(
+    case: BatchCase,
+    result: OrchestrationResult,
+    trace_dir: Path,
+    elapsed_seconds: float,
+) -> Dict[str, Any]:
+    return {
+        "case_id": case.case_id,
+        "status": COMPLETED,
+        "final_recommendation": result.final_recommendation,
+        "judge_rationale": result.judge_rationale,
+        "citations": [source.__dict__ for source in result.citations],
+        "trace_dir": str(trace_dir),
+        "elapsed_seconds": round(elapsed_seconds, 3),
+    }
+
+
+def failure_record(case: BatchCase, exc: BaseException) -> Dict[str, Any]:
+    return {
+        "case_id": case.case_id,
+        "status": FAILED,
+        "error": f"{type(exc).__name__}: {exc}",
+    }
+
+
+def submissions_path(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.stem}.batches.jsonl")
+
+
+def submitted_batches(path: Path) -> List[Dict[str, Any]]:
+    if not path.exists():
+        return []
+    submitted: List[Dict[str, Any]] = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                submitted.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return submitted
+
+
+def write_record(handle: TextIO, record: Dict[str, Any]) -> None:
+    handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+    handle.flush()
+    os.fsync(handle.fileno())
+
+
+def _ends_mid_line(path: Path) -> bool:
+    with path.open("rb") as handle:
+        handle.seek(0, os.SEEK_END)
+        if handle.tell() == 0:
+            return False
+        handle.seek(-1, os.SEEK_END)
+        return handle.read(1) != b"\n"
+
+
+class DocumentCache:
+    def __init__(self, options: BatchOptions, cases: Sequence[BatchCase]) -> None:
+        self.options = options
+        self._loads: Dict[str | None, asyncio.Task[Tuple[List[Document], DocumentIndex]]] = {}
+        self._loaded: Dict[str | None, Tuple[List[Document], DocumentIndex]] = {}
+        self._users = Counter(case.data_dir for case in cases)
+
+    async def get(self, data_dir: str | None) -> Tuple[List[Document], DocumentIndex]:
+        task = self._loads.get(data_dir)
+        if task is None:
+            task = asyncio.ensure_future(asyncio.to_thread(self.load, data_dir))
+            self._loads[data_dir] = task
+        return await task
+
+    def load(self, data_dir: str | None) -> Tuple[List[Document], DocumentIndex]:
+        if data_dir in self._loaded:
+            return self._loaded[data_dir]
+        documents: List[Document] = []
+        if data_dir is not None:
+            documents = load_documents(
+                Path(data_dir),
+                allow_pdf=self.options.allow_pdf,
+                cache_dir=self.options.extraction_cache_dir,
+                chunk_size=self.options.chunk_size,
+            )
+        self._loaded[data_dir] = (documents, DocumentIndex(documents))
+        return self._loaded[data_dir]
+
+    def release(self, data_dir: str | None) -> None:
+        # Drop a folder's documents once the last case that uses it has finished.
+        self._users[data_dir] -= 1
+        if self._users[data_dir] <= 0:
+            del self._users[data_dir]
+            self._loads.pop(data_dir, None)
+            self._loaded.pop(data_dir, None)
+
+
+async def run_batch(
+    cases: Sequence[BatchCase],
+    output_path: Path,
+    llm: LLMClient,
+    options: BatchOptions,
+    logger: logging.Logger | None = None,
+) -> Dict[str, int]:
+    logger = logger or logging.getLogger(__name__)
+    done = completed_case_ids(output_path)
+    pending = [case for case in cases if case.case_id not in done]
+    logger.info("Batch: %d cases, %d already completed", len(cases), len(cases) - len(pending))
+
+    semaphore = asyncio.Semaphore(max(1, options.concurrency))
+    documents = DocumentCache(options, pending)
+    counts = {COMPLETED: 0, FAILED: 0, "skipped": len(cases) - len(pending)}
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with output_path.open("a", encoding="utf-8") as handle:
+        if _ends_mid_line(output_path):
+            # Terminate a torn line left by a crash so the next record parses.
+            handle.write("\n")
+
+        async def run_case(case: BatchCase) -> None:
+            async with semaphore:
+                started = time.monotonic()
+                trace_dir = case_trace_dir(options.run_dir, case.case_id)
+                trace = TraceRecorder(trace_dir)
+                try:
+                    case_documents, index = await documents.get(case.data_dir)
+                    orchestrator = build_orchestrator(case, llm, trace, logger, options)
+                    result = await orchestrator.arun(
+                        case.instruction,
+                        case_documents,
+                        country=case.country,
+                        language=case.language,
+                        max_discussion_minutes=options.max_discussion_minutes,
+                        discussion_type=case.discussion_type,
+                        document_index=index,
+                    )
+                except Exception as exc:
+                    logger.exception("Batch case %s failed", case.case_id)
+                    record = failure_record(case, exc)
+                else:
+                    record = result_record(case, result, trace_dir, time.monotonic() - started)
+                finally:
+                    trace.close()
+                    documents.release(case.data_dir)
+            write_record(handle, record)
+            counts[record["status"]] += 1
+
+        await asyncio.gather(*(run_case(case) for case in pending))
+
+    logger.info(
+        "Batch finished: %d completed, %d failed, %d skipped",
+        counts[COMPLETED],
+        counts[FAILED],
+        counts["skipped"],
+    )
+    return counts
+
+
+LLMCall = AgentTurn | SummaryTurn
+
+
+@dataclass
+class BatchDiscussion:
+    case: BatchCase
+    steps: StepGenerator
+    trace: TraceRecorder
+    trace_dir: Path
+    started: float
+    step: OrchestrationStep | None = None
+    result: OrchestrationResult | None = None
+    turns: int = 0
+    outcomes: List[Any] = field(default_factory=list)
+    custom_ids: Dict[int, str] = field(default_factory=dict)
+    requests: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def run_batch_api(
+    cases: Sequence[BatchCase],
+    output_path: Path,
+    llm: LLMClient,
+    endpoint: BatchEndpoint,
+    options: BatchOptions,
+    logger: logging.Logger | None = None,
+    poll_seconds: float = 30.0,
+) -> Dict[str, int]:
+    logger = logger or logging.getLogger(__name__)
+    done = completed_case_ids(output_path)
+    pending = [case for case in cases if case.case_id not in done]
+    logger.info("Batch API: %d cases, %d already completed", len(cases), len(cases) - len(pending))
+
+    documents = DocumentCache(options, pending)
+    counts = {COMPLETED: 0, FAILED: 0, "skipped": len(cases) - len(pending)}
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    batches_path = submissions_path(output_path)
+    submitted = submitted_batches(batches_path)
+
+    with (
+        output_path.open("a", encoding="utf-8") as handle,
+        batches_path.open("a", encoding="utf-8") as submissions,
+    ):
+        for path, stream in ((output_path, handle), (batches_path, submissions)):
+            if _ends_mid_line(path):
+                stream.write("\n")
+
+        def advance(discussion: BatchDiscussion, reply: Any) -> bool:
+            try:
+                _advance(discussion, reply, endpoint.url)
+            except Exception as exc:
+                logger.error("Batch case %s failed: %s", discussion.case.case_id, exc)
+                record = failure_record(discussion.case, exc)
+            else:
+                if discussion.result is None:
+                    return True
+                record = result_record(
+                    discussion.case,
+                    discussion.result,
+                    discussion.trace_dir,
+                    time.monotonic() - discussion.started,
+                )
+            discussion.trace.close()
+            documents.release(discussion.case.data_dir)
+            write_record(handle, record)
+            counts[record["status"]] += 1
+            return False
+
+        active: List[BatchDiscussion] = []
+        for case in pending:
+            trace_dir = case_trace_dir(options.run_dir, case.case_id)
+            trace = TraceRecorder(trace_dir)
+            discussion = BatchDiscussion(
+                case,
+                _case_steps(case, llm, trace, logger, options, documents),
+                trace,
+                trace_dir,
+                time.monotonic(),
+            )
+            if advance(discussion, None):
+                active.append(discussion)
+
+        round_number = 0
+        while active:
+            round_number += 1
+            lines = [request for discussion in active for request in discussion.requests]
+            custom_ids = {line["custom_id"] for line in lines}
+            batch_id = _resumable_batch(submitted, custom_ids)
+            if batch_id is not None:
+                # A previous process submitted these requests; reattach instead of paying twice.
+                logger.info("Batch round %d: reattached to %s", round_number, batch_id)
+            else:
+                input_path = write_batch_file(
+                    options.run_dir / "batches" / f"round-{round_number:03d}.jsonl", lines
+                )
+                batch_id = endpoint.submit(input_path)
+                write_record(
+                    submissions,
+                    {
+                        "batch_id": batch_id,
+                        "round": round_number,
+                        "case_ids": sorted(discussion.case.case_id for discussion in active),
+                        "custom_ids": sorted(custom_ids),
+                    },
+                )
+                logger.info(
+                    "Batch round %d: submitted %s with %d requests for %d cases",
+                    round_number,
+                    batch_id,
+                    len(lines),
+                    len(active),
+                )
+            status = _wait_for_batch(endpoint, batch_id, poll_seconds)
+            results = endpoint.results(batch_id)
+            logger.info("Batch round %d: %s with %d results", round_number, status, len(results))
+
+            active = [
+                discussion
+                for discussion in active
+                if advance(discussion, _round_reply(discussion, results, status))
+            ]
+
+    logger.info(
+        "Batch API finished: %d completed, %d failed, %d skipped",
+        counts[COMPLETED],
+        counts[FAILED],
+        counts["skipped"],
+    )
+    return counts
+
+
+def _case_steps(
+    case: BatchCase,
+    llm: LLMClient,
+    trace: TraceRecorder,
+    logger: logging.Logger,
+    options: BatchOptions,
+    documents: DocumentCache,
+) -> StepGenerator:
+    case_documents, index = documents.load(case.data_dir)
+    orchestrator = build_orchestrator(case, llm, trace, logger, options)
+    return (
+        yield from orchestrator.steps(
+            case.instruction,
+            case_documents,
+            case.country,
+            language=case.language,
+            max_discussion_minutes=options.max_discussion_minutes,
+            discussion_type=case.discussion_type,
+            document_index=index,
+        )
+    )
+
+
+def _advance(discussion: BatchDiscussion, reply: Any, url: str) -> None:
+    # Feed replies until the discussion needs a provider result or finishes.
+    while True:
+        try:
+            if isinstance(reply, BaseException):
+                step = discussion.steps.throw(reply)
+            else:
+                step = discussion.steps.send(reply)
+        except StopIteration as stop:
+            discussion.result = stop.value
+            discussion.step = None
+            return
+        if isinstance(step, UserPrompt):
+            # Batch runs are non-interactive, like run() without a response provider.
+            reply = None
+            continue
+        discussion.step = step
+        calls = _llm_calls(step)
+        discussion.outcomes = [
+            DeadlineExceeded("Discussion deadline passed before submission")
+            if _deadline_passed(call)
+            else None
+            for call in calls
+        ]
+        if any(outcome is None for outcome in discussion.outcomes):
+            _prepare_requests(discussion, calls, url)
+            return
+        reply = _step_reply(step, discussion.outcomes)
+
+
+def _llm_calls(step: OrchestrationStep) -> List[LLMCall]:
+    if isinstance(step, ParallelSteps):
+        return list(step.steps)
+    if isinstance(step, (AgentTurn, SummaryTurn)):
+        return [step]
+    raise TypeError(f"Unsupported orchestration step: {type(step).__name__}")
+
+
+def _deadline_passed(call: LLMCall) -> bool:
+    return (
+        isinstance(call, AgentTurn)
+        and call.deadline is not None
+        and time.monotonic() >= call.deadline
+    )
+
+
+def _prepare_requests(discussion: BatchDiscussion, calls: Sequence[LLMCall], url: str) -> None:
+    discussion.turns += 1
+    discussion.custom_ids = {}
+    discussion.requests = []
+    for position, call in enumerate(calls):
+        if discussion.outcomes[position] is not None:
+            continue
+        custom_id = f"{discussion.case.case_id}/{discussion.turns}/{position}"
+        if isinstance(call, AgentTurn):
+            body = batch_request_body(
+                call.agent.llm,
+                call.agent.name,
+                call.system_prompt,
+                call.conversation,
+                call.documents,
+            )
+        else:
+            body = batch_request_body(
+                call.llm,
+                call.agent_name,
+                call.system_prompt,
+                call.conversation,
+                call.documents,
+            )
+        discussion.custom_ids[position] = custom_id
+        discussion.requests.append(batch_request_line(custom_id, body, url))
+
+
+def _round_reply(
+    discussion: BatchDiscussion,
+    results: Dict[str, BatchResult],
+    status: str,
+) -> Any:
+    assert discussion.step is not None
+    calls = _llm_calls(discussion.step)
+    outcomes = list(discussion.outcomes)
+    for position, custom_id in discussion.custom_ids.items():
+        result = results.get(custom_id)
+        if result is None:
+            outcomes[position] = RuntimeError(f"Batch request {custom_id} missing ({status})")
+        elif result.error is not None:
+            outcomes[position] = RuntimeError(f"Batch request {custom_id} failed: {result.error}")
+        else:
+            outcomes[position] = _call_reply(calls[position], result.content or "")
+    return _step_reply(discussion.step, outcomes)
+
+
+def _call_reply(call: LLMCall, content: str) -> Any:
+    if isinstance(call, SummaryTurn):
+        return content
+    return Message(
+        role="assistant",
+        agent_name=call.agent.name,
+        content=content,
+        sources=list(call.sources),
+    )
+
+
+def _step_reply(step: OrchestrationStep, outcomes: Sequence[Any]) -> Any:
+    if isinstance(step, ParallelSteps):
+        return tuple(outcomes)
+    return outcomes[0]
+
+
+def _resumable_batch(submitted: Sequence[Dict[str, Any]], custom_ids: Set[str]) -> str | None:
+    # Cases that finished before the crash drop out, so a resumed round can be a subset.
+    for entry in reversed(submitted):
+        if custom_ids <= set(entry.get("custom_ids", [])):
+            return str(entry["batch_id"])
+    return None
+
+
+def _wait_for_batch(endpoint: BatchEndpoint, batch_id: str, poll_seconds: float) -> str:
+    while True:
+        status = endpoint.status(batch_id)
+        if status in TERMINAL_BATCH_STATUSES:
+            return status
+        time.sleep(poll_seconds)
+
+
+def main() -> int:
+    load_dotenv()
+    configure_telemetry_from_env()
+    parser = argparse.ArgumentParser(description="Run many legal discussions from a JSONL file.")
+    parser.add_argument(
+        "--input",
+        type=Path,
+        required=True,
+        help="JSONL with case_id, instruction, country, language, data_dir, discussion_type.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        required=True,
+        help="JSONL results file; completed case IDs found here are skipped on rerun.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of discussions in flight.",
+    )
+    parser.add_argument(
+        "--runs-dir",
+        type=Path,
+        default=Path("runs"),
+        help="Directory for the batch run folder with per-case traces.",
+    )
+    parser.add_argument(
+        "--allow-pdf",
+        action="store_true",
+        help="Enable PDF ingestion (requires pypdf).",
+    )
+    parser.add_argument(
+        "--extraction-cache-dir",
+        type=Path,
+        default=Path(".cache/extractions"),
+        help="Directory for cached PDF text extraction.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Load documents as lazily read chunks of this many bytes (0 = whole files).",
+    )
+    parser.add_argument(
+        "--discussion-max-minutes",
+        type=float,
+        default=None,
+        help="Max minutes per case (0 = unlimited; default 15, or 0 with --batch-api).",
+    )
+    parser.add_argument(
+        "--history-keep-messages",
+        type=int,
+        default=0,
+        help="Keep this many recent messages verbatim and summarize older ones (0 = off).",
+    )
+    parser.add_argument(
+        "--speculative-summary",
+        action="store_true",
+        help="Court mode: draft the final summary while the judge reviews.",
+    )
+    parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        help="Submit every turn through the provider Batch API instead of live requests.",
+    )
+    parser.add_argument(
+        "--batch-dir",
+        type=Path,
+        default=None,
+        help="Use a local file-based batch endpoint in this directory (offline testing).",
+    )
+    parser.add_argument(
+        "--batch-poll-seconds",
+        type=float,
+        default=30,
+        help="Seconds between batch status polls.",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default="INFO",
+        help="Logging level (DEBUG, INFO, WARNING, ERROR).",
+    )
+    args = parser.parse_args()
+
+    cases = read_cases(args.input)
+    run_dir = create_run_dir(args.runs_dir)
+    logger = setup_logging(run_dir, log_level=args.log_level)
+    logger.info("Run directory: %s", run_dir)
+    max_minutes = args.discussion_max_minutes
+    if max_minutes is None:
+        # Provider batches can take hours, so the wall-clock limit is off by default there.
+        max_minutes = 0 if args.batch_api else 15
+    options = BatchOptions(
+        run_dir=run_dir,
+        concurrency=args.concurrency,
+        allow_pdf=args.allow_pdf,
+        extraction_cache_dir=args.extraction_cache_dir,
+        chunk_size=args.chunk_size or None,
+        max_discussion_minutes=max_minutes,
+        history_keep_messages=args.history_keep_messages or None,
+        speculative_summary=args.speculative_summary,
+    )
+    if args.batch_api:
+        llm = get_batch_llm_client()
+        endpoint: BatchEndpoint
+        if args.batch_dir is not None:
+            endpoint = LocalBatchEndpoint(args.batch_dir)
+        elif hasattr(llm, "batch_endpoint"):
+            endpoint = llm.batch_endpoint()
+        else:
+            raise ValueError(f"{type(llm).__name__} has no Batch API endpoint; pass --batch-dir.")
+        logger.info("Batch API client: %s via %s", type(llm).__name__, type(endpoint).__name__)
+        counts = run_batch_api(
+            cases,
+            args.output,
+            llm,
+            endpoint,
+            options,
+            logger,
+            poll_seconds=args.batch_poll_seconds,
+        )
+    else:
+        llm = get_llm_client()
+        logger.info("Batch LLM client: %s", type(llm).__name__)
+        counts = asyncio.run(run_batch(cases, args.output, llm, options, logger))
+    return 1 if counts[FAILED] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
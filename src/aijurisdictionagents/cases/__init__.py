@@ -1,3 +1,20 @@
-from .store import CaseRecord, CaseStore
+from .blobs import Blob, BlobStore
+from .migrate import MigrationReport, migrate_case_folders
+from .search import CaseSearchIndex, SearchHit, rebuild_search_index
+from .sqlite_store import SQLiteCaseStore, case_store_from_env
+from .store import CaseConflict, CaseRecord, CaseStore
 
-__all__ = ["CaseRecord", "CaseStore"]
+__all__ = [
+    "Blob",
+    "BlobStore",
+    "CaseConflict",
+    "CaseRecord",
+    "CaseSearchIndex",
+    "CaseStore",
+    "MigrationReport",
+    "SQLiteCaseStore",
+    "SearchHit",
+    "case_store_from_env",
+    "migrate_case_folders",
+    "rebuild_search_index",
+]
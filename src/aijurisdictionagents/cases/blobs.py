@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import stat
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no reflink ioctl.
+    fcntl = None
+
+CHUNK_SIZE = 1024 * 1024
+FICLONE = 0x40049409
+READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+@dataclass(frozen=True)
+class Blob:
+    digest: str
+    size: int
+    path: Path
+
+
+class BlobStore:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._digests: Dict[Tuple[str, int, int, int], str] = {}
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, source: Path) -> Blob:
+        # Hash with a read-only pass first so re-attached files never cost a copy.
+        digest, size = self._digest(source)
+        blob_path = self.path_for(digest)
+        if blob_path.exists():
+            return Blob(digest=digest, size=size, path=blob_path)
+        return self._store(source)
+
+    def _digest(self, source: Path) -> Tuple[str, int]:
+        info = source.stat()
+        key = (str(source.resolve()), info.st_ino, info.st_size, info.st_mtime_ns)
+        cached = self._digests.get(key)
+        if cached is not None:
+            return cached, info.st_size
+        digest = hashlib.sha256()
+        with source.open("rb") as reader:
+            while chunk := reader.read(CHUNK_SIZE):
+                digest.update(chunk)
+        self._digests[key] = digest.hexdigest()
+        return digest.hexdigest(), info.st_size
+
+    def _store(self, source: Path) -> Blob:
+        self.root.mkdir(parents=True, exist_ok=True)
+        temp_path = self.root / f".{uuid.uuid4().hex}.tmp"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            # Hash again while copying: the stored name must match the bytes actually copied.
+            with source.open("rb") as reader, temp_path.open("wb") as writer:
+                while chunk := reader.read(CHUNK_SIZE):
+                    digest.update(chunk)
+                    writer.write(chunk)
+                    size += len(chunk)
+            blob_path = self.path_for(digest.hexdigest())
+            if not blob_path.exists():
+                blob_path.parent.mkdir(exist_ok=True)
+                # Blobs are shared through hard links, so nobody may edit them in place.
+                os.chmod(temp_path, READ_ONLY)
+                os.replace(temp_path, blob_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+        return Blob(digest=digest.hexdigest(), size=size, path=blob_path)
+
+    def link(self, blob: Blob, target: Path) -> None:
+        try:
+            os.link(blob.path, target)
+            return
+        except OSError:
+            pass
+        if not _reflink(blob.path, target):
+            shutil.copyfile(blob.path, target)
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    if fcntl is None:
+        return False
+    with source.open("rb") as reader, target.open("xb") as writer:
+        try:
+            fcntl.ioctl(writer.fileno(), FICLONE, reader.fileno())
+            return True
+        except OSError:
+            pass
+    target.unlink()
+    return False
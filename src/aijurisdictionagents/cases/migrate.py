@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import argparse
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+from .sqlite_store import DEFAULT_DB_NAME, SQLiteCaseStore
+from .store import JOURNAL_FILENAME, LOCK_FILENAME, CaseRecord, CaseStore
+
+
+@dataclass
+class MigrationReport:
+    imported: int = 0
+    skipped: int = 0
+    failed: List[str] = field(default_factory=list)
+
+
+def migrate_case_folders(source: Path, store: SQLiteCaseStore) -> MigrationReport:
+    report = MigrationReport()
+    if not source.exists():
+        return report
+    copy_files = source.resolve() != store.root.resolve()
+    folders = CaseStore(source)
+    for case_dir in sorted(source.iterdir()):
+        if not (case_dir / "case.json").is_file():
+            continue
+        try:
+            # load_case replays the journal tail on top of the case.json snapshot.
+            data = folders.load_case(case_dir.name).data
+        except (OSError, ValueError):
+            report.failed.append(case_dir.name)
+            continue
+        target_dir = store.root / case_dir.name
+        if copy_files:
+            shutil.copytree(
+                case_dir,
+                target_dir,
+                ignore=shutil.ignore_patterns("case.json", JOURNAL_FILENAME, LOCK_FILENAME),
+                dirs_exist_ok=True,
+            )
+        if store.import_case(CaseRecord(case_id=case_dir.name, path=target_dir, data=data)):
+            report.imported += 1
+        else:
+            report.skipped += 1
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Import case.json folders into a SQLite case store."
+    )
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=Path("cases"),
+        help="Folder with one <case_id>/case.json directory per case.",
+    )
+    parser.add_argument(
+        "--target",
+        type=Path,
+        default=None,
+        help="Case root for the SQLite store (defaults to --source; files are copied otherwise).",
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=None,
+        help=f"SQLite database path (defaults to <target>/{DEFAULT_DB_NAME}).",
+    )
+    args = parser.parse_args()
+
+    store = SQLiteCaseStore(args.target or args.source, args.db)
+    try:
+        report = migrate_case_folders(args.source, store)
+    finally:
+        store.close()
+    print(
+        f"Imported {report.imported} case(s), skipped {report.skipped} already present, "
+        f"{len(report.failed)} failed."
+    )
+    for case_id in report.failed:
+        print(f"- failed: {case_id}")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
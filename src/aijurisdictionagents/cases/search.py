@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from .store import CaseStore
+
+DEFAULT_SEARCH_DB_NAME = "search.sqlite3"
+
+_TERM_PATTERN = re.compile(r"\w+")
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS case_entries ("
+    "rowid INTEGER PRIMARY KEY, case_id TEXT NOT NULL, kind TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS case_entries_case_id ON case_entries (case_id)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS case_text USING fts5("
+    "content, tokenize = 'unicode61 remove_diacritics 2')",
+)
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    case_id: str
+    score: float
+    kind: str
+    snippet: str
+
+
+class CaseSearchIndex:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA busy_timeout=5000")
+        for statement in _SCHEMA:
+            self._connection.execute(statement)
+        self._connection.commit()
+
+    def add_case(self, case_id: str, instruction: str) -> None:
+        self._add(case_id, [("instruction", instruction)])
+
+    def add_discussion(self, case_id: str, discussion: dict, transcript: str = "") -> None:
+        self._add(
+            case_id,
+            [("discussion", discussion_text(discussion)), ("transcript", transcript)],
+        )
+
+    def add_transcript(self, case_id: str, transcript: str) -> None:
+        self._add(case_id, [("transcript", transcript)])
+
+    def entry_count(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT count(*) FROM case_entries").fetchone()[0]
+
+    def remove_case(self, case_id: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM case_text WHERE rowid IN "
+                "(SELECT rowid FROM case_entries WHERE case_id = ?)",
+                (case_id,),
+            )
+            self._connection.execute("DELETE FROM case_entries WHERE case_id = ?", (case_id,))
+
+    def search(self, query: str, limit: int = 10, any_terms: bool = False) -> List[SearchHit]:
+        if limit <= 0:
+            raise ValueError("limit must be > 0")
+        terms = _TERM_PATTERN.findall(query.lower())
+        if not terms:
+            return []
+        expression = (" OR " if any_terms else " ").join(f'"{term}"' for term in terms)
+        # Several entries of one case can match; fetch more rows until `limit` cases are found.
+        fetch = limit * 4
+        while True:
+            with self._lock:
+                # Rank inside the subquery so joins and snippets only touch the top rows.
+                rows = self._connection.execute(
+                    "SELECT e.case_id, e.kind, m.rowid, m.rank FROM ("
+                    "SELECT rowid, rank FROM case_text WHERE case_text MATCH ? "
+                    "ORDER BY rank LIMIT ?) AS m "
+                    "JOIN case_entries e ON e.rowid = m.rowid ORDER BY m.rank",
+                    (expression, fetch),
+                ).fetchall()
+                best: Dict[str, Tuple[str, int, float]] = {}
+                for case_id, kind, rowid, rank in rows:
+                    if case_id not in best:
+                        best[case_id] = (kind, rowid, rank)
+                    if len(best) == limit:
+                        break
+                if len(best) < limit and len(rows) == fetch:
+                    fetch *= 4
+                    continue
+                return [
+                    SearchHit(
+                        case_id=case_id,
+                        score=-rank,
+                        kind=kind,
+                        snippet=self._snippet(expression, rowid),
+                    )
+                    for case_id, (kind, rowid, rank) in best.items()
+                ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _snippet(self, expression: str, rowid: int) -> str:
+        row = self._connection.execute(
+            "SELECT snippet(case_text, 0, '[', ']', '...', 12) FROM case_text "
+            "WHERE case_text MATCH ? AND rowid = ?",
+            (expression, rowid),
+        ).fetchone()
+        return row[0] if row else ""
+
+    def _add(self, case_id: str, entries: Sequence[Tuple[str, str]]) -> None:
+        with self._lock, self._connection:
+            for kind, text in entries:
+                if not text.strip():
+                    continue
+                cursor = self._connection.execute(
+                    "INSERT INTO case_entries (case_id, kind) VALUES (?, ?)", (case_id, kind)
+                )
+                self._connection.execute(
+                    "INSERT INTO case_text (rowid, content) VALUES (?, ?)",
+                    (cursor.lastrowid, text),
+                )
+
+
+def discussion_text(discussion: dict) -> str:
+    result = discussion.get("result", {})
+    parts = [
+        discussion.get("summary", ""),
+        *discussion.get("questions_asked", []),
+        *discussion.get("client_answers", []),
+        *result.get("decisions", []),
+        *result.get("risks", []),
+    ]
+    return "\n".join(part for part in parts if part)
+
+
+def search_db_from_env() -> Path | None:
+    search_db = os.getenv("CASE_SEARCH_DB", "").strip()
+    return Path(search_db) if search_db else None
+
+
+def rebuild_search_index(store: CaseStore, index: CaseSearchIndex) -> int:
+    indexed = 0
+    for case_dir in sorted(store.root.iterdir()):
+        if not case_dir.is_dir() or case_dir.name.startswith("."):
+            continue
+        try:
+            record = store.load_case(case_dir.name)
+        except (FileNotFoundError, ValueError):
+            continue
+        index.remove_case(record.case_id)
+        index.add_case(record.case_id, record.data.get("matter", {}).get("facts_summary", ""))
+        for discussion in record.data.get("discussions", []):
+            index.add_discussion(record.case_id, discussion)
+        for log_path in sorted((record.path / "discussions").glob("*.md")):
+            transcript = log_path.read_text(encoding="utf-8").partition("## Transcript\n")[2]
+            index.add_transcript(record.case_id, transcript)
+        indexed += 1
+    return indexed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Search stored cases by their text.")
+    parser.add_argument("query", help="Words to search for in instructions and discussions.")
+    parser.add_argument("--cases", type=Path, default=Path("cases"), help="Case root folder.")
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=None,
+        help=(
+            f"Search database (defaults to CASE_SEARCH_DB, then <cases>/{DEFAULT_SEARCH_DB_NAME})."
+        ),
+    )
+    parser.add_argument("--limit", type=int, default=10, help="Maximum number of cases.")
+    parser.add_argument(
+        "--any", action="store_true", help="Match cases with any word instead of all words."
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Re-index every case folder before searching.",
+    )
+    args = parser.parse_args()
+
+    # Same database the case store writes to, so searches see what `CASE_SEARCH_DB` indexed.
+    index_path = args.index or search_db_from_env() or args.cases / DEFAULT_SEARCH_DB_NAME
+    index = CaseSearchIndex(index_path)
+    try:
+        if args.rebuild:
+            from .sqlite_store import case_store_from_env
+
+            store = case_store_from_env(args.cases)
+            print(f"Indexed {rebuild_search_index(store, index)} case(s).")
+        elif index.entry_count() == 0:
+            print(
+                f"Search index {index.path} is empty. Run with --rebuild to index existing cases, "
+                "and set CASE_SEARCH_DB to it so new cases are indexed as they are written.",
+                file=sys.stderr,
+            )
+        started = time.perf_counter()
+        hits = index.search(args.query, limit=args.limit, any_terms=args.any)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    finally:
+        index.close()
+    for hit in hits:
+        print(f"{hit.case_id}  {hit.score:.2f}  [{hit.kind}] {hit.snippet}")
+    print(f"{len(hits)} case(s) in {elapsed_ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
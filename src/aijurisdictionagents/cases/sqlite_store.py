@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .search import CaseSearchIndex, search_db_from_env
+from .store import CaseRecord, CaseStore, _isoformat, _now
+
+DEFAULT_DB_NAME = "cases.sqlite3"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cases ("
+    "case_id TEXT PRIMARY KEY, "
+    "status TEXT NOT NULL, "
+    "country TEXT NOT NULL, "
+    "created_at TEXT NOT NULL, "
+    "updated_at TEXT NOT NULL, "
+    "open_questions INTEGER NOT NULL, "
+    "data TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS cases_status ON cases (status, created_at)",
+    "CREATE INDEX IF NOT EXISTS cases_country ON cases (country, status, created_at)",
+    "CREATE INDEX IF NOT EXISTS cases_created_at ON cases (created_at)",
+    "CREATE INDEX IF NOT EXISTS cases_open_questions ON cases (open_questions, created_at)",
+)
+
+
+class SQLiteCaseStore(CaseStore):
+    def __init__(
+        self,
+        root: Path,
+        db_path: Path | None = None,
+        search_index: CaseSearchIndex | None = None,
+    ) -> None:
+        super().__init__(root, search_index=search_index)
+        self.db_path = db_path or root / DEFAULT_DB_NAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA busy_timeout=5000")
+        for statement in _SCHEMA:
+            self._connection.execute(statement)
+        self._connection.commit()
+
+    def list_cases(
+        self,
+        *,
+        status: str | None = None,
+        country: str | None = None,
+        created_after: datetime | str | None = None,
+        created_before: datetime | str | None = None,
+        has_open_questions: bool | None = None,
+        limit: int = 50,
+        offset: int = 0,
+        newest_first: bool = True,
+    ) -> List[CaseRecord]:
+        if limit <= 0:
+            raise ValueError("limit must be > 0")
+        if offset < 0:
+            raise ValueError("offset must be >= 0")
+        where, params = _filters(
+            status, country, created_after, created_before, has_open_questions
+        )
+        order = "DESC" if newest_first else "ASC"
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT case_id, data FROM cases{where} "
+                f"ORDER BY created_at {order}, case_id {order} LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return [
+            CaseRecord(case_id=case_id, path=self.root / case_id, data=json.loads(data))
+            for case_id, data in rows
+        ]
+
+    def count_cases(
+        self,
+        *,
+        status: str | None = None,
+        country: str | None = None,
+        created_after: datetime | str | None = None,
+        created_before: datetime | str | None = None,
+        has_open_questions: bool | None = None,
+    ) -> int:
+        where, params = _filters(
+            status, country, created_after, created_before, has_open_questions
+        )
+        with self._lock:
+            row = self._connection.execute(f"SELECT COUNT(*) FROM cases{where}", params).fetchone()
+        return int(row[0])
+
+    def import_case(self, record: CaseRecord) -> bool:
+        with self._lock:
+            exists = self._connection.execute(
+                "SELECT 1 FROM cases WHERE case_id = ?", (record.case_id,)
+            ).fetchone()
+        if exists:
+            return False
+        self._write_case(record)
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _read_case(self, case_id: str) -> CaseRecord | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM cases WHERE case_id = ?", (case_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CaseRecord(case_id=case_id, path=self.root / case_id, data=json.loads(row[0]))
+
+    def _write_case(self, record: CaseRecord) -> None:
+        data = record.data
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO cases "
+                "(case_id, status, country, created_at, updated_at, open_questions, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (case_id) DO UPDATE SET "
+                "status = excluded.status, country = excluded.country, "
+                "updated_at = excluded.updated_at, "
+                "open_questions = excluded.open_questions, data = excluded.data",
+                (
+                    record.case_id,
+                    data.get("status", ""),
+                    _country_key(data.get("jurisdiction", {}).get("country", "")),
+                    data.get("created_at", ""),
+                    _isoformat(_now()),
+                    len(data.get("open_questions") or []),
+                    json.dumps(data, ensure_ascii=True),
+                ),
+            )
+            self._connection.commit()
+
+    def _append_change(self, record: CaseRecord, change: Dict[str, Any]) -> None:
+        self._write_case(record)
+
+
+def case_store_from_env(root: Path) -> CaseStore:
+    kind = os.getenv("CASE_STORE", "files").strip().lower()
+    search_db = search_db_from_env()
+    search_index = CaseSearchIndex(search_db) if search_db is not None else None
+    if kind in {"", "files"}:
+        return CaseStore(root, search_index=search_index)
+    if kind == "sqlite":
+        db_path = os.getenv("CASE_STORE_DB")
+        return SQLiteCaseStore(root, Path(db_path) if db_path else None, search_index)
+    raise ValueError(f"Unsupported CASE_STORE '{kind}'. Use files or sqlite.")
+
+
+def _filters(
+    status: str | None,
+    country: str | None,
+    created_after: datetime | str | None,
+    created_before: datetime | str | None,
+    has_open_questions: bool | None,
+) -> Tuple[str, Tuple[Any, ...]]:
+    clauses: List[str] = []
+    params: List[Any] = []
+    if status is not None:
+        clauses.append("status = ?")
+        params.append(status)
+    if country is not None:
+        clauses.append("country = ?")
+        params.append(_country_key(country))
+    if created_after is not None:
+        clauses.append("created_at >= ?")
+        params.append(_timestamp(created_after))
+    if created_before is not None:
+        clauses.append("created_at < ?")
+        params.append(_timestamp(created_before))
+    if has_open_questions is not None:
+        clauses.append("open_questions > 0" if has_open_questions else "open_questions = 0")
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, tuple(params)
+
+
+def _country_key(country: str) -> str:
+    return country.strip().upper()
+
+
+def _timestamp(value: datetime | str) -> str:
+    return _isoformat(value) if isinstance(value, datetime) else value
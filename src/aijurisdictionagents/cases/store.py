@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 import json
-import shutil
+import os
 import uuid
 from pathlib import Path
-from typing import Sequence
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Sequence
 
+from .blobs import BlobStore
+from .locks import file_lock
 from ..schemas import Message, OrchestrationResult
+from ..telemetry import span
+
+if TYPE_CHECKING:
+    from .search import CaseSearchIndex
+
+JOURNAL_FILENAME = "journal.jsonl"
+LOCK_FILENAME = ".lock"
+BLOBS_DIRNAME = ".blobs"
 
 
 @dataclass
@@ -18,10 +29,24 @@ class CaseRecord:
     data: dict
 
 
+class CaseConflict(RuntimeError):
+    pass
+
+
 class CaseStore:
-    def __init__(self, root: Path) -> None:
+    def __init__(
+        self,
+        root: Path,
+        snapshot_every: int = 20,
+        search_index: CaseSearchIndex | None = None,
+    ) -> None:
+        if snapshot_every <= 0:
+            raise ValueError("snapshot_every must be > 0")
         self.root = root
+        self.snapshot_every = snapshot_every
+        self.search_index = search_index
         self.root.mkdir(parents=True, exist_ok=True)
+        self.blobs = BlobStore(root / BLOBS_DIRNAME)
 
     def create_case(
         self,
@@ -35,60 +60,62 @@ class CaseStore:
         data_dir: Path | None,
         case_id: str | None = None,
     ) -> CaseRecord:
-        created_at = _now()
-        case_id = case_id or _generate_case_id()
-        case_dir = self.root / case_id
-        if case_dir.exists():
-            raise ValueError(f"Case already exists: {case_id}")
-
-        _ensure_case_dirs(case_dir)
-        documents = _copy_documents(
-            data_dir,
-            case_dir / "documents",
-            created_at,
-            start_index=0,
-        )
-        discussion_entry = _build_discussion_entry(
-            messages,
-            result,
-            agent_name,
-            discussion_type="intake",
-            created_at=created_at,
-        )
-        case_data = _build_case_data(
-            case_id=case_id,
-            instruction=instruction,
-            country=country,
-            language=language,
-            created_at=created_at,
-            documents=documents,
-            discussion_entry=discussion_entry,
-        )
-        _write_case_json(case_dir / "case.json", case_data)
-        _write_description(case_dir / "description.md", case_id, instruction, created_at)
-        _write_discussion_log(
-            case_dir / "discussions" / discussion_entry["log_filename"],
-            discussion_entry,
-            messages,
-        )
-        return CaseRecord(case_id=case_id, path=case_dir, data=case_data)
+        with span("case_store.create_case", {"case.country": country}):
+            created_at = _now()
+            case_id = case_id or _generate_case_id()
+            case_dir = self.root / case_id
+            try:
+                # mkdir is atomic, so two writers can never claim the same case ID.
+                case_dir.mkdir()
+            except FileExistsError:
+                raise ValueError(f"Case already exists: {case_id}") from None
+
+            _ensure_case_dirs(case_dir)
+            documents = _attach_documents(
+                self.blobs,
+                data_dir,
+                case_dir / "documents",
+                created_at,
+                existing=[],
+            )
+            discussion_entry = _build_discussion_entry(
+                messages,
+                result,
+                agent_name,
+                discussion_type="intake",
+                created_at=created_at,
+            )
+            case_data = _build_case_data(
+                case_id=case_id,
+                instruction=instruction,
+                country=country,
+                language=language,
+                created_at=created_at,
+                documents=documents,
+                discussion_entry=discussion_entry,
+            )
+            record = CaseRecord(case_id=case_id, path=case_dir, data=case_data)
+            self._write_case(record)
+            _write_description(case_dir / "description.md", case_id, instruction, created_at)
+            _write_discussion_log(
+                case_dir / "discussions" / discussion_entry["log_filename"],
+                discussion_entry,
+                messages,
+            )
+            if self.search_index is not None:
+                self.search_index.add_case(case_id, instruction)
+                self.search_index.add_discussion(
+                    case_id, _strip_log_filename(discussion_entry), _transcript_text(messages)
+                )
+            return record
 
     def load_case(self, case_id: str) -> CaseRecord:
-        case_dir = self.root / case_id
-        case_path = case_dir / "case.json"
-        if not case_path.exists():
-            legacy_id = f"CASE-{case_id}" if not case_id.startswith("CASE-") else ""
-            if legacy_id:
-                legacy_dir = self.root / legacy_id
-                legacy_path = legacy_dir / "case.json"
-                if legacy_path.exists():
-                    with legacy_path.open("r", encoding="utf-8") as handle:
-                        data = json.load(handle)
-                    return CaseRecord(case_id=legacy_id, path=legacy_dir, data=data)
+        record = self._read_case(case_id)
+        if record is None and not case_id.startswith("CASE-"):
+            record = self._read_case(f"CASE-{case_id}")
+        if record is None:
             raise FileNotFoundError(f"Case not found: {case_id}")
-        with case_path.open("r", encoding="utf-8") as handle:
-            data = json.load(handle)
-        return CaseRecord(case_id=case_id, path=case_dir, data=data)
+        return record
 
     def append_discussion(
         self,
@@ -99,37 +126,126 @@ class CaseStore:
         agent_name: str,
         data_dir: Path | None,
         discussion_type: str = "followup",
+        expected_revision: int | None = None,
     ) -> CaseRecord:
-        record = self.load_case(case_id)
-        created_at = _now()
-        documents_dir = record.path / "documents"
-        documents = record.data.get("documents", [])
-        new_documents = _copy_documents(
-            data_dir,
-            documents_dir,
-            created_at,
-            start_index=len(documents),
-        )
-        if new_documents:
-            documents.extend(new_documents)
-            record.data["documents"] = documents
-
-        discussion_entry = _build_discussion_entry(
-            messages,
-            result,
-            agent_name,
-            discussion_type=discussion_type,
-            created_at=created_at,
-        )
-        record.data.setdefault("discussions", []).append(_strip_log_filename(discussion_entry))
-        record.data["open_questions"] = discussion_entry["questions_asked"]
+        with span(
+            "case_store.append_discussion",
+            {"case.id": case_id, "discussion.type": discussion_type},
+            metric_keys=("discussion.type",),
+        ), self._case_lock(case_id):
+            record = self.load_case(case_id)
+            revision = record.data.get("revision", 0)
+            if expected_revision is not None and revision != expected_revision:
+                raise CaseConflict(
+                    f"Case {record.case_id} is at revision {revision}, "
+                    f"expected {expected_revision}"
+                )
+            created_at = _now()
+            new_documents = _attach_documents(
+                self.blobs,
+                data_dir,
+                record.path / "documents",
+                created_at,
+                existing=record.data.get("documents", []),
+            )
+            discussion_entry = _build_discussion_entry(
+                messages,
+                result,
+                agent_name,
+                discussion_type=discussion_type,
+                created_at=created_at,
+            )
+            change = {
+                "documents": new_documents,
+                "discussion": _strip_log_filename(discussion_entry),
+                "open_questions": discussion_entry["questions_asked"],
+            }
+            _apply_change(record.data, change)
+            self._append_change(record, change)
+            log_path = record.path / "discussions" / discussion_entry["log_filename"]
+            if log_path.exists():
+                log_path = log_path.with_name(f"{log_path.stem}-r{revision + 1}{log_path.suffix}")
+            _write_discussion_log(log_path, discussion_entry, messages)
+            if self.search_index is not None:
+                self.search_index.add_discussion(
+                    record.case_id, change["discussion"], _transcript_text(messages)
+                )
+            return record
+
+    @contextmanager
+    def _case_lock(self, case_id: str) -> Iterator[None]:
+        case_dir = self.root / case_id
+        if not case_dir.is_dir() and not case_id.startswith("CASE-"):
+            case_dir = self.root / f"CASE-{case_id}"
+        if not case_dir.is_dir():
+            raise FileNotFoundError(f"Case not found: {case_id}")
+        with file_lock(case_dir / LOCK_FILENAME):
+            yield
+
+    def _read_case(self, case_id: str) -> CaseRecord | None:
+        case_dir = self.root / case_id
+        case_path = case_dir / "case.json"
+        if not case_path.exists():
+            return None
+        # Readers take no lock: reading the journal before the snapshot means a concurrent
+        # compaction can only make the snapshot newer than the journal, never lose a change.
+        changes = _read_journal(case_dir / JOURNAL_FILENAME)
+        with case_path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        for change in changes:
+            if change.get("revision", 0) > data.get("revision", 0):
+                _apply_change(data, change)
+        return CaseRecord(case_id=case_id, path=case_dir, data=data)
+
+    def _write_case(self, record: CaseRecord) -> None:
         _write_case_json(record.path / "case.json", record.data)
-        _write_discussion_log(
-            record.path / "discussions" / discussion_entry["log_filename"],
-            discussion_entry,
-            messages,
-        )
-        return record
+
+    def _append_change(self, record: CaseRecord, change: Dict[str, Any]) -> None:
+        journal_path = record.path / JOURNAL_FILENAME
+        revision = record.data["revision"]
+        _append_journal(journal_path, {"revision": revision, **change})
+        if revision % self.snapshot_every == 0:
+            # Snapshot first: journal lines at or below its revision are skipped on load.
+            self._write_case(record)
+            journal_path.unlink()
+
+
+def _apply_change(data: dict, change: Dict[str, Any]) -> None:
+    if change["documents"]:
+        data.setdefault("documents", []).extend(change["documents"])
+    data.setdefault("discussions", []).append(change["discussion"])
+    data["open_questions"] = change["open_questions"]
+    data["revision"] = data.get("revision", 0) + 1
+
+
+def _read_journal(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    changes: list[dict] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                changes.append(json.loads(line))
+            except ValueError:
+                # A torn line from a crash mid-append never completed its discussion.
+                continue
+    return changes
+
+
+def _append_journal(path: Path, change: Dict[str, Any]) -> None:
+    line = json.dumps(change, ensure_ascii=True, separators=(",", ":")) + "\n"
+    with path.open("ab") as handle:
+        if handle.tell() and _ends_mid_line(path):
+            handle.write(b"\n")
+        handle.write(line.encode("utf-8"))
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def _ends_mid_line(path: Path) -> bool:
+    with path.open("rb") as handle:
+        handle.seek(-1, os.SEEK_END)
+        return handle.read(1) != b"\n"
 
 
 def _now() -> datetime:
@@ -195,51 +311,66 @@ def _build_case_data(
         "open_questions": discussion_entry["questions_asked"],
         "next_discussion": {"scheduled_for": "", "agenda": []},
         "discussions": [_strip_log_filename(discussion_entry)],
+        "revision": 0,
     }
 
 
-def _copy_documents(
+def _attach_documents(
+    blobs: BlobStore,
     data_dir: Path | None,
     destination: Path,
     received_at: datetime,
-    start_index: int,
+    existing: Sequence[dict],
 ) -> list[dict]:
     if data_dir is None or not data_dir.exists():
         return []
 
+    known = {
+        (_original_name(document), document["sha256"])
+        for document in existing
+        if document.get("sha256")
+    }
     documents: list[dict] = []
     date_prefix = received_at.strftime("%Y-%m-%d")
     files = sorted(path for path in data_dir.iterdir() if path.is_file())
-    for idx, path in enumerate(files, start=start_index + 1):
-        filename = path.name.replace(" ", "_")
-        target_name = f"{date_prefix}_{filename}"
-        target_path = _dedupe_path(destination / target_name)
-        shutil.copy2(path, target_path)
+    for path in files:
+        blob = blobs.put(path)
+        name = path.name.replace(" ", "_")
+        # A re-upload of the same file is skipped; a copy under another name links the same blob.
+        if (name, blob.digest) in known:
+            continue
+        known.add((name, blob.digest))
+        target_path = destination / f"{date_prefix}_{name}"
+        if target_path.exists():
+            # Same name, different content: the digest keeps the name unique in one probe.
+            target_path = target_path.with_name(
+                f"{target_path.stem}_{blob.digest[:12]}{target_path.suffix}"
+            )
+            if target_path.exists():
+                continue
+        blobs.link(blob, target_path)
         documents.append(
             {
-                "doc_id": f"DOC-{idx:03d}",
+                "doc_id": f"DOC-{len(existing) + len(documents) + 1:03d}",
                 "type": _infer_doc_type(path),
                 "filename": target_path.name,
+                "original_name": path.name,
                 "path": str(Path("documents") / target_path.name),
                 "source": "user_upload",
                 "received_at": _isoformat(received_at),
                 "notes": "",
+                "sha256": blob.digest,
+                "size": blob.size,
             }
         )
     return documents
 
 
-def _dedupe_path(path: Path) -> Path:
-    if not path.exists():
-        return path
-    stem = path.stem
-    suffix = path.suffix
-    counter = 1
-    while True:
-        candidate = path.with_name(f"{stem}_{counter}{suffix}")
-        if not candidate.exists():
-            return candidate
-        counter += 1
+def _original_name(document: dict) -> str:
+    if "original_name" in document:
+        return document["original_name"].replace(" ", "_")
+    # Older entries only kept the stored "<date>_<name>" filename.
+    return document.get("filename", "").partition("_")[2]
 
 
 def _infer_doc_type(path: Path) -> str:
@@ -327,8 +458,15 @@ def _summarize_message(text: str) -> str:
 
 
 def _write_case_json(path: Path, data: dict) -> None:
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(data, handle, indent=2, sort_keys=False, ensure_ascii=True)
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with temp_path.open("w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2, sort_keys=False, ensure_ascii=True)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
 
 
 def _write_description(path: Path, case_id: str, instruction: str, created_at: datetime) -> None:
@@ -362,8 +500,14 @@ def _write_discussion_log(path: Path, discussion_entry: dict, messages: Sequence
             lines.append(f"- {answer}")
         lines.append("")
     lines.append("## Transcript")
+    lines.append(_transcript_text(messages))
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+
+def _transcript_text(messages: Sequence[Message]) -> str:
+    lines: list[str] = []
     for message in messages:
         role = message.agent_name if message.role == "assistant" else "User"
         lines.append(f"{role}: {message.content}")
     lines.append("")
-    path.write_text("\n".join(lines), encoding="utf-8")
+    return "\n".join(lines)
@@ -10,13 +10,15 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from .agents import create_judge, create_lawyer_agent
-from .cases import CaseStore
-from .documents import load_documents
+from .cases import case_store_from_env
+from .documents import DEFAULT_CHUNK_SIZE, DocumentIndex, load_documents
 from .jurisdiction import is_slovakia
 from .llm import get_llm_client
 from .localization import translate
 from .observability import TraceRecorder, create_run_dir, setup_logging
 from .orchestration import Orchestrator
+from .schemas import Message
+from .telemetry import configure_telemetry_from_env
 
 
 def _mask_secret(value: str) -> str:
@@ -100,6 +102,25 @@ def _timed_input_posix(prompt: str, timeout_seconds: float) -> str | None:
     return value or None
 
 
+class _StreamPrinter:
+    def __init__(self) -> None:
+        self._agent_name: str | None = None
+
+    def __call__(self, chunk: Message) -> None:
+        if chunk.agent_name != self._agent_name:
+            self.reset()
+            sys.stdout.write(f"\n{chunk.agent_name}: ")
+            self._agent_name = chunk.agent_name
+        sys.stdout.write(chunk.content)
+        sys.stdout.flush()
+
+    def reset(self) -> None:
+        if self._agent_name is not None:
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+        self._agent_name = None
+
+
 def _prompt_user_with_timeout(
     question: str, timeout_seconds: float, language: str | None
 ) -> str | None:
@@ -130,6 +151,7 @@ def _prompt_user_with_timeout(
 
 def main() -> int:
     load_dotenv()
+    configure_telemetry_from_env()
     parser = argparse.ArgumentParser(description="Run the legal discussion demo.")
     parser.add_argument(
         "--data-dir",
@@ -166,6 +188,24 @@ def main() -> int:
         action="store_true",
         help="Enable PDF ingestion (requires pypdf).",
     )
+    parser.add_argument(
+        "--ingest-workers",
+        type=int,
+        default=1,
+        help="Parallel workers for document ingestion (1 = serial, 0 = one per CPU).",
+    )
+    parser.add_argument(
+        "--extraction-cache-dir",
+        type=Path,
+        default=Path(".cache") / "extractions",
+        help="Folder caching extracted PDF text between runs.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Load documents as lazily read chunks of this many bytes (0 = whole files).",
+    )
     parser.add_argument(
         "--log-level",
         type=str,
@@ -185,6 +225,22 @@ def main() -> int:
         choices=["advice", "court"],
         help="Type of discussion: advice or court.",
     )
+    parser.add_argument(
+        "--history-keep-messages",
+        type=int,
+        default=0,
+        help="Keep this many recent messages verbatim and summarize older ones (0 = off).",
+    )
+    parser.add_argument(
+        "--speculative-summary",
+        action="store_true",
+        help="Court mode: draft the final summary while the judge reviews (discarded if rejected).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print agent responses as they are generated.",
+    )
     parser.add_argument(
         "--case-id",
         type=str,
@@ -206,8 +262,15 @@ def main() -> int:
         documents = []
         logger.info("Loaded 0 documents (no data directory provided).")
     else:
-        documents = load_documents(args.data_dir, allow_pdf=args.allow_pdf)
+        documents = load_documents(
+            args.data_dir,
+            allow_pdf=args.allow_pdf,
+            workers=args.ingest_workers or os.cpu_count(),
+            cache_dir=args.extraction_cache_dir,
+            chunk_size=args.chunk_size or None,
+        )
         logger.info("Loaded %d documents", len(documents))
+    document_index = DocumentIndex(documents)
     logger.info(
         "Case context: country=%s output_language=%s",
         args.country,
@@ -222,9 +285,24 @@ def main() -> int:
     lawyer = create_lawyer_agent(llm, args.country)
     judge = create_judge(llm) if args.discussion_type == "court" else None
 
+    stream_printer = _StreamPrinter() if args.stream else None
+
+    def _user_response(question: str, timeout_seconds: float) -> str | None:
+        if stream_printer is not None:
+            stream_printer.reset()
+        return _prompt_user_with_timeout(question, timeout_seconds, args.language or None)
+
     trace = TraceRecorder(run_dir)
     try:
-        orchestrator = Orchestrator(lawyer=lawyer, judge=judge, trace=trace, logger=logger)
+        orchestrator = Orchestrator(
+            lawyer=lawyer,
+            judge=judge,
+            trace=trace,
+            logger=logger,
+            on_message_chunk=stream_printer,
+            history_keep_messages=args.history_keep_messages or None,
+            speculative_summary=args.speculative_summary,
+        )
         result = orchestrator.run(
             instruction,
             documents,
@@ -233,12 +311,13 @@ def main() -> int:
             question_timeout_seconds=args.question_timeout_minutes * 60,
             max_discussion_minutes=args.discussion_max_minutes,
             discussion_type=args.discussion_type,
-            user_response_provider=lambda q, t: _prompt_user_with_timeout(
-                q, t, args.language or None
-            ),
+            document_index=document_index,
+            user_response_provider=_user_response,
         )
     finally:
         trace.close()
+    if stream_printer is not None:
+        stream_printer.reset()
 
     print(f"\n{translate('cli.final_recommendation', args.language or None)}")
     print(result.final_recommendation)
@@ -257,7 +336,7 @@ def main() -> int:
     case_id = (args.case_id or "").strip()
     if args.discussion_type == "advice" and is_slovakia(args.country):
         repo_root = Path(__file__).resolve().parents[2]
-        case_store = CaseStore(repo_root / "cases")
+        case_store = case_store_from_env(repo_root / "cases")
         try:
             if case_id:
                 try:
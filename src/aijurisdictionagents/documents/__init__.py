@@ -1,3 +1,15 @@
+from .chunks import DEFAULT_CHUNK_SIZE, chunk_file, chunk_text, iter_chunks
+from .index import DocumentIndex, SearchHit, tokenize
 from .loader import load_documents, select_sources
 
-__all__ = ["load_documents", "select_sources"]
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "DocumentIndex",
+    "SearchHit",
+    "chunk_file",
+    "chunk_text",
+    "iter_chunks",
+    "load_documents",
+    "select_sources",
+    "tokenize",
+]
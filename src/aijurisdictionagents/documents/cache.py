@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+
+class ExtractionCache:
+    def __init__(self, root: Path) -> None:
+        # Folders are created by put(), so runs without PDFs leave no cache behind.
+        self.root = root
+
+    def get(self, path: Path) -> str | None:
+        entry = self.entry_path(path)
+        if not entry.exists():
+            return None
+        return entry.read_text(encoding="utf-8")
+
+    def put(self, path: Path, content: str) -> Path:
+        entry = self.entry_path(path)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(content)
+            os.replace(temp_name, entry)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        return entry
+
+    def entry_path(self, path: Path) -> Path:
+        key = _cache_key(path)
+        return self.root / key[:2] / f"{key}.txt"
+
+
+def _cache_key(path: Path) -> str:
+    stat = path.stat()
+    identity = f"{path.resolve()}\0{stat.st_size}\0{stat.st_mtime_ns}"
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
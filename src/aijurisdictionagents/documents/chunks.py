@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import mmap
+from pathlib import Path
+from typing import Iterator, Tuple
+
+from ..schemas import Document, DocumentChunk
+
+DEFAULT_CHUNK_SIZE = 2000
+PARAGRAPH_BREAK = b"\n\n"
+
+
+def iter_chunks(document: Document) -> Iterator[DocumentChunk]:
+    if document.chunks:
+        yield from document.chunks
+        return
+    yield DocumentChunk(
+        doc_id=document.doc_id,
+        path=document.path,
+        index=0,
+        start=0,
+        end=len(document.content),
+        content=document.content,
+    )
+
+
+def chunk_file(
+    doc_id: str,
+    path: Path,
+    source_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[DocumentChunk, ...]:
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be > 0")
+    if source_path.stat().st_size == 0:
+        return ()
+
+    chunks = []
+    with source_path.open("rb") as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start, end in _paragraph_spans(data, chunk_size):
+                if not data[start:end].strip():
+                    continue
+                chunks.append(
+                    DocumentChunk(
+                        doc_id=doc_id,
+                        path=str(path),
+                        index=len(chunks),
+                        start=start,
+                        end=end,
+                        source_path=str(source_path),
+                    )
+                )
+    return tuple(chunks)
+
+
+def chunk_text(
+    doc_id: str,
+    path: Path,
+    text: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[DocumentChunk, ...]:
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be > 0")
+    encoded = text.encode("utf-8")
+    chunks = []
+    for start, end in _paragraph_spans(encoded, chunk_size):
+        piece = encoded[start:end]
+        if not piece.strip():
+            continue
+        chunks.append(
+            DocumentChunk(
+                doc_id=doc_id,
+                path=str(path),
+                index=len(chunks),
+                start=start,
+                end=end,
+                content=piece.decode("utf-8", errors="ignore"),
+            )
+        )
+    return tuple(chunks)
+
+
+def _paragraph_spans(data: bytes | mmap.mmap, chunk_size: int) -> Iterator[tuple[int, int]]:
+    length = len(data)
+    chunk_start = 0
+    position = 0
+    while position < length:
+        separator = data.find(PARAGRAPH_BREAK, position)
+        paragraph_end = length if separator == -1 else separator + len(PARAGRAPH_BREAK)
+        if paragraph_end - chunk_start > chunk_size and position > chunk_start:
+            yield chunk_start, position
+            chunk_start = position
+        while paragraph_end - chunk_start > chunk_size:
+            cut = _split_point(data, chunk_start, chunk_start + chunk_size)
+            yield chunk_start, cut
+            chunk_start = cut
+        position = paragraph_end
+    if chunk_start < length:
+        yield chunk_start, length
+
+
+def _split_point(data: bytes | mmap.mmap, start: int, limit: int) -> int:
+    for separator in (b"\n", b" "):
+        index = data.rfind(separator, start + (limit - start) // 2, limit)
+        if index != -1:
+            return index + 1
+    cut = limit
+    while cut > start + 1 and 0x80 <= data[cut] <= 0xBF:
+        cut -= 1
+    return cut
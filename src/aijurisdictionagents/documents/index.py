@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Sequence
+
+from .chunks import iter_chunks
+from ..schemas import Document, DocumentChunk
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class SearchHit(NamedTuple):
+    score: float
+    document: Document
+    chunk: DocumentChunk
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = [token.lower() for token in TOKEN_PATTERN.findall(text)]
+    return [token for token in tokens if len(token) > 2]
+
+
+class DocumentIndex:
+    def __init__(self, documents: Iterable[Document], k1: float = 1.5, b: float = 0.75) -> None:
+        self.documents: List[Document] = list(documents)
+        self.k1 = k1
+        self.b = b
+        self.chunks: List[DocumentChunk] = []
+        self._chunk_documents: List[int] = []
+        self._postings: Dict[str, List[tuple[int, int]]] = defaultdict(list)
+        self._chunk_lengths: List[int] = []
+        for doc_index, doc in enumerate(self.documents):
+            for chunk in iter_chunks(doc):
+                chunk_index = len(self.chunks)
+                term_counts = Counter(tokenize(chunk.text))
+                self.chunks.append(chunk)
+                self._chunk_documents.append(doc_index)
+                self._chunk_lengths.append(sum(term_counts.values()))
+                for term, frequency in term_counts.items():
+                    self._postings[term].append((chunk_index, frequency))
+        total_length = sum(self._chunk_lengths)
+        self._avg_length = total_length / len(self._chunk_lengths) if self._chunk_lengths else 0.0
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def document_frequency(self, term: str) -> int:
+        postings = self._postings.get(term.lower(), ())
+        return len({self._chunk_documents[chunk_index] for chunk_index, _ in postings})
+
+    def search(self, query: str | Sequence[str], top_k: int = 3) -> List[SearchHit]:
+        best_by_document: Dict[int, tuple[float, int]] = {}
+        for chunk_index, score in self._score(_terms(query)).items():
+            doc_index = self._chunk_documents[chunk_index]
+            current = best_by_document.get(doc_index)
+            if current is None or score > current[0]:
+                best_by_document[doc_index] = (score, chunk_index)
+        best = heapq.nlargest(
+            top_k,
+            best_by_document.items(),
+            key=lambda item: (item[1][0], -item[0]),
+        )
+        return [
+            SearchHit(score, self.documents[doc_index], self.chunks[chunk_index])
+            for doc_index, (score, chunk_index) in best
+        ]
+
+    def search_chunks(self, query: str | Sequence[str], top_k: int = 10) -> List[SearchHit]:
+        scores = self._score(_terms(query))
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [
+            SearchHit(
+                score,
+                self.documents[self._chunk_documents[chunk_index]],
+                self.chunks[chunk_index],
+            )
+            for chunk_index, score in best
+        ]
+
+    def _score(self, terms: Iterable[str]) -> Dict[int, float]:
+        total_chunks = len(self.chunks)
+        scores: Dict[int, float] = defaultdict(float)
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            chunk_frequency = len(postings)
+            idf = math.log(1 + (total_chunks - chunk_frequency + 0.5) / (chunk_frequency + 0.5))
+            for chunk_index, frequency in postings:
+                length_norm = (
+                    1 - self.b + self.b * self._chunk_lengths[chunk_index] / self._avg_length
+                )
+                scores[chunk_index] += idf * frequency * (self.k1 + 1) / (
+                    frequency + self.k1 * length_norm
+                )
+        return scores
+
+
+def _terms(query: str | Sequence[str]) -> List[str]:
+    terms = tokenize(query) if isinstance(query, str) else list(query)
+    return list(dict.fromkeys(terms))
@@ -1,40 +1,58 @@
 from __future__ import annotations
 
 import logging
-import re
+import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, List
 
-from ..schemas import Document, Source
+from .cache import ExtractionCache
+from .chunks import chunk_file, chunk_text, iter_chunks
+from .index import DocumentIndex, tokenize
+from ..schemas import Document, DocumentChunk, Source
+from ..telemetry import set_attributes, span
 
 logger = logging.getLogger(__name__)
 
 TEXT_EXTENSIONS = {".txt", ".md"}
 
 
-def load_documents(data_dir: Path, allow_pdf: bool = False) -> List[Document]:
+def load_documents(
+    data_dir: Path,
+    allow_pdf: bool = False,
+    workers: int | None = None,
+    cache_dir: Path | None = None,
+    chunk_size: int | None = None,
+) -> List[Document]:
     if not data_dir.exists():
         logger.warning("Data directory not found: %s", data_dir)
         return []
 
-    documents: List[Document] = []
+    paths: List[Path] = []
     for path in sorted(data_dir.iterdir()):
         if path.is_dir():
             continue
         ext = path.suffix.lower()
-        if ext in TEXT_EXTENSIONS:
-            content = path.read_text(encoding="utf-8", errors="ignore")
-        elif ext == ".pdf":
-            if not allow_pdf:
-                logger.info("Skipping PDF without allow_pdf: %s", path)
-                continue
-            content = _read_pdf(path)
-        else:
+        if ext == ".pdf" and not allow_pdf:
+            logger.info("Skipping PDF without allow_pdf: %s", path)
             continue
-
-        doc_id = f"doc-{len(documents) + 1}"
-        documents.append(Document(doc_id=doc_id, path=str(path), content=content))
-
+        if ext in TEXT_EXTENSIONS or ext == ".pdf":
+            paths.append(path)
+
+    cache = ExtractionCache(cache_dir) if cache_dir is not None else None
+    with span(
+        "documents.load",
+        {"documents.files": len(paths), "documents.allow_pdf": allow_pdf},
+    ) as current:
+        if chunk_size is not None:
+            documents = _load_chunked_documents(paths, workers or 1, cache, chunk_size)
+        else:
+            contents = _extract_contents(paths, workers or 1, cache)
+            documents = [
+                Document(doc_id=f"doc-{idx}", path=str(path), content=contents[path])
+                for idx, path in enumerate(paths, start=1)
+            ]
+        set_attributes(current, {"documents.count": len(documents)})
     return documents
 
 
@@ -43,33 +61,71 @@ def select_sources(
     query: str,
     max_sources: int = 3,
     snippet_len: int = 220,
+    index: DocumentIndex | None = None,
 ) -> List[Source]:
     terms = _query_terms(query)
-    scored: List[tuple[int, Document]] = []
+    if index is not None:
+        return _select_indexed_sources(index, terms, max_sources, snippet_len)
+
+    scored: List[tuple[int, Document, DocumentChunk]] = []
     for doc in documents:
-        content_lower = doc.content.lower()
-        score = sum(content_lower.count(term) for term in terms)
-        scored.append((score, doc))
+        total = 0
+        best_chunk: DocumentChunk | None = None
+        best_score = -1
+        for chunk in iter_chunks(doc):
+            content_lower = chunk.text.lower()
+            if not content_lower.strip():
+                continue
+            score = sum(content_lower.count(term) for term in terms)
+            total += score
+            if score > best_score:
+                best_chunk, best_score = chunk, score
+        if best_chunk is not None:
+            scored.append((total, doc, best_chunk))
 
     scored.sort(key=lambda item: item[0], reverse=True)
     sources: List[Source] = []
-    for _, doc in scored:
-        if not doc.content.strip():
-            continue
-        snippet = _find_snippet(doc.content, terms, snippet_len)
+    for _, doc, chunk in scored[:max_sources]:
+        snippet = _find_snippet(chunk, terms, snippet_len)
         sources.append(Source(filename=Path(doc.path).name, snippet=snippet))
-        if len(sources) >= max_sources:
-            break
 
     return sources
 
 
+def _select_indexed_sources(
+    index: DocumentIndex,
+    terms: List[str],
+    max_sources: int,
+    snippet_len: int,
+) -> List[Source]:
+    selected = [(hit.document, hit.chunk) for hit in index.search(terms, top_k=max_sources)]
+    if len(selected) < max_sources:
+        chosen = {id(doc) for doc, _ in selected}
+        for doc in index.documents:
+            if id(doc) in chosen:
+                continue
+            chunk = next((chunk for chunk in iter_chunks(doc) if chunk.text.strip()), None)
+            if chunk is None:
+                continue
+            selected.append((doc, chunk))
+            if len(selected) >= max_sources:
+                break
+
+    return [
+        Source(
+            filename=Path(doc.path).name,
+            snippet=_find_snippet(chunk, terms, snippet_len),
+        )
+        for doc, chunk in selected
+    ]
+
+
 def _query_terms(query: str) -> List[str]:
-    tokens = [token.lower() for token in re.findall(r"\w+", query)]
-    return [token for token in tokens if len(token) > 2]
+    return tokenize(query)
 
 
-def _find_snippet(content: str, terms: List[str], snippet_len: int) -> str:
+def _find_snippet(chunk: DocumentChunk, terms: List[str], snippet_len: int) -> str:
+    content = chunk.text
     content_lower = content.lower()
     for term in terms:
         idx = content_lower.find(term)
@@ -86,14 +142,110 @@ def _clean_snippet(text: str) -> str:
     return " ".join(text.split())
 
 
+def _extract_contents(
+    paths: List[Path],
+    workers: int,
+    cache: ExtractionCache | None,
+) -> Dict[Path, str]:
+    contents: Dict[Path, str] = {}
+    text_paths: List[Path] = []
+    pdf_paths: List[Path] = []
+    for path in paths:
+        if path.suffix.lower() != ".pdf":
+            text_paths.append(path)
+            continue
+        cached = cache.get(path) if cache is not None else None
+        if cached is None:
+            pdf_paths.append(path)
+        else:
+            logger.debug("Using cached extraction for %s", path)
+            contents[path] = cached
+
+    if workers <= 1:
+        for path in text_paths:
+            contents[path] = _read_text(path)
+        for path in pdf_paths:
+            contents[path] = _read_pdf(path)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as threads:
+            text_futures = {path: threads.submit(_read_text, path) for path in text_paths}
+            if pdf_paths:
+                contents.update(_read_pdfs_parallel(pdf_paths, workers))
+            for path, future in text_futures.items():
+                contents[path] = future.result()
+
+    if cache is not None:
+        for path in pdf_paths:
+            cache.put(path, contents[path])
+    return contents
+
+
+def _load_chunked_documents(
+    paths: List[Path],
+    workers: int,
+    cache: ExtractionCache | None,
+    chunk_size: int,
+) -> List[Document]:
+    pending_pdfs = [
+        path
+        for path in paths
+        if path.suffix.lower() == ".pdf"
+        and (cache is None or not cache.entry_path(path).exists())
+    ]
+    extracted = _extract_contents(pending_pdfs, workers, cache)
+
+    documents: List[Document] = []
+    for idx, path in enumerate(paths, start=1):
+        doc_id = f"doc-{idx}"
+        if path.suffix.lower() != ".pdf":
+            chunks = chunk_file(doc_id, path, path, chunk_size)
+        elif cache is not None:
+            chunks = chunk_file(doc_id, path, cache.entry_path(path), chunk_size)
+        else:
+            chunks = chunk_text(doc_id, path, extracted[path], chunk_size)
+        documents.append(Document(doc_id=doc_id, path=str(path), chunks=chunks))
+    return documents
+
+
+def _read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8", errors="ignore")
+
+
 def _read_pdf(path: Path) -> str:
+    reader = _pdf_reader_class()(str(path))
+    pages = [page.extract_text() or "" for page in reader.pages]
+    return "\n".join(pages)
+
+
+def _read_pdfs_parallel(paths: List[Path], workers: int) -> Dict[Path, str]:
+    # Only split files when there are fewer of them than workers; each split re-parses the file.
+    shares = max(1, workers // len(paths))
+    with ProcessPoolExecutor(max_workers=workers) as processes:
+        share_futures = {
+            path: [
+                processes.submit(_extract_pdf_share, str(path), share, shares)
+                for share in range(shares)
+            ]
+            for path in paths
+        }
+        return {
+            path: "\n".join(page for future in futures for page in future.result())
+            for path, futures in share_futures.items()
+        }
+
+
+def _extract_pdf_share(path: str, share: int, shares: int) -> List[str]:
+    reader = _pdf_reader_class()(path)
+    batch_size = math.ceil(len(reader.pages) / shares)
+    start = share * batch_size
+    return [page.extract_text() or "" for page in reader.pages[start : start + batch_size]]
+
+
+def _pdf_reader_class() -> type:
     try:
         from pypdf import PdfReader
     except ImportError as exc:
         raise RuntimeError(
             "pypdf is required to read PDFs. Install with 'pip install pypdf'."
         ) from exc
-
-    reader = PdfReader(str(path))
-    pages = [page.extract_text() or "" for page in reader.pages]
-    return "\n".join(pages)
+    return PdfReader
@@ -1,9 +1,53 @@
 from __future__ import annotations
 
 import os
+from dataclasses import replace
+from typing import Any, Dict
 
-from .base import LLMClient
+from .base import (
+    AsyncLLMClient,
+    LLMClient,
+    StreamingLLMClient,
+    client_settings,
+    complete_async,
+    stream_completion,
+    stream_completion_async,
+)
+from .batch_api import (
+    BatchEndpoint,
+    BatchResult,
+    LocalBatchEndpoint,
+    OpenAIBatchEndpoint,
+    batch_request_body,
+)
+from .cache import (
+    CacheBackend,
+    CachingLLMClient,
+    InMemoryCacheBackend,
+    SQLiteCacheBackend,
+    wrap_with_cache_from_env,
+)
+from .cassette import (
+    CassetteMiss,
+    RecordingLLMClient,
+    ReplayLLMClient,
+    load_replay_from_env,
+    wrap_with_recording_from_env,
+)
+from .messages import PrefixTracker, build_chat_messages
+from .hedging import HedgingLLMClient, wrap_with_hedging_from_env
 from .mock import MockLLMClient
+from .registry import ClientRegistry, PoolConfig, default_client_registry
+from .router import LatencyWindow, RoutingLLMClient, load_router_from_env, parse_backend_specs
+from .scheduler import (
+    DeadlineExceeded,
+    RequestScheduler,
+    RetryPolicy,
+    TokenBucket,
+    remaining_request_time,
+    request_deadline,
+)
+from .usage import CostModel, TokenUsage, collect_usage, record_response_usage
 
 try:
     from .openai_client import OpenAIClient, load_openai_config_from_env
@@ -23,17 +67,57 @@ except ImportError:  # pragma: no cover - only triggers when OpenAI deps are mis
 
 def get_llm_client() -> LLMClient:
     provider = os.getenv("LLM_PROVIDER", "mock").lower()
+    replay = load_replay_from_env(lambda: _replay_settings(provider))
+    if replay is not None:
+        return replay
+    client = wrap_with_hedging_from_env(_get_provider_client(provider), _get_provider_client)
+    return wrap_with_cache_from_env(wrap_with_recording_from_env(client))
+
+
+def _replay_settings(provider: str) -> Dict[str, Any] | None:
+    if provider == "mock":
+        return None
+    try:
+        client = wrap_with_hedging_from_env(_get_provider_client(provider), _get_provider_client)
+    except (ImportError, ValueError):
+        # Offline replays usually run without provider credentials; skip the settings check.
+        return None
+    return client_settings(client)
+
+
+def get_batch_llm_client() -> LLMClient:
+    # Batch requests are built from the provider client itself, not the cache/hedge wrappers.
+    provider = os.getenv("LLM_PROVIDER", "mock").lower()
+    if provider == "router":
+        # A batch goes to one provider endpoint, so the router's primary backend takes it.
+        specs = parse_backend_specs(os.getenv("LLM_ROUTER_BACKENDS", ""))
+        if not specs:
+            raise ValueError("LLM_ROUTER_BACKENDS is required when LLM_PROVIDER=router.")
+        provider, target = specs[0]
+        if provider == "router":
+            raise ValueError("LLM_ROUTER_BACKENDS cannot contain 'router'.")
+        return _get_provider_client(provider, target)
+    return _get_provider_client(provider)
+
+
+def _get_provider_client(provider: str, target: str | None = None) -> LLMClient:
     if provider == "mock":
         return MockLLMClient()
+    if provider == "router":
+        return load_router_from_env(_get_provider_client)
     if provider == "openai":
         if OpenAIClient is None or load_openai_config_from_env is None:
             raise ImportError("OpenAI dependencies not installed. Run: pip install openai")
         config = load_openai_config_from_env()
+        if target:
+            config = replace(config, model=target)
         return OpenAIClient(config)
     if provider in {"azurefoundry", "azure"}:
         if AzureFoundryClient is None or load_azure_foundry_config_from_env is None:
             raise ImportError("OpenAI dependencies not installed. Run: pip install openai")
         config = load_azure_foundry_config_from_env()
+        if target:
+            config = replace(config, deployment=target)
         return AzureFoundryClient(config)
 
     raise ValueError(
@@ -42,11 +126,48 @@ def get_llm_client() -> LLMClient:
 
 
 __all__ = [
+    "AsyncLLMClient",
+    "BatchEndpoint",
+    "BatchResult",
+    "CacheBackend",
+    "CachingLLMClient",
+    "CassetteMiss",
+    "ClientRegistry",
+    "CostModel",
+    "DeadlineExceeded",
+    "HedgingLLMClient",
+    "InMemoryCacheBackend",
+    "LatencyWindow",
+    "LocalBatchEndpoint",
     "LLMClient",
     "MockLLMClient",
     "AzureFoundryClient",
+    "OpenAIBatchEndpoint",
     "OpenAIClient",
+    "PoolConfig",
+    "PrefixTracker",
+    "RecordingLLMClient",
+    "ReplayLLMClient",
+    "RequestScheduler",
+    "RetryPolicy",
+    "RoutingLLMClient",
+    "SQLiteCacheBackend",
+    "StreamingLLMClient",
+    "TokenBucket",
+    "TokenUsage",
+    "batch_request_body",
+    "build_chat_messages",
+    "client_settings",
+    "collect_usage",
+    "complete_async",
+    "default_client_registry",
+    "get_batch_llm_client",
     "get_llm_client",
     "load_azure_foundry_config_from_env",
     "load_openai_config_from_env",
+    "record_response_usage",
+    "remaining_request_time",
+    "request_deadline",
+    "stream_completion",
+    "stream_completion_async",
 ]
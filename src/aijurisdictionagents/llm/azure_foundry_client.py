@@ -3,14 +3,22 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 import logging
-from typing import Iterable, Sequence
+from typing import Any, AsyncIterator, Dict, Iterator, Sequence
 
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI, AzureOpenAI
 
+from .batch_api import AZURE_BATCH_URL, OpenAIBatchEndpoint
+from .context import DEFAULT_CONTEXT_TOKENS, load_context_tokens_from_env
+from .messages import ChatMessage, PrefixTracker, build_chat_messages, estimate_message_tokens
+from .registry import ClientRegistry, credential_fingerprint, default_client_registry
+from .scheduler import RequestScheduler, shared_scheduler
+from .usage import record_response_usage
 from ..schemas import Document, Message
 
 logger = logging.getLogger(__name__)
 
+STREAM_USAGE_API_VERSION = "2024-09-01"
+
 
 @dataclass(frozen=True)
 class AzureFoundryConfig:
@@ -20,23 +28,28 @@ class AzureFoundryConfig:
     temperature: float
     api_key: str | None
     azure_ad_token: str | None
+    context_tokens: int = DEFAULT_CONTEXT_TOKENS
 
 
 class AzureFoundryClient:
-    def __init__(self, config: AzureFoundryConfig) -> None:
+    def __init__(
+        self,
+        config: AzureFoundryConfig,
+        scheduler: RequestScheduler | None = None,
+        registry: ClientRegistry | None = None,
+    ) -> None:
         self._config = config
-        if config.azure_ad_token:
-            self._client = AzureOpenAI(
-                azure_endpoint=config.endpoint,
-                api_version=config.api_version,
-                azure_ad_token=config.azure_ad_token,
-            )
-        else:
-            self._client = AzureOpenAI(
-                azure_endpoint=config.endpoint,
-                api_version=config.api_version,
-                api_key=config.api_key,
-            )
+        self._registry = registry if registry is not None else default_client_registry()
+        self._registry_key = (
+            "azure",
+            config.endpoint,
+            config.api_version,
+            credential_fingerprint(config.azure_ad_token or config.api_key),
+        )
+        self._scheduler = scheduler or shared_scheduler(
+            f"azure:{config.endpoint}:{config.deployment}"
+        )
+        self._prefix = PrefixTracker()
 
     def complete(
         self,
@@ -45,26 +58,162 @@ class AzureFoundryClient:
         conversation: Sequence[Message],
         documents: Sequence[Document],
     ) -> str:
-        messages = [{"role": "system", "content": system_prompt}]
-        if documents:
-            messages.append({"role": "system", "content": _render_documents(documents)})
-
-        for message in conversation:
-            messages.append(
-                {
-                    "role": _to_openai_role(message.role),
-                    "content": f"{message.agent_name}: {message.content}",
-                }
-            )
-
-        response = self._client.chat.completions.create(
-            model=self._config.deployment,
-            temperature=self._config.temperature,
-            messages=messages,
+        messages = self._messages(agent_name, system_prompt, conversation, documents)
+        estimated = estimate_message_tokens(messages)
+        response = self._scheduler.call(
+            lambda timeout: self._sync_client().chat.completions.create(
+                model=self._config.deployment,
+                temperature=self._config.temperature,
+                messages=messages,
+                timeout=timeout,
+            ),
+            estimated,
+        )
+        self._scheduler.record_usage(estimated, _total_tokens(response))
+        record_response_usage(response)
+        content = response.choices[0].message.content if response.choices else ""
+        return (content or "").strip()
+
+    async def acomplete(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        client = self._async_sdk_client()
+        messages = self._messages(agent_name, system_prompt, conversation, documents)
+        estimated = estimate_message_tokens(messages)
+        response = await self._scheduler.acall(
+            lambda timeout: client.chat.completions.create(
+                model=self._config.deployment,
+                temperature=self._config.temperature,
+                messages=messages,
+                timeout=timeout,
+            ),
+            estimated,
         )
+        self._scheduler.record_usage(estimated, _total_tokens(response))
+        record_response_usage(response)
         content = response.choices[0].message.content if response.choices else ""
         return (content or "").strip()
 
+    def stream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> Iterator[str]:
+        messages = self._messages(agent_name, system_prompt, conversation, documents)
+        estimated = estimate_message_tokens(messages)
+        response = self._scheduler.call(
+            lambda timeout: self._sync_client().chat.completions.create(
+                model=self._config.deployment,
+                temperature=self._config.temperature,
+                messages=messages,
+                stream=True,
+                **_stream_options(self._config.api_version),
+                timeout=timeout,
+            ),
+            estimated,
+        )
+        usage_chunk = None
+        for chunk in response:
+            if getattr(chunk, "usage", None) is not None:
+                usage_chunk = chunk
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+        self._scheduler.record_usage(estimated, _total_tokens(usage_chunk))
+        record_response_usage(usage_chunk)
+
+    async def astream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> AsyncIterator[str]:
+        client = self._async_sdk_client()
+        messages = self._messages(agent_name, system_prompt, conversation, documents)
+        estimated = estimate_message_tokens(messages)
+        response = await self._scheduler.acall(
+            lambda timeout: client.chat.completions.create(
+                model=self._config.deployment,
+                temperature=self._config.temperature,
+                messages=messages,
+                stream=True,
+                **_stream_options(self._config.api_version),
+                timeout=timeout,
+            ),
+            estimated,
+        )
+        usage_chunk = None
+        async for chunk in response:
+            if getattr(chunk, "usage", None) is not None:
+                usage_chunk = chunk
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+        self._scheduler.record_usage(estimated, _total_tokens(usage_chunk))
+        record_response_usage(usage_chunk)
+
+    def batch_request_body(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> Dict[str, Any]:
+        return {
+            "model": self._config.deployment,
+            "temperature": self._config.temperature,
+            "messages": self._messages(agent_name, system_prompt, conversation, documents),
+        }
+
+    def batch_endpoint(self) -> OpenAIBatchEndpoint:
+        return OpenAIBatchEndpoint(self._sync_client(), url=AZURE_BATCH_URL)
+
+    def stats(self) -> Dict[str, Any]:
+        # The scheduler is usually shared process-wide, so its counters span every run.
+        return {**self._prefix.stats(), "scheduler": self._scheduler.stats()}
+
+    def settings(self) -> Dict[str, Any]:
+        return {
+            "provider": "azure",
+            "endpoint": self._config.endpoint,
+            "deployment": self._config.deployment,
+            "api_version": self._config.api_version,
+            "temperature": self._config.temperature,
+            "context_tokens": self._config.context_tokens,
+        }
+
+    def _sync_client(self) -> AzureOpenAI:
+        return self._registry.get(
+            self._registry_key,
+            lambda http: AzureOpenAI(**_client_kwargs(self._config), **http),
+        )
+
+    def _async_sdk_client(self) -> AsyncAzureOpenAI:
+        return self._registry.get_async(
+            self._registry_key,
+            lambda http: AsyncAzureOpenAI(**_client_kwargs(self._config), **http),
+        )
+
+    def _messages(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> list[ChatMessage]:
+        messages = build_chat_messages(
+            system_prompt, conversation, documents, self._config.context_tokens
+        )
+        self._prefix.observe(agent_name, messages)
+        return messages
+
 
 def load_azure_foundry_config_from_env() -> AzureFoundryConfig:
     endpoint = os.getenv("AZURE_OPENAI_ENDPOINT", "").strip()
@@ -104,25 +253,34 @@ def load_azure_foundry_config_from_env() -> AzureFoundryConfig:
         temperature=temperature,
         api_key=api_key,
         azure_ad_token=azure_ad_token,
+        context_tokens=load_context_tokens_from_env(),
     )
 
 
-def _render_documents(documents: Iterable[Document], max_chars: int = 4000) -> str:
-    chunks = ["Context documents:"]
-    total = 0
-    for doc in documents:
-        header = f"[{os.path.basename(doc.path)}]"
-        body = doc.content.strip().replace("\n", " ")
-        snippet = body[:800]
-        entry = f"{header} {snippet}"
-        total += len(entry)
-        if total > max_chars:
-            break
-        chunks.append(entry)
-    return "\n".join(chunks)
-
-
-def _to_openai_role(role: str) -> str:
-    if role in {"user", "assistant", "system"}:
-        return role
-    return "user"
+def _client_kwargs(config: AzureFoundryConfig) -> dict[str, Any]:
+    # Retries are owned by the shared scheduler, not the SDK.
+    if config.azure_ad_token:
+        return {
+            "azure_endpoint": config.endpoint,
+            "api_version": config.api_version,
+            "azure_ad_token": config.azure_ad_token,
+            "max_retries": 0,
+        }
+    return {
+        "azure_endpoint": config.endpoint,
+        "api_version": config.api_version,
+        "api_key": config.api_key,
+        "max_retries": 0,
+    }
+
+
+def _stream_options(api_version: str) -> Dict[str, Any]:
+    # Older Azure API versions reject stream_options, so usage is only requested where supported.
+    if api_version[:10] >= STREAM_USAGE_API_VERSION:
+        return {"stream_options": {"include_usage": True}}
+    return {}
+
+
+def _total_tokens(response: Any) -> int | None:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
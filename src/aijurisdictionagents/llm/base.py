@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Protocol, Sequence
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterator, Protocol, Sequence
 
 from ..schemas import Document, Message
 
@@ -14,3 +15,85 @@ class LLMClient(Protocol):
         documents: Sequence[Document],
     ) -> str:
         ...
+
+
+class AsyncLLMClient(Protocol):
+    async def acomplete(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        ...
+
+
+class StreamingLLMClient(LLMClient, Protocol):
+    def stream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> Iterator[str]:
+        ...
+
+    def astream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> AsyncIterator[str]:
+        ...
+
+
+async def complete_async(
+    llm: LLMClient,
+    agent_name: str,
+    system_prompt: str,
+    conversation: Sequence[Message],
+    documents: Sequence[Document],
+) -> str:
+    acomplete = getattr(llm, "acomplete", None)
+    if acomplete is not None:
+        return await acomplete(agent_name, system_prompt, conversation, documents)
+    return await asyncio.to_thread(
+        llm.complete, agent_name, system_prompt, conversation, documents
+    )
+
+
+def stream_completion(
+    llm: LLMClient,
+    agent_name: str,
+    system_prompt: str,
+    conversation: Sequence[Message],
+    documents: Sequence[Document],
+) -> Iterator[str]:
+    stream = getattr(llm, "stream", None)
+    if stream is not None:
+        yield from stream(agent_name, system_prompt, conversation, documents)
+        return
+    yield llm.complete(agent_name, system_prompt, conversation, documents)
+
+
+async def stream_completion_async(
+    llm: LLMClient,
+    agent_name: str,
+    system_prompt: str,
+    conversation: Sequence[Message],
+    documents: Sequence[Document],
+) -> AsyncIterator[str]:
+    astream = getattr(llm, "astream", None)
+    if astream is not None:
+        async for delta in astream(agent_name, system_prompt, conversation, documents):
+            yield delta
+        return
+    yield await complete_async(llm, agent_name, system_prompt, conversation, documents)
+
+
+def client_settings(llm: LLMClient) -> Dict[str, Any]:
+    settings = getattr(llm, "settings", None)
+    if settings is not None:
+        return settings()
+    return {"client": type(llm).__name__}
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+import shutil
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Protocol, Sequence
+
+from ..schemas import Document, Message
+
+OPENAI_BATCH_URL = "/v1/chat/completions"
+AZURE_BATCH_URL = "/chat/completions"
+TERMINAL_BATCH_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+BatchResponder = Callable[[Dict[str, Any]], str]
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    custom_id: str
+    content: str | None
+    error: str | None = None
+
+
+class BatchRequestBuilder(Protocol):
+    def batch_request_body(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> Dict[str, Any]:
+        ...
+
+
+class BatchEndpoint(Protocol):
+    url: str
+
+    def submit(self, input_path: Path) -> str:
+        ...
+
+    def status(self, batch_id: str) -> str:
+        ...
+
+    def results(self, batch_id: str) -> Dict[str, BatchResult]:
+        ...
+
+
+def batch_request_body(
+    llm: Any,
+    agent_name: str,
+    system_prompt: str,
+    conversation: Sequence[Message],
+    documents: Sequence[Document],
+) -> Dict[str, Any]:
+    build = getattr(llm, "batch_request_body", None)
+    if build is None:
+        raise TypeError(f"{type(llm).__name__} does not support the Batch API.")
+    return build(agent_name, system_prompt, conversation, documents)
+
+
+def batch_request_line(custom_id: str, body: Dict[str, Any], url: str) -> Dict[str, Any]:
+    return {"custom_id": custom_id, "method": "POST", "url": url, "body": body}
+
+
+def write_batch_file(path: Path, lines: Iterable[Dict[str, Any]]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        for line in lines:
+            handle.write(json.dumps(line, ensure_ascii=False) + "\n")
+    return path
+
+
+def parse_batch_output(lines: Iterable[str]) -> Dict[str, BatchResult]:
+    results: Dict[str, BatchResult] = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        custom_id = str(record["custom_id"])
+        response = record.get("response") or {}
+        body = response.get("body") or {}
+        error = record.get("error") or body.get("error")
+        status_code = int(response.get("status_code") or 0)
+        if error or status_code >= 400:
+            message = error.get("message") if isinstance(error, dict) else error
+            results[custom_id] = BatchResult(custom_id, None, message or f"HTTP {status_code}")
+            continue
+        choices = body.get("choices") or []
+        content = choices[0].get("message", {}).get("content") if choices else ""
+        results[custom_id] = BatchResult(custom_id, (content or "").strip())
+    return results
+
+
+class OpenAIBatchEndpoint:
+    def __init__(
+        self,
+        client: Any,
+        url: str = OPENAI_BATCH_URL,
+        completion_window: str = "24h",
+    ) -> None:
+        self._client = client
+        self.url = url
+        self.completion_window = completion_window
+
+    def submit(self, input_path: Path) -> str:
+        with input_path.open("rb") as handle:
+            uploaded = self._client.files.create(file=handle, purpose="batch")
+        batch = self._client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=self.url,
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self._client.batches.retrieve(batch_id).status
+
+    def results(self, batch_id: str) -> Dict[str, BatchResult]:
+        batch = self._client.batches.retrieve(batch_id)
+        results: Dict[str, BatchResult] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = self._client.files.content(file_id).text
+                results.update(parse_batch_output(content.splitlines()))
+        return results
+
+
+class LocalBatchEndpoint:
+    def __init__(
+        self,
+        directory: Path,
+        responder: BatchResponder | None = None,
+        polls_until_complete: int = 0,
+        url: str = OPENAI_BATCH_URL,
+    ) -> None:
+        self.directory = directory
+        self.responder = responder or echo_responder
+        self.polls_until_complete = polls_until_complete
+        self.url = url
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def submit(self, input_path: Path) -> str:
+        batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+        batch_dir = self.directory / batch_id
+        batch_dir.mkdir()
+        shutil.copyfile(input_path, batch_dir / "input.jsonl")
+        self._write_state(batch_id, {"status": "validating", "polls": 0})
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        state = self._read_state(batch_id)
+        if state["status"] in TERMINAL_BATCH_STATUSES:
+            return state["status"]
+        if state["polls"] < self.polls_until_complete:
+            state.update(status="in_progress", polls=state["polls"] + 1)
+        else:
+            self._process(batch_id)
+            state["status"] = "completed"
+        self._write_state(batch_id, state)
+        return state["status"]
+
+    def results(self, batch_id: str) -> Dict[str, BatchResult]:
+        output_path = self.directory / batch_id / "output.jsonl"
+        if not output_path.exists():
+            return {}
+        return parse_batch_output(output_path.read_text(encoding="utf-8").splitlines())
+
+    def _process(self, batch_id: str) -> None:
+        batch_dir = self.directory / batch_id
+        lines = (batch_dir / "input.jsonl").read_text(encoding="utf-8").splitlines()
+        with (batch_dir / "output.jsonl").open("w", encoding="utf-8") as handle:
+            for line in lines:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                handle.write(json.dumps(self._respond(request), ensure_ascii=False) + "\n")
+
+    def _respond(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        custom_id = request["custom_id"]
+        try:
+            content = self.responder(request["body"])
+        except Exception as exc:
+            return {
+                "custom_id": custom_id,
+                "response": None,
+                "error": {"code": "responder_error", "message": str(exc)},
+            }
+        return {
+            "custom_id": custom_id,
+            "response": {
+                "status_code": 200,
+                "body": {
+                    "model": request["body"].get("model"),
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                },
+            },
+            "error": None,
+        }
+
+    def _read_state(self, batch_id: str) -> Dict[str, Any]:
+        return json.loads((self.directory / batch_id / "status.json").read_text(encoding="utf-8"))
+
+    def _write_state(self, batch_id: str, state: Dict[str, Any]) -> None:
+        (self.directory / batch_id / "status.json").write_text(json.dumps(state), encoding="utf-8")
+
+
+def echo_responder(body: Dict[str, Any]) -> str:
+    messages = body.get("messages") or []
+    latest = next(
+        (message["content"] for message in reversed(messages) if message["role"] == "user"),
+        "",
+    )
+    return f"Batch response. {latest}"
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, Protocol, Sequence
+
+from .base import (
+    LLMClient,
+    client_settings,
+    complete_async,
+    stream_completion,
+    stream_completion_async,
+)
+from ..documents import iter_chunks
+from ..schemas import Document, Message
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> str | None:
+        ...
+
+    def set(self, key: str, value: str) -> None:
+        ...
+
+
+class InMemoryCacheBackend:
+    def __init__(self, max_entries: int = 1000) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float | None = None,
+        max_entries: int = 10000,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        self.path = path
+        self.ttl_seconds = ttl_seconds or None
+        self.max_entries = max_entries
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_accessed_at ON llm_cache (accessed_at)"
+        )
+        self._connection.commit()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._connection.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._connection.commit()
+                return None
+            self._connection.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._connection.commit()
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if self.ttl_seconds is not None:
+                self._connection.execute(
+                    "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+                )
+            self._connection.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        return int(row[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class CachingLLMClient:
+    def __init__(self, inner: LLMClient, backend: CacheBackend) -> None:
+        self.inner = inner
+        self.backend = backend
+        # Answers depend on the provider, model, sampling and context budget, not just the prompt.
+        self._settings = client_settings(inner)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def complete(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        key = cache_key(agent_name, system_prompt, conversation, documents, self._settings)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        content = self.inner.complete(agent_name, system_prompt, conversation, documents)
+        self.backend.set(key, content)
+        return content
+
+    async def acomplete(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        key = cache_key(agent_name, system_prompt, conversation, documents, self._settings)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        content = await complete_async(
+            self.inner, agent_name, system_prompt, conversation, documents
+        )
+        self.backend.set(key, content)
+        return content
+
+    def stream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> Iterator[str]:
+        key = cache_key(agent_name, system_prompt, conversation, documents, self._settings)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+        deltas = []
+        for delta in stream_completion(
+            self.inner, agent_name, system_prompt, conversation, documents
+        ):
+            deltas.append(delta)
+            yield delta
+        self.backend.set(key, "".join(deltas).strip())
+
+    async def astream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> AsyncIterator[str]:
+        key = cache_key(agent_name, system_prompt, conversation, documents, self._settings)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+        deltas = []
+        async for delta in stream_completion_async(
+            self.inner, agent_name, system_prompt, conversation, documents
+        ):
+            deltas.append(delta)
+            yield delta
+        self.backend.set(key, "".join(deltas).strip())
+
+    def settings(self) -> Dict[str, Any]:
+        return self._settings
+
+    def stats(self) -> Dict[str, Any]:
+        inner_stats = getattr(self.inner, "stats", None)
+        merged = dict(inner_stats()) if inner_stats is not None else {}
+        with self._lock:
+            return {
+                **merged,
+                "cache_backend": type(self.backend).__name__,
+                "cache_hits": self.hits,
+                "cache_misses": self.misses,
+            }
+
+    def _lookup(self, key: str) -> str | None:
+        cached = self.backend.get(key)
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return cached
+
+
+def cache_key(
+    agent_name: str,
+    system_prompt: str,
+    conversation: Sequence[Message],
+    documents: Sequence[Document],
+    settings: Dict[str, Any] | None = None,
+) -> str:
+    payload: Dict[str, Any] = {
+        "agent_name": agent_name,
+        "system_prompt": system_prompt,
+        "conversation": [
+            [message.role, message.agent_name, message.content] for message in conversation
+        ],
+        "documents": [_document_digest(doc) for doc in documents],
+    }
+    if settings is not None:
+        payload["settings"] = settings
+    encoded = json.dumps(payload, ensure_ascii=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def wrap_with_cache_from_env(client: LLMClient) -> LLMClient:
+    cache_kind = os.getenv("LLM_CACHE", "none").strip().lower()
+    if cache_kind in {"", "none", "off"}:
+        return client
+    max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+    if cache_kind == "memory":
+        return CachingLLMClient(client, InMemoryCacheBackend(max_entries=max_entries))
+    if cache_kind == "sqlite":
+        path = Path(os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3"))
+        ttl_seconds = float(os.getenv("LLM_CACHE_TTL_SECONDS", "0"))
+        backend = SQLiteCacheBackend(path, ttl_seconds=ttl_seconds, max_entries=max_entries)
+        return CachingLLMClient(client, backend)
+    raise ValueError(f"Unsupported LLM_CACHE '{cache_kind}'. Use none, memory, or sqlite.")
+
+
+@lru_cache(maxsize=1024)
+def _document_digest(document: Document) -> str:
+    digest = hashlib.sha256()
+    digest.update(document.path.encode("utf-8"))
+    for chunk in iter_chunks(document):
+        digest.update(b"\0")
+        digest.update(chunk.text.encode("utf-8"))
+    return digest.hexdigest()
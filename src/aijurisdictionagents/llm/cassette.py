@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Sequence
+
+from .base import (
+    LLMClient,
+    client_settings,
+    complete_async,
+    stream_completion,
+    stream_completion_async,
+)
+from .cache import cache_key
+from ..schemas import Document, Message
+
+
+class CassetteMiss(LookupError):
+    pass
+
+
+class RecordingLLMClient:
+    def __init__(self, inner: LLMClient, path: Path) -> None:
+        self.inner = inner
+        self.path = path
+        self._settings = client_settings(inner)
+        self.recorded = 0
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    def complete(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        started = time.perf_counter()
+        content = self.inner.complete(agent_name, system_prompt, conversation, documents)
+        self._record(
+            agent_name, system_prompt, conversation, documents, content, started, None
+        )
+        return content
+
+    async def acomplete(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        started = time.perf_counter()
+        content = await complete_async(
+            self.inner, agent_name, system_prompt, conversation, documents
+        )
+        self._record(
+            agent_name, system_prompt, conversation, documents, content, started, None
+        )
+        return content
+
+    def stream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> Iterator[str]:
+        started = time.perf_counter()
+        first_token: float | None = None
+        deltas: List[str] = []
+        for delta in stream_completion(
+            self.inner, agent_name, system_prompt, conversation, documents
+        ):
+            if first_token is None:
+                first_token = time.perf_counter() - started
+            deltas.append(delta)
+            yield delta
+        self._record(
+            agent_name,
+            system_prompt,
+            conversation,
+            documents,
+            "".join(deltas).strip(),
+            started,
+            first_token,
+        )
+
+    async def astream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> AsyncIterator[str]:
+        started = time.perf_counter()
+        first_token: float | None = None
+        deltas: List[str] = []
+        async for delta in stream_completion_async(
+            self.inner, agent_name, system_prompt, conversation, documents
+        ):
+            if first_token is None:
+                first_token = time.perf_counter() - started
+            deltas.append(delta)
+            yield delta
+        self._record(
+            agent_name,
+            system_prompt,
+            conversation,
+            documents,
+            "".join(deltas).strip(),
+            started,
+            first_token,
+        )
+
+    def settings(self) -> Dict[str, Any]:
+        return self._settings
+
+    def stats(self) -> Dict[str, Any]:
+        inner_stats = getattr(self.inner, "stats", None)
+        merged = dict(inner_stats()) if inner_stats is not None else {}
+        with self._lock:
+            return {**merged, "cassette_recorded": self.recorded}
+
+    def _record(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+        content: str,
+        started: float,
+        first_token_seconds: float | None,
+    ) -> None:
+        entry = {
+            "key": cache_key(agent_name, system_prompt, conversation, documents),
+            "agent_name": agent_name,
+            "settings": self._settings,
+            "response": content,
+            "latency_seconds": round(time.perf_counter() - started, 6),
+            "first_token_seconds": (
+                None if first_token_seconds is None else round(first_token_seconds, 6)
+            ),
+            "prompt_chars": len(system_prompt)
+            + sum(len(message.content) for message in conversation),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+            self.recorded += 1
+
+
+class ReplayLLMClient:
+    def __init__(
+        self,
+        path: Path,
+        simulate_latency: bool = False,
+        latency_scale: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+        settings: Dict[str, Any] | None = None,
+    ) -> None:
+        self.path = path
+        # Round-trip through JSON so tuples and lists compare like the recorded entries.
+        self.expected_settings = None if settings is None else json.loads(json.dumps(settings))
+        self.simulate_latency = simulate_latency
+        self.latency_scale = latency_scale
+        self._sleep = sleep
+        self._entries: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._served: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.simulated_seconds = 0.0
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]].append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def complete(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        entry = self._next(agent_name, system_prompt, conversation, documents)
+        self._sleep(self._delay(entry["latency_seconds"]))
+        return entry["response"]
+
+    async def acomplete(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        entry = self._next(agent_name, system_prompt, conversation, documents)
+        await asyncio.sleep(self._delay(entry["latency_seconds"]))
+        return entry["response"]
+
+    def stream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> Iterator[str]:
+        entry = self._next(agent_name, system_prompt, conversation, documents)
+        first, rest = _stream_delays(entry)
+        deltas = _split_deltas(entry["response"])
+        self._sleep(self._delay(first))
+        for delta in deltas:
+            self._sleep(self._delay(rest / max(1, len(deltas))))
+            yield delta
+
+    async def astream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> AsyncIterator[str]:
+        entry = self._next(agent_name, system_prompt, conversation, documents)
+        first, rest = _stream_delays(entry)
+        deltas = _split_deltas(entry["response"])
+        await asyncio.sleep(self._delay(first))
+        for delta in deltas:
+            await asyncio.sleep(self._delay(rest / max(1, len(deltas))))
+            yield delta
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cassette_hits": self.hits,
+                "cassette_misses": self.misses,
+                "cassette_simulated_seconds": round(self.simulated_seconds, 3),
+            }
+
+    def _next(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> Dict[str, Any]:
+        key = cache_key(agent_name, system_prompt, conversation, documents)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                raise CassetteMiss(
+                    f"No recorded response for {agent_name} (key {key[:12]}) in {self.path}"
+                )
+            # Repeated identical requests replay in recorded order, then reuse the last one.
+            served = self._served[key]
+            entry = entries[min(served, len(entries) - 1)]
+            recorded = entry.get("settings")
+            expected = self.expected_settings
+            if expected is not None and recorded is not None and recorded != expected:
+                self.misses += 1
+                raise CassetteMiss(
+                    f"Response for {agent_name} in {self.path} was recorded with {recorded}, "
+                    f"not {expected}"
+                )
+            self._served[key] = served + 1
+            self.hits += 1
+            return entry
+
+    def _delay(self, seconds: float) -> float:
+        if not self.simulate_latency:
+            return 0.0
+        delay = max(0.0, seconds * self.latency_scale)
+        with self._lock:
+            self.simulated_seconds += delay
+        return delay
+
+
+def wrap_with_recording_from_env(client: LLMClient) -> LLMClient:
+    if os.getenv("LLM_CASSETTE", "").strip().lower() != "record":
+        return client
+    return RecordingLLMClient(client, _cassette_path())
+
+
+def load_replay_from_env(
+    settings: Callable[[], Dict[str, Any] | None] | None = None,
+) -> ReplayLLMClient | None:
+    if os.getenv("LLM_CASSETTE", "").strip().lower() != "replay":
+        return None
+    simulate = os.getenv("LLM_CASSETTE_SIMULATE_LATENCY", "0").strip().lower()
+    return ReplayLLMClient(
+        _cassette_path(),
+        simulate_latency=simulate in {"1", "true", "yes", "on"},
+        latency_scale=float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", "1")),
+        settings=settings() if settings is not None else None,
+    )
+
+
+def _cassette_path() -> Path:
+    return Path(os.getenv("LLM_CASSETTE_PATH", ".cache/llm_cassette.jsonl"))
+
+
+def _stream_delays(entry: Dict[str, Any]) -> tuple[float, float]:
+    total = float(entry["latency_seconds"])
+    first = entry.get("first_token_seconds")
+    first = total if first is None else float(first)
+    return first, max(0.0, total - first)
+
+
+def _split_deltas(content: str) -> List[str]:
+    return re.findall(r"\S+\s*", content) or [content]
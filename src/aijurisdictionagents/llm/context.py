@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import math
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from ..documents import DocumentIndex, chunk_text, tokenize
+from ..schemas import Document, DocumentChunk, Message
+
+DEFAULT_CONTEXT_TOKENS = 1000
+CONTEXT_CHUNK_SIZE = 800
+MIN_TRUNCATED_TOKENS = 32
+
+TokenCounter = Callable[[str], int]
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    return max(1, math.ceil(len(text) / 4))
+
+
+def count_tokens(text: str) -> int:
+    encoder = _tiktoken_encoder()
+    if encoder is None:
+        return estimate_tokens(text)
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def pack_context(
+    documents: Sequence[Document],
+    conversation: Sequence[Message],
+    max_tokens: int = DEFAULT_CONTEXT_TOKENS,
+    token_counter: TokenCounter | None = None,
+) -> str:
+    counter = token_counter or count_tokens
+    header = "Context documents:"
+    entries = [header]
+    remaining = max_tokens - counter(header)
+    if not documents or remaining <= 0:
+        return header
+
+    index = _index_for(tuple(documents))
+    terms = tokenize(_latest_turn(conversation))
+    ranked = [hit.chunk for hit in index.search_chunks(terms, top_k=len(index.chunks))]
+    matched = {id(chunk) for chunk in ranked}
+    ranked.extend(chunk for chunk in index.chunks if id(chunk) not in matched)
+
+    for chunk in ranked:
+        if remaining < MIN_TRUNCATED_TOKENS:
+            break
+        entry = _render_chunk(chunk)
+        cost = counter(entry)
+        if cost <= remaining:
+            entries.append(entry)
+            remaining -= cost
+            continue
+        # The budget ends inside this chunk; later, lower-ranked chunks are not worth counting.
+        truncated = _truncate_to_budget(entry, remaining, counter, terms)
+        if truncated:
+            entries.append(truncated)
+        break
+    return "\n".join(entries)
+
+
+def load_context_tokens_from_env() -> int:
+    return int(os.getenv("LLM_CONTEXT_TOKENS", str(DEFAULT_CONTEXT_TOKENS)))
+
+
+def _latest_turn(conversation: Sequence[Message]) -> str:
+    for message in reversed(conversation):
+        if message.content.strip():
+            return message.content
+    return ""
+
+
+def _render_chunk(chunk: DocumentChunk) -> str:
+    body = " ".join(chunk.text.split())
+    return f"[{os.path.basename(chunk.path)}] {body}"
+
+
+def _truncate_to_budget(
+    entry: str,
+    budget: int,
+    counter: TokenCounter,
+    terms: Sequence[str],
+) -> str:
+    header, _, body = entry.partition("] ")
+    prefix = f"{header}] "
+    width = max(0, budget * 4 - len(prefix))
+    lowered = body.lower()
+    hits = [lowered.find(term) for term in terms if term in lowered]
+    start = max(0, min(hits) - width // 4) if hits else 0
+    candidate = body[start : start + width]
+    while candidate and counter(prefix + candidate) > budget:
+        candidate = candidate[: int(len(candidate) * 0.8)]
+    return prefix + candidate if candidate else ""
+
+
+# A run reuses one document set; a small cache avoids pinning many chunked copies of it.
+@lru_cache(maxsize=2)
+def _index_for(documents: tuple[Document, ...]) -> DocumentIndex:
+    chunked = [
+        doc
+        if doc.chunks
+        else Document(
+            doc_id=doc.doc_id,
+            path=doc.path,
+            chunks=chunk_text(doc.doc_id, Path(doc.path), doc.content, CONTEXT_CHUNK_SIZE),
+        )
+        for doc in documents
+    ]
+    return DocumentIndex(chunked)
+
+
+@lru_cache(maxsize=1)
+def _tiktoken_encoder() -> Any:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:  # pragma: no cover - encoding files unavailable offline.
+        return None
+
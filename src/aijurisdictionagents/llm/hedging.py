@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Sequence
+
+from .base import (
+    LLMClient,
+    client_settings,
+    complete_async,
+    stream_completion,
+    stream_completion_async,
+)
+from .router import BackendFactory, LatencyWindow, parse_backend_specs
+from ..schemas import Document, Message
+
+
+class HedgingLLMClient:
+    def __init__(
+        self,
+        primary: LLMClient,
+        hedge: LLMClient | None = None,
+        percentile: float = 0.95,
+        max_hedge_rate: float = 0.1,
+        min_samples: int = 20,
+        window_size: int = 200,
+        clock: Callable[[], float] = time.monotonic,
+        max_workers: int = 8,
+    ) -> None:
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        if not 0 <= max_hedge_rate <= 1:
+            raise ValueError("max_hedge_rate must be between 0 and 1")
+        if max_workers <= 0:
+            raise ValueError("max_workers must be > 0")
+        self.primary = primary
+        self.hedge = hedge or primary
+        self.percentile = percentile
+        self.max_hedge_rate = max_hedge_rate
+        self.min_samples = min_samples
+        self.window = LatencyWindow(window_size)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self.max_workers = max_workers
+        self.busy_workers = 0
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_skips = 0
+        self.saturation_skips = 0
+
+    def hedge_delay(self) -> float | None:
+        if len(self.window) < self.min_samples:
+            return None
+        return self.window.percentile(self.percentile)
+
+    def complete(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        args = (agent_name, system_prompt, conversation, documents)
+        self._count_call()
+        delay = self.hedge_delay()
+        if delay is None:
+            return self._timed_primary(*args)
+
+        # Running losers hold workers; never queue a call behind them, just skip the hedge.
+        primary = self._submit(self._timed_primary, *args)
+        if primary is None:
+            return self._timed_primary(*args)
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+        if not self._reserve_hedge():
+            return primary.result()
+        hedge = self._submit(self.hedge.complete, *args)
+        if hedge is None:
+            self._release_hedge()
+            return primary.result()
+
+        winner = _first_success([primary, hedge])
+        # Threads cannot be interrupted: a queued loser is dropped, a running one is ignored.
+        (hedge if winner is primary else primary).cancel()
+        if winner is hedge:
+            self._count_hedge_win()
+        return winner.result()
+
+    async def acomplete(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        args = (agent_name, system_prompt, conversation, documents)
+        self._count_call()
+        delay = self.hedge_delay()
+        if delay is None:
+            return await self._atimed_primary(*args)
+
+        tasks: List[asyncio.Future[str]] = [asyncio.ensure_future(self._atimed_primary(*args))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and self._reserve_hedge():
+                tasks.append(asyncio.ensure_future(complete_async(self.hedge, *args)))
+            winner = await _afirst_success(tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        if len(tasks) > 1 and winner is tasks[1]:
+            self._count_hedge_win()
+        return winner.result()
+
+    def stream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> Iterator[str]:
+        yield from stream_completion(
+            self.primary, agent_name, system_prompt, conversation, documents
+        )
+
+    async def astream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> AsyncIterator[str]:
+        async for delta in stream_completion_async(
+            self.primary, agent_name, system_prompt, conversation, documents
+        ):
+            yield delta
+
+    def settings(self) -> Dict[str, Any]:
+        return {"primary": client_settings(self.primary), "hedge": client_settings(self.hedge)}
+
+    def stats(self) -> Dict[str, Any]:
+        inner_stats = getattr(self.primary, "stats", None)
+        merged = dict(inner_stats()) if inner_stats is not None else {}
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                **merged,
+                "hedge_calls": self.calls,
+                "hedged_requests": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "hedge_budget_skips": self.budget_skips,
+                "hedge_saturation_skips": self.saturation_skips,
+                "hedge_busy_workers": self.busy_workers,
+                "hedge_delay_ms": None if delay is None else round(delay * 1000, 1),
+            }
+
+    def _count_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def _count_hedge_win(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+    def _reserve_hedge(self) -> bool:
+        with self._lock:
+            if self.hedged + 1 > self.max_hedge_rate * self.calls:
+                self.budget_skips += 1
+                return False
+            self.hedged += 1
+            return True
+
+    def _release_hedge(self) -> None:
+        with self._lock:
+            self.hedged -= 1
+
+    def _timed_primary(self, *args: Any) -> str:
+        # The delay comes from the primary's own latency; hedged end-to-end times would lower it.
+        start = self._clock()
+        try:
+            content = self.primary.complete(*args)
+        except BaseException:
+            self._record(start, ok=False)
+            raise
+        self._record(start, ok=True)
+        return content
+
+    async def _atimed_primary(self, *args: Any) -> str:
+        start = self._clock()
+        try:
+            content = await complete_async(self.primary, *args)
+        except asyncio.CancelledError:
+            # Cancelled after the hedge won: the primary took at least this long.
+            self._record(start, ok=True)
+            raise
+        except BaseException:
+            self._record(start, ok=False)
+            raise
+        self._record(start, ok=True)
+        return content
+
+    def _record(self, start: float, ok: bool) -> None:
+        self.window.record(self._clock() - start, ok=ok)
+
+    def _submit(self, fn: Callable[..., str], *args: Any) -> Future[str] | None:
+        with self._lock:
+            if self.busy_workers >= self.max_workers:
+                self.saturation_skips += 1
+                return None
+            self.busy_workers += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="llm-hedge"
+                )
+            executor = self._executor
+        future = executor.submit(contextvars.copy_context().run, fn, *args)
+        future.add_done_callback(self._release_worker)
+        return future
+
+    def _release_worker(self, _future: Future[str]) -> None:
+        with self._lock:
+            self.busy_workers -= 1
+
+
+def _first_success(futures: List[Future[str]]) -> Future[str]:
+    pending = set(futures)
+    while True:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in futures:
+            if future in done and future.exception() is None:
+                return future
+        if not pending:
+            return futures[0]
+
+
+async def _afirst_success(tasks: List[asyncio.Future[str]]) -> asyncio.Future[str]:
+    pending = set(tasks)
+    while True:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in tasks:
+            if task in done and task.exception() is None:
+                return task
+        if not pending:
+            return tasks[0]
+
+
+def wrap_with_hedging_from_env(client: LLMClient, factory: BackendFactory) -> LLMClient:
+    if os.getenv("LLM_HEDGE", "").strip().lower() not in {"1", "true", "yes", "on"}:
+        return client
+    hedge_specs = parse_backend_specs(os.getenv("LLM_HEDGE_BACKEND", ""))
+    hedge = factory(*hedge_specs[0]) if hedge_specs else None
+    return HedgingLLMClient(
+        client,
+        hedge=hedge,
+        percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95")),
+        max_hedge_rate=float(os.getenv("LLM_HEDGE_MAX_RATE", "0.1")),
+        min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")),
+        max_workers=int(os.getenv("LLM_HEDGE_MAX_WORKERS", "8")),
+    )
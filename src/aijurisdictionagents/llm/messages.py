@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Dict, List, Sequence
+
+from .context import DEFAULT_CONTEXT_TOKENS, estimate_tokens, pack_context
+from ..schemas import Document, Message
+
+ChatMessage = Dict[str, str]
+
+
+def build_chat_messages(
+    system_prompt: str,
+    conversation: Sequence[Message],
+    documents: Sequence[Document],
+    context_tokens: int = DEFAULT_CONTEXT_TOKENS,
+) -> List[ChatMessage]:
+    messages = [{"role": "system", "content": system_prompt}]
+    for message in conversation:
+        messages.append(
+            {
+                "role": to_openai_role(message.role),
+                "content": f"{message.agent_name}: {message.content}",
+            }
+        )
+    if documents:
+        messages.append(
+            {"role": "system", "content": pack_context(documents, conversation, context_tokens)}
+        )
+    return messages
+
+
+def estimate_message_tokens(messages: Sequence[ChatMessage]) -> int:
+    return sum(estimate_tokens(message["content"]) + 4 for message in messages)
+
+
+def to_openai_role(role: str) -> str:
+    if role in {"user", "assistant", "system"}:
+        return role
+    return "user"
+
+
+class PrefixTracker:
+    def __init__(self) -> None:
+        self._previous: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.last_stable_chars = 0
+        self.stable_chars_total = 0
+        self.prompt_chars_total = 0
+
+    def observe(self, agent_name: str, messages: Sequence[ChatMessage]) -> int:
+        serialized = [json.dumps(message, ensure_ascii=False) for message in messages]
+        with self._lock:
+            previous = self._previous.get(agent_name, [])
+            stable = _common_prefix_chars(previous, serialized)
+            self._previous[agent_name] = serialized
+            self.calls += 1
+            self.last_stable_chars = stable
+            self.stable_chars_total += stable
+            self.prompt_chars_total += sum(len(part) for part in serialized)
+        return stable
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            ratio = 0.0
+            if self.prompt_chars_total:
+                ratio = self.stable_chars_total / self.prompt_chars_total
+            return {
+                "prompt_calls": self.calls,
+                "prompt_prefix_chars_last": self.last_stable_chars,
+                "prompt_prefix_chars_total": self.stable_chars_total,
+                "prompt_chars_total": self.prompt_chars_total,
+                "prompt_prefix_ratio": round(ratio, 4),
+            }
+
+
+def _common_prefix_chars(previous: Sequence[str], current: Sequence[str]) -> int:
+    stable = 0
+    for before, after in zip(previous, current):
+        if before == after:
+            stable += len(after)
+            continue
+        limit = min(len(before), len(after))
+        index = 0
+        while index < limit and before[index] == after[index]:
+            index += 1
+        return stable + index
+    return stable
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import re
 from pathlib import Path
-from typing import Sequence
+from typing import Any, AsyncIterator, Dict, Iterator, Sequence
 
 from .base import LLMClient
+from .messages import build_chat_messages
 from ..schemas import Document, Message
 
 
@@ -41,6 +43,47 @@ class MockLLMClient:
 
         return f"Response prepared for {agent_name}. User focus: {user_message}"
 
+    async def acomplete(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        return self.complete(agent_name, system_prompt, conversation, documents)
+
+    def stream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> Iterator[str]:
+        content = self.complete(agent_name, system_prompt, conversation, documents)
+        yield from re.findall(r"\S+\s*", content)
+
+    async def astream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> AsyncIterator[str]:
+        for delta in self.stream(agent_name, system_prompt, conversation, documents):
+            yield delta
+
+    def batch_request_body(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> Dict[str, Any]:
+        return {
+            "model": "mock",
+            "messages": build_chat_messages(system_prompt, conversation, documents),
+        }
+
 
 def _latest_user_message(conversation: Sequence[Message]) -> str:
     for message in reversed(conversation):
@@ -2,10 +2,16 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Iterable, Sequence
+from typing import Any, AsyncIterator, Dict, Iterator, Sequence
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
+from .batch_api import OPENAI_BATCH_URL, OpenAIBatchEndpoint
+from .context import DEFAULT_CONTEXT_TOKENS, load_context_tokens_from_env
+from .messages import ChatMessage, PrefixTracker, build_chat_messages, estimate_message_tokens
+from .registry import ClientRegistry, credential_fingerprint, default_client_registry
+from .scheduler import RequestScheduler, shared_scheduler
+from .usage import record_response_usage
 from ..schemas import Document, Message
 
 
@@ -14,12 +20,28 @@ class OpenAIConfig:
     api_key: str
     model: str = "gpt-4o-mini"
     temperature: float = 0.2
+    context_tokens: int = DEFAULT_CONTEXT_TOKENS
+    base_url: str | None = None
 
 
 class OpenAIClient:
-    def __init__(self, config: OpenAIConfig) -> None:
+    def __init__(
+        self,
+        config: OpenAIConfig,
+        scheduler: RequestScheduler | None = None,
+        registry: ClientRegistry | None = None,
+    ) -> None:
         self._config = config
-        self._client = OpenAI(api_key=config.api_key)
+        self._registry = registry if registry is not None else default_client_registry()
+        self._registry_key = (
+            "openai",
+            config.base_url or "",
+            credential_fingerprint(config.api_key),
+        )
+        self._scheduler = scheduler or shared_scheduler(
+            f"openai:{config.base_url or ''}:{config.model}"
+        )
+        self._prefix = PrefixTracker()
 
     def complete(
         self,
@@ -28,33 +50,172 @@ class OpenAIClient:
         conversation: Sequence[Message],
         documents: Sequence[Document],
     ) -> str:
-        messages = [
-            {"role": "system", "content": system_prompt},
-        ]
-        if documents:
-            messages.append(
-                {
-                    "role": "system",
-                    "content": _render_documents(documents),
-                }
-            )
-
-        for message in conversation:
-            messages.append(
-                {
-                    "role": _to_openai_role(message.role),
-                    "content": f"{message.agent_name}: {message.content}",
-                }
-            )
-
-        response = self._client.chat.completions.create(
-            model=self._config.model,
-            temperature=self._config.temperature,
-            messages=messages,
+        messages = self._messages(agent_name, system_prompt, conversation, documents)
+        estimated = estimate_message_tokens(messages)
+        response = self._scheduler.call(
+            lambda timeout: self._sync_client().chat.completions.create(
+                model=self._config.model,
+                temperature=self._config.temperature,
+                messages=messages,
+                timeout=timeout,
+            ),
+            estimated,
         )
+        self._scheduler.record_usage(estimated, _total_tokens(response))
+        record_response_usage(response)
         content = response.choices[0].message.content if response.choices else ""
         return (content or "").strip()
 
+    async def acomplete(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        client = self._async_sdk_client()
+        messages = self._messages(agent_name, system_prompt, conversation, documents)
+        estimated = estimate_message_tokens(messages)
+        response = await self._scheduler.acall(
+            lambda timeout: client.chat.completions.create(
+                model=self._config.model,
+                temperature=self._config.temperature,
+                messages=messages,
+                timeout=timeout,
+            ),
+            estimated,
+        )
+        self._scheduler.record_usage(estimated, _total_tokens(response))
+        record_response_usage(response)
+        content = response.choices[0].message.content if response.choices else ""
+        return (content or "").strip()
+
+    def stream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> Iterator[str]:
+        messages = self._messages(agent_name, system_prompt, conversation, documents)
+        estimated = estimate_message_tokens(messages)
+        response = self._scheduler.call(
+            lambda timeout: self._sync_client().chat.completions.create(
+                model=self._config.model,
+                temperature=self._config.temperature,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=timeout,
+            ),
+            estimated,
+        )
+        usage_chunk = None
+        for chunk in response:
+            if getattr(chunk, "usage", None) is not None:
+                usage_chunk = chunk
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+        self._scheduler.record_usage(estimated, _total_tokens(usage_chunk))
+        record_response_usage(usage_chunk)
+
+    async def astream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> AsyncIterator[str]:
+        client = self._async_sdk_client()
+        messages = self._messages(agent_name, system_prompt, conversation, documents)
+        estimated = estimate_message_tokens(messages)
+        response = await self._scheduler.acall(
+            lambda timeout: client.chat.completions.create(
+                model=self._config.model,
+                temperature=self._config.temperature,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=timeout,
+            ),
+            estimated,
+        )
+        usage_chunk = None
+        async for chunk in response:
+            if getattr(chunk, "usage", None) is not None:
+                usage_chunk = chunk
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+        self._scheduler.record_usage(estimated, _total_tokens(usage_chunk))
+        record_response_usage(usage_chunk)
+
+    def batch_request_body(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> Dict[str, Any]:
+        return {
+            "model": self._config.model,
+            "temperature": self._config.temperature,
+            "messages": self._messages(agent_name, system_prompt, conversation, documents),
+        }
+
+    def batch_endpoint(self) -> OpenAIBatchEndpoint:
+        return OpenAIBatchEndpoint(self._sync_client(), url=OPENAI_BATCH_URL)
+
+    def stats(self) -> Dict[str, Any]:
+        # The scheduler is usually shared process-wide, so its counters span every run.
+        return {**self._prefix.stats(), "scheduler": self._scheduler.stats()}
+
+    def settings(self) -> Dict[str, Any]:
+        return {
+            "provider": "openai",
+            "base_url": self._config.base_url or "",
+            "model": self._config.model,
+            "temperature": self._config.temperature,
+            "context_tokens": self._config.context_tokens,
+        }
+
+    def _sync_client(self) -> OpenAI:
+        # Retries are owned by the shared scheduler, not the SDK.
+        return self._registry.get(
+            self._registry_key,
+            lambda http: OpenAI(
+                api_key=self._config.api_key,
+                base_url=self._config.base_url,
+                max_retries=0,
+                **http,
+            ),
+        )
+
+    def _async_sdk_client(self) -> AsyncOpenAI:
+        return self._registry.get_async(
+            self._registry_key,
+            lambda http: AsyncOpenAI(
+                api_key=self._config.api_key,
+                base_url=self._config.base_url,
+                max_retries=0,
+                **http,
+            ),
+        )
+
+    def _messages(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> list[ChatMessage]:
+        messages = build_chat_messages(
+            system_prompt, conversation, documents, self._config.context_tokens
+        )
+        self._prefix.observe(agent_name, messages)
+        return messages
+
 
 def load_openai_config_from_env() -> OpenAIConfig:
     api_key = os.getenv("OPENAI_KEY", "").strip()
@@ -63,25 +224,16 @@ def load_openai_config_from_env() -> OpenAIConfig:
 
     model = os.getenv("OPENAI_MODEL", "gpt-4o-mini").strip() or "gpt-4o-mini"
     temperature = float(os.getenv("OPENAI_TEMPERATURE", "0.2"))
-    return OpenAIConfig(api_key=api_key, model=model, temperature=temperature)
-
-
-def _render_documents(documents: Iterable[Document], max_chars: int = 4000) -> str:
-    chunks = ["Context documents:"]
-    total = 0
-    for doc in documents:
-        header = f"[{os.path.basename(doc.path)}]"
-        body = doc.content.strip().replace("\n", " ")
-        snippet = body[:800]
-        entry = f"{header} {snippet}"
-        total += len(entry)
-        if total > max_chars:
-            break
-        chunks.append(entry)
-    return "\n".join(chunks)
-
-
-def _to_openai_role(role: str) -> str:
-    if role in {"user", "assistant", "system"}:
-        return role
-    return "user"
+    base_url = os.getenv("OPENAI_BASE_URL", "").strip() or None
+    return OpenAIConfig(
+        api_key=api_key,
+        model=model,
+        temperature=temperature,
+        context_tokens=load_context_tokens_from_env(),
+        base_url=base_url,
+    )
+
+
+def _total_tokens(response: Any) -> int | None:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import threading
+import weakref
+from dataclasses import dataclass
+from importlib.util import find_spec
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+ClientFactory = Callable[[Dict[str, Any]], T]
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+
+
+class ClientRegistry:
+    def __init__(self, pool: PoolConfig | None = None) -> None:
+        self.pool = pool or PoolConfig()
+        self._lock = threading.Lock()
+        self._clients: Dict[Hashable, Any] = {}
+        self._async_clients: Dict[Tuple[Hashable, int], Tuple[weakref.ref[Any], Any]] = {}
+        self._loop_guards: Dict[int, asyncio.Task[None]] = {}
+
+    def get(self, key: Hashable, factory: ClientFactory[T]) -> T:
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = factory(_http_client_kwargs(self.pool, asynchronous=False))
+                self._clients[key] = client
+            return client
+
+    def get_async(self, key: Hashable, factory: ClientFactory[T]) -> T:
+        # Async connection pools are bound to the event loop that opened them.
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._prune_closed_loops()
+            entry = self._async_clients.get((key, id(loop)))
+            if entry is not None and entry[0]() is loop:
+                return entry[1]
+            client = factory(_http_client_kwargs(self.pool, asynchronous=True))
+            self._async_clients[(key, id(loop))] = (weakref.ref(loop), client)
+            if id(loop) not in self._loop_guards:
+                self._loop_guards[id(loop)] = loop.create_task(self._close_at_shutdown(loop))
+            return client
+
+    def __len__(self) -> int:
+        return len(self._clients) + len(self._async_clients)
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+    async def aclose(self) -> None:
+        # Clients bound to other loops stay registered for their own loop's aclose().
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            guard = self._loop_guards.pop(id(loop), None)
+        await self._close_loop_clients(loop)
+        if guard is not None and guard is not asyncio.current_task():
+            guard.cancel()
+        self.close()
+
+    async def _close_at_shutdown(self, loop: asyncio.AbstractEventLoop) -> None:
+        # asyncio.run() cancels leftover tasks while its loop can still run, which is the last
+        # point at which this loop's connection pools can be closed cleanly.
+        try:
+            await loop.create_future()
+        finally:
+            with self._lock:
+                if self._loop_guards.get(id(loop)) is asyncio.current_task():
+                    del self._loop_guards[id(loop)]
+            await self._close_loop_clients(loop)
+
+    async def _close_loop_clients(self, loop: asyncio.AbstractEventLoop) -> None:
+        with self._lock:
+            clients = [
+                self._async_clients.pop(key)[1]
+                for key, (loop_ref, _) in list(self._async_clients.items())
+                if loop_ref() is loop
+            ]
+        for client in clients:
+            await client.close()
+
+    def _prune_closed_loops(self) -> None:
+        # Only loops closed without cancelling their tasks get here. Their transports can no
+        # longer be closed through the loop, and their sockets are released when collected.
+        for key, (loop_ref, _) in list(self._async_clients.items()):
+            loop = loop_ref()
+            if loop is None or loop.is_closed():
+                del self._async_clients[key]
+        for loop_id, guard in list(self._loop_guards.items()):
+            if guard.get_loop().is_closed():
+                del self._loop_guards[loop_id]
+
+
+_default_registry: ClientRegistry | None = None
+_default_registry_lock = threading.Lock()
+
+
+def default_client_registry() -> ClientRegistry:
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = ClientRegistry(load_pool_config_from_env())
+        return _default_registry
+
+
+def credential_fingerprint(secret: str | None) -> str:
+    if not secret:
+        return ""
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()[:16]
+
+
+def load_pool_config_from_env() -> PoolConfig:
+    return PoolConfig(
+        max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_SECONDS", "30")),
+        http2=os.getenv("LLM_HTTP2", "1").strip().lower() not in {"0", "false", "no", "off"},
+    )
+
+
+def _http_client_kwargs(pool: PoolConfig, asynchronous: bool) -> Dict[str, Any]:
+    try:
+        import httpx
+        from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+    except ImportError:
+        # Without httpx the SDK keeps its own default pool; clients are still shared.
+        return {}
+    limits = httpx.Limits(
+        max_connections=pool.max_connections,
+        max_keepalive_connections=pool.max_keepalive_connections,
+        keepalive_expiry=pool.keepalive_expiry,
+    )
+    # HTTP/2 needs the optional h2 package (pip install "httpx[http2]").
+    http2 = pool.http2 and find_spec("h2") is not None
+    client_class = DefaultAsyncHttpxClient if asynchronous else DefaultHttpxClient
+    return {"http_client": client_class(limits=limits, http2=http2)}
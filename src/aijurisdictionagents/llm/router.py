@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+)
+
+from .base import (
+    LLMClient,
+    client_settings,
+    complete_async,
+    stream_completion,
+    stream_completion_async,
+)
+from .scheduler import DeadlineExceeded, is_retryable_error
+from ..schemas import Document, Message
+
+BackendFactory = Callable[[str, "str | None"], LLMClient]
+
+
+class BackendSaturated(TimeoutError):
+    pass
+
+
+class LatencyWindow:
+    def __init__(self, size: int = 100) -> None:
+        if size <= 0:
+            raise ValueError("size must be > 0")
+        self._latencies: Deque[float] = deque(maxlen=size)
+        self._outcomes: Deque[bool] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool = True) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self._outcomes.append(ok)
+
+    def percentile(self, q: float) -> float | None:
+        with self._lock:
+            ordered = sorted(self._latencies)
+        if not ordered:
+            return None
+        rank = min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))
+        return ordered[rank]
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def __len__(self) -> int:
+        return len(self._latencies)
+
+
+@dataclass
+class RouteBackend:
+    name: str
+    client: LLMClient
+    window: LatencyWindow
+    calls: int = 0
+    failures: int = 0
+    in_flight: int = 0
+    cooldown_until: float = 0.0
+
+    def score(self, error_penalty: float) -> float:
+        p95 = self.window.percentile(0.95)
+        if p95 is None:
+            return 0.0
+        return p95 * (1 + error_penalty * self.window.error_rate)
+
+
+class RoutingLLMClient:
+    def __init__(
+        self,
+        backends: Sequence[Tuple[str, LLMClient]],
+        window_size: int = 100,
+        timeout_seconds: float | None = None,
+        cooldown_seconds: float = 30.0,
+        max_error_rate: float = 0.5,
+        error_penalty: float = 4.0,
+        should_fail_over: Callable[[BaseException], bool] = is_retryable_error,
+        clock: Callable[[], float] = time.monotonic,
+        max_in_flight: int = 4,
+    ) -> None:
+        if not backends:
+            raise ValueError("at least one backend is required")
+        if max_in_flight <= 0:
+            raise ValueError("max_in_flight must be > 0")
+        names = [name for name, _ in backends]
+        if len(set(names)) != len(names):
+            raise ValueError(f"backend names must be unique: {names}")
+        self.backends = [
+            RouteBackend(name, client, LatencyWindow(window_size)) for name, client in backends
+        ]
+        self.timeout_seconds = timeout_seconds or None
+        self.cooldown_seconds = cooldown_seconds
+        self.max_error_rate = max_error_rate
+        self.error_penalty = error_penalty
+        self.should_fail_over = should_fail_over
+        self.max_in_flight = max_in_flight
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def ranked(self) -> List[RouteBackend]:
+        now = self._clock()
+        return sorted(
+            self.backends,
+            key=lambda backend: (
+                backend.cooldown_until > now,
+                backend.window.error_rate > self.max_error_rate,
+                backend.score(self.error_penalty),
+            ),
+        )
+
+    def complete(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        last_error: BaseException | None = None
+        for backend in self.ranked():
+            start = self._clock()
+            try:
+                content = self._complete_with_timeout(
+                    backend, agent_name, system_prompt, conversation, documents
+                )
+            except BackendSaturated as exc:
+                # Its stuck calls were already recorded as timeouts; this attempt adds no sample.
+                last_error = exc
+                continue
+            except Exception as exc:
+                if not self._fails_over(exc):
+                    raise
+                self._record(backend, start, ok=False)
+                last_error = exc
+                continue
+            self._record(backend, start, ok=True)
+            return content
+        assert last_error is not None
+        raise last_error
+
+    async def acomplete(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        last_error: BaseException | None = None
+        for backend in self.ranked():
+            start = self._clock()
+            try:
+                content = await asyncio.wait_for(
+                    complete_async(
+                        backend.client, agent_name, system_prompt, conversation, documents
+                    ),
+                    self.timeout_seconds,
+                )
+            except Exception as exc:
+                if not self._fails_over(exc):
+                    raise
+                self._record(backend, start, ok=False)
+                last_error = exc
+                continue
+            self._record(backend, start, ok=True)
+            return content
+        assert last_error is not None
+        raise last_error
+
+    def stream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> Iterator[str]:
+        last_error: BaseException | None = None
+        for backend in self.ranked():
+            start = self._clock()
+            deltas = stream_completion(
+                backend.client, agent_name, system_prompt, conversation, documents
+            )
+            try:
+                first = next(deltas, None)
+            except Exception as exc:
+                if not self._fails_over(exc):
+                    raise
+                self._record(backend, start, ok=False)
+                last_error = exc
+                continue
+            # Fail over only before the first delta; after that the caller has output.
+            if first is not None:
+                yield first
+            try:
+                yield from deltas
+            except Exception:
+                self._record(backend, start, ok=False)
+                raise
+            self._record(backend, start, ok=True)
+            return
+        assert last_error is not None
+        raise last_error
+
+    async def astream(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> AsyncIterator[str]:
+        last_error: BaseException | None = None
+        for backend in self.ranked():
+            start = self._clock()
+            deltas = stream_completion_async(
+                backend.client, agent_name, system_prompt, conversation, documents
+            ).__aiter__()
+            try:
+                first = await deltas.__anext__()
+            except StopAsyncIteration:
+                self._record(backend, start, ok=True)
+                return
+            except Exception as exc:
+                if not self._fails_over(exc):
+                    raise
+                self._record(backend, start, ok=False)
+                last_error = exc
+                continue
+            yield first
+            try:
+                async for delta in deltas:
+                    yield delta
+            except Exception:
+                self._record(backend, start, ok=False)
+                raise
+            self._record(backend, start, ok=True)
+            return
+        assert last_error is not None
+        raise last_error
+
+    def settings(self) -> Dict[str, Any]:
+        return {
+            "backends": {backend.name: client_settings(backend.client) for backend in self.backends}
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        backends: Dict[str, Any] = {}
+        for backend in self.backends:
+            p50 = backend.window.percentile(0.5)
+            p95 = backend.window.percentile(0.95)
+            inner_stats = getattr(backend.client, "stats", None)
+            backends[backend.name] = {
+                **(inner_stats() if inner_stats is not None else {}),
+                "calls": backend.calls,
+                "failures": backend.failures,
+                "in_flight": backend.in_flight,
+                "error_rate": round(backend.window.error_rate, 4),
+                "p50_ms": None if p50 is None else round(p50 * 1000, 1),
+                "p95_ms": None if p95 is None else round(p95 * 1000, 1),
+                "cooling_down": backend.cooldown_until > now,
+            }
+        return {"router_backends": backends}
+
+    def _complete_with_timeout(
+        self,
+        backend: RouteBackend,
+        agent_name: str,
+        system_prompt: str,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+    ) -> str:
+        if self.timeout_seconds is None:
+            return backend.client.complete(agent_name, system_prompt, conversation, documents)
+        with self._lock:
+            saturated = backend.in_flight >= self.max_in_flight
+            if not saturated:
+                backend.in_flight += 1
+        if saturated:
+            # Timed-out calls keep running in their workers; fail fast instead of queueing.
+            raise BackendSaturated(
+                f"LLM backend '{backend.name}' has {self.max_in_flight} calls still running"
+            )
+        started = threading.Event()
+
+        def call() -> str:
+            started.set()
+            try:
+                return backend.client.complete(agent_name, system_prompt, conversation, documents)
+            finally:
+                with self._lock:
+                    backend.in_flight -= 1
+
+        # The request deadline lives in a context variable, so carry it into the worker.
+        future = self._pool().submit(contextvars.copy_context().run, call)
+        # Every admitted call has a free worker, so the timeout clock starts when it runs.
+        started.wait()
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            raise TimeoutError(f"LLM backend '{backend.name}' timed out") from None
+
+    def _fails_over(self, exc: BaseException) -> bool:
+        if isinstance(exc, DeadlineExceeded):
+            return False
+        if isinstance(exc, (TimeoutError, asyncio.TimeoutError)):
+            return True
+        return self.should_fail_over(exc)
+
+    def _record(self, backend: RouteBackend, start: float, ok: bool) -> None:
+        now = self._clock()
+        backend.window.record(now - start, ok=ok)
+        with self._lock:
+            backend.calls += 1
+            if ok:
+                backend.cooldown_until = 0.0
+            else:
+                backend.failures += 1
+                backend.cooldown_until = now + self.cooldown_seconds
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_in_flight * len(self.backends),
+                    thread_name_prefix="llm-router",
+                )
+            return self._executor
+
+
+def parse_backend_specs(value: str) -> List[Tuple[str, str | None]]:
+    specs: List[Tuple[str, str | None]] = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        provider, _, target = entry.partition(":")
+        specs.append((provider.strip().lower(), target.strip() or None))
+    return specs
+
+
+def load_router_from_env(factory: BackendFactory) -> RoutingLLMClient:
+    specs = parse_backend_specs(os.getenv("LLM_ROUTER_BACKENDS", ""))
+    if not specs:
+        raise ValueError("LLM_ROUTER_BACKENDS is required when LLM_PROVIDER=router.")
+    if any(provider == "router" for provider, _ in specs):
+        raise ValueError("LLM_ROUTER_BACKENDS cannot contain 'router'.")
+    backends = [
+        (f"{provider}:{target}" if target else provider, factory(provider, target))
+        for provider, target in specs
+    ]
+    return RoutingLLMClient(
+        backends,
+        timeout_seconds=float(os.getenv("LLM_ROUTER_TIMEOUT_SECONDS", "0")) or None,
+        cooldown_seconds=float(os.getenv("LLM_ROUTER_COOLDOWN_SECONDS", "30")),
+        max_in_flight=int(os.getenv("LLM_ROUTER_MAX_IN_FLIGHT", "4")),
+    )
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import email.utils
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, TypeVar
+
+from ..telemetry import set_attributes, span
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+_request_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "llm_request_deadline", default=None
+)
+_schedulers: Dict[str, "RequestScheduler"] = {}
+_schedulers_lock = threading.Lock()
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@contextmanager
+def request_deadline(deadline: float | None) -> Iterator[None]:
+    if deadline is None:
+        yield
+        return
+    current = _request_deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _request_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+
+def remaining_request_time() -> float | None:
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    status_code = getattr(exc, "status_code", None)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return not isinstance(exc, DeadlineExceeded)
+    # openai.APIConnectionError/APITimeoutError carry no status code.
+    return type(exc).__name__ in {"APIConnectionError", "APITimeoutError"}
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        capacity: float,
+        refill_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if capacity <= 0 or refill_per_second <= 0:
+            raise ValueError("capacity and refill_per_second must be > 0")
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            self._refill()
+            self._tokens -= min(amount, self.capacity)
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.refill_per_second
+
+    def adjust(self, amount: float) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+        self._updated = now
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    request_timeout: float = 120.0
+
+    def __post_init__(self) -> None:
+        if self.max_attempts <= 0:
+            raise ValueError("max_attempts must be > 0")
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class RequestScheduler:
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        policy: RetryPolicy | None = None,
+        is_retryable: Callable[[BaseException], bool] = is_retryable_error,
+        sleep: Callable[[float], None] = time.sleep,
+        async_sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        self.policy = policy or RetryPolicy()
+        self.requests = (
+            TokenBucket(requests_per_minute, requests_per_minute / 60)
+            if requests_per_minute
+            else None
+        )
+        self.tokens = (
+            TokenBucket(tokens_per_minute, tokens_per_minute / 60) if tokens_per_minute else None
+        )
+        self.is_retryable = is_retryable
+        self._sleep = sleep
+        self._async_sleep = async_sleep
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.retry_count = 0
+        self.throttled_seconds = 0.0
+        self.deadline_exceeded = 0
+
+    def call(self, request: Callable[[float], T], estimated_tokens: int = 0) -> T:
+        attempt = 0
+        with span("llm.request", {"llm.estimated_tokens": estimated_tokens}) as current:
+            while True:
+                wait = self._throttle(estimated_tokens)
+                if wait:
+                    self._sleep(wait)
+                timeout = self._timeout()
+                try:
+                    return request(timeout)
+                except Exception as exc:
+                    delay = self._retry_delay(exc, attempt)
+                    if delay is None:
+                        raise
+                    attempt += 1
+                    self._sleep(delay)
+                finally:
+                    set_attributes(current, {"llm.attempts": attempt + 1})
+
+    async def acall(
+        self,
+        request: Callable[[float], Awaitable[T]],
+        estimated_tokens: int = 0,
+    ) -> T:
+        attempt = 0
+        with span("llm.request", {"llm.estimated_tokens": estimated_tokens}) as current:
+            while True:
+                wait = self._throttle(estimated_tokens)
+                if wait:
+                    await self._async_sleep(wait)
+                timeout = self._timeout()
+                try:
+                    return await request(timeout)
+                except Exception as exc:
+                    delay = self._retry_delay(exc, attempt)
+                    if delay is None:
+                        raise
+                    attempt += 1
+                    await self._async_sleep(delay)
+                finally:
+                    set_attributes(current, {"llm.attempts": attempt + 1})
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int | None) -> None:
+        if self.tokens is not None and actual_tokens is not None:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "llm_requests": self.request_count,
+                "llm_retries": self.retry_count,
+                "llm_throttled_seconds": round(self.throttled_seconds, 3),
+                "llm_deadline_exceeded": self.deadline_exceeded,
+            }
+
+    def _throttle(self, estimated_tokens: int) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None and estimated_tokens:
+            wait = max(wait, self.tokens.reserve(estimated_tokens))
+        remaining = remaining_request_time()
+        if remaining is not None and wait >= remaining:
+            if self.requests is not None:
+                self.requests.adjust(-1)
+            if self.tokens is not None and estimated_tokens:
+                self.tokens.adjust(-estimated_tokens)
+            self._deadline_missed()
+        with self._lock:
+            self.request_count += 1
+            self.throttled_seconds += wait
+        return wait
+
+    def _timeout(self) -> float:
+        remaining = remaining_request_time()
+        if remaining is None:
+            return self.policy.request_timeout
+        if remaining <= 0:
+            self._deadline_missed()
+        return min(self.policy.request_timeout, remaining)
+
+    def _retry_delay(self, exc: Exception, attempt: int) -> float | None:
+        if attempt + 1 >= self.policy.max_attempts or not self.is_retryable(exc):
+            return None
+        delay = retry_after_seconds(exc)
+        if delay is None:
+            delay = self.policy.backoff(attempt)
+        remaining = remaining_request_time()
+        if remaining is not None and delay >= remaining:
+            self._deadline_missed(exc)
+        with self._lock:
+            self.retry_count += 1
+        return delay
+
+    def _deadline_missed(self, cause: BaseException | None = None) -> None:
+        with self._lock:
+            self.deadline_exceeded += 1
+        raise DeadlineExceeded("LLM request deadline exceeded") from cause
+
+
+def shared_scheduler(key: str) -> RequestScheduler:
+    with _schedulers_lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None:
+            scheduler = load_scheduler_from_env()
+            _schedulers[key] = scheduler
+        return scheduler
+
+
+def load_scheduler_from_env() -> RequestScheduler:
+    policy = RetryPolicy(
+        max_attempts=int(os.getenv("LLM_MAX_RETRIES", "4")) + 1,
+        request_timeout=float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "120")),
+    )
+    return RequestScheduler(
+        requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0")) or None,
+        tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", "0")) or None,
+        policy=policy,
+    )
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from ..telemetry import record_tokens
+
+
+@dataclass(frozen=True)
+class TokenUsage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    calls: int = 0
+    reported_calls: int = 0
+
+    def __add__(self, other: TokenUsage) -> TokenUsage:
+        return TokenUsage(
+            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
+            completion_tokens=self.completion_tokens + other.completion_tokens,
+            total_tokens=self.total_tokens + other.total_tokens,
+            calls=self.calls + other.calls,
+            reported_calls=self.reported_calls + other.reported_calls,
+        )
+
+
+@dataclass(frozen=True)
+class CostModel:
+    prompt_per_1k: float = 0.0
+    completion_per_1k: float = 0.0
+
+    def estimate(self, usage: TokenUsage) -> float | None:
+        if not self.prompt_per_1k and not self.completion_per_1k:
+            return None
+        return round(
+            usage.prompt_tokens / 1000 * self.prompt_per_1k
+            + usage.completion_tokens / 1000 * self.completion_per_1k,
+            6,
+        )
+
+
+class UsageCollector:
+    def __init__(self) -> None:
+        self._usage = TokenUsage()
+        self._lock = threading.Lock()
+
+    def add(self, usage: TokenUsage) -> None:
+        with self._lock:
+            self._usage = self._usage + usage
+
+    def total(self) -> TokenUsage:
+        with self._lock:
+            return self._usage
+
+
+_current_collector: ContextVar[UsageCollector | None] = ContextVar(
+    "llm_usage_collector", default=None
+)
+
+
+@contextmanager
+def collect_usage() -> Iterator[UsageCollector]:
+    collector = UsageCollector()
+    token = _current_collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _current_collector.reset(token)
+
+
+def record_response_usage(response: Any) -> None:
+    collector = _current_collector.get()
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        if collector is not None:
+            collector.add(TokenUsage(calls=1))
+        return
+    prompt = getattr(usage, "prompt_tokens", None) or 0
+    completion = getattr(usage, "completion_tokens", None) or 0
+    record_tokens(prompt, completion)
+    if collector is None:
+        return
+    collector.add(
+        TokenUsage(
+            prompt_tokens=prompt,
+            completion_tokens=completion,
+            total_tokens=getattr(usage, "total_tokens", None) or prompt + completion,
+            calls=1,
+            reported_calls=1,
+        )
+    )
+
+
+def load_cost_model_from_env() -> CostModel:
+    return CostModel(
+        prompt_per_1k=float(os.getenv("LLM_PRICE_PER_1K_PROMPT_TOKENS", "0")),
+        completion_per_1k=float(os.getenv("LLM_PRICE_PER_1K_COMPLETION_TOKENS", "0")),
+    )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 from dataclasses import asdict
 from datetime import datetime, timezone
 from pathlib import Path
@@ -49,6 +50,7 @@ class TraceRecorder:
         self.run_dir = run_dir
         self.trace_path = run_dir / "trace.jsonl"
         self._handle = self.trace_path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
 
     def record_message(self, message: Message) -> None:
         payload = {
@@ -62,8 +64,11 @@ class TraceRecorder:
             "type": event_type,
             **payload,
         }
-        self._handle.write(json.dumps(record, ensure_ascii=True) + "\n")
-        self._handle.flush()
+        line = json.dumps(record, ensure_ascii=True) + "\n"
+        # Parallel steps record from worker threads.
+        with self._lock:
+            self._handle.write(line)
+            self._handle.flush()
 
     def close(self) -> None:
         self._handle.close()
@@ -1,3 +1,13 @@
-from .orchestrator import Orchestrator
+from .compaction import HistoryCompactor
+from .metrics import RunMetrics
+from .orchestrator import AgentTurn, Orchestrator, ParallelSteps, SummaryTurn, UserPrompt
 
-__all__ = ["Orchestrator"]
+__all__ = [
+    "AgentTurn",
+    "HistoryCompactor",
+    "Orchestrator",
+    "ParallelSteps",
+    "RunMetrics",
+    "SummaryTurn",
+    "UserPrompt",
+]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from ..schemas import Message
+
+HISTORY_SUMMARY_AGENT = "HistorySummary"
+SUMMARY_AGENT_NAME = "DiscussionSummary"
+
+
+@dataclass
+class HistoryCompactor:
+    keep_last: int
+    summary: str = ""
+    summarized_until: int = 1
+
+    def __post_init__(self) -> None:
+        if self.keep_last <= 0:
+            raise ValueError("keep_last must be > 0")
+
+    def needs_extension(self, conversation: Sequence[Message]) -> bool:
+        return len(conversation) - self.summarized_until >= 2 * self.keep_last
+
+    def extension_input(self, conversation: Sequence[Message]) -> List[Message]:
+        cutoff = len(conversation) - self.keep_last
+        pending = list(conversation[self.summarized_until : cutoff])
+        if not self.summary:
+            return pending
+        return [self._summary_message()] + pending
+
+    def extend(self, conversation: Sequence[Message], summary: str) -> int:
+        cutoff = len(conversation) - self.keep_last
+        folded = cutoff - self.summarized_until
+        self.summary = summary.strip()
+        self.summarized_until = cutoff
+        return folded
+
+    def compact(self, conversation: Sequence[Message]) -> List[Message]:
+        if not self.summary:
+            return list(conversation)
+        return [
+            *conversation[:1],
+            self._summary_message(),
+            *conversation[self.summarized_until :],
+        ]
+
+    def _summary_message(self) -> Message:
+        return Message(
+            role="system",
+            agent_name=SUMMARY_AGENT_NAME,
+            content=f"Summary of the earlier discussion: {self.summary}",
+        )
+
+
+def history_summary_prompt() -> str:
+    return (
+        "You maintain a running summary of a legal consultation.\n"
+        "If the conversation starts with a summary of the earlier discussion, extend it with "
+        "the messages that follow; otherwise summarize the messages.\n"
+        "Keep every fact, date, amount, document reference, question asked, and answer given. "
+        "Drop greetings and repetition.\n"
+        "Return only the updated summary as plain text."
+    )
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List
+
+from ..llm import DeadlineExceeded
+from ..llm.usage import CostModel, TokenUsage, collect_usage, load_cost_model_from_env
+from ..observability import TraceRecorder
+from ..telemetry import set_attributes, span as telemetry_span
+
+
+@dataclass(frozen=True)
+class TurnTiming:
+    kind: str
+    name: str
+    duration_seconds: float
+    status: str
+    usage: TokenUsage
+
+
+class RunMetrics:
+    def __init__(self, trace: TraceRecorder, cost_model: CostModel | None = None) -> None:
+        self.trace = trace
+        self.cost_model = cost_model or load_cost_model_from_env()
+        self.turns: List[TurnTiming] = []
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(
+        self, kind: str, name: str, abandoned: threading.Event | None = None
+    ) -> Iterator[None]:
+        status = "ok"
+        started = time.perf_counter()
+        with telemetry_span(
+            f"orchestration.turn.{kind}",
+            {"turn.kind": kind, "agent.name": name},
+            metric_keys=("turn.kind", "agent.name"),
+        ) as current, collect_usage() as collector:
+            try:
+                yield
+            except DeadlineExceeded:
+                status = "deadline_exceeded"
+                raise
+            except BaseException:
+                status = "error"
+                raise
+            finally:
+                turn = TurnTiming(
+                    kind, name, time.perf_counter() - started, status, collector.total()
+                )
+                set_attributes(
+                    current,
+                    {
+                        "turn.status": status,
+                        "llm.calls": turn.usage.calls,
+                        "llm.prompt_tokens": turn.usage.prompt_tokens,
+                        "llm.completion_tokens": turn.usage.completion_tokens,
+                    },
+                )
+                self._finish(turn, abandoned)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            turns = list(self.turns)
+        usage = sum((turn.usage for turn in turns), TokenUsage())
+        slowest = max(turns, key=lambda turn: turn.duration_seconds, default=None)
+        return {
+            "turns": len(turns),
+            "wall_ms": _ms(time.perf_counter() - self._started),
+            "llm_ms": _ms(sum(t.duration_seconds for t in turns if t.kind != "user")),
+            "user_wait_ms": _ms(sum(t.duration_seconds for t in turns if t.kind == "user")),
+            "llm_calls": usage.calls,
+            "llm_calls_without_usage": usage.calls - usage.reported_calls,
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+            "cost_estimate": self.cost_model.estimate(usage),
+            "slowest_turn": (
+                None
+                if slowest is None
+                else {
+                    "kind": slowest.kind,
+                    "name": slowest.name,
+                    "duration_ms": _ms(slowest.duration_seconds),
+                }
+            ),
+        }
+
+    def abandon(self, abandoned: threading.Event) -> None:
+        # Once this returns, turns still running under the event never touch metrics or the trace.
+        with self._lock:
+            abandoned.set()
+
+    def _finish(self, turn: TurnTiming, abandoned: threading.Event | None = None) -> None:
+        with self._lock:
+            if abandoned is not None and abandoned.is_set():
+                return
+            self.turns.append(turn)
+            self.trace.record_event(
+                "turn_timing",
+                {
+                    "kind": turn.kind,
+                    "name": turn.name,
+                    "status": turn.status,
+                    "duration_ms": _ms(turn.duration_seconds),
+                    "llm_calls": turn.usage.calls,
+                    "prompt_tokens": turn.usage.prompt_tokens,
+                    "completion_tokens": turn.usage.completion_tokens,
+                    "total_tokens": turn.usage.total_tokens,
+                },
+            )
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
@@ -1,16 +1,64 @@
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import inspect
 import logging
+import threading
 import time
-from typing import Callable, List, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generator, List, Sequence, Tuple
 
+from .compaction import HISTORY_SUMMARY_AGENT, HistoryCompactor, history_summary_prompt
+from .metrics import RunMetrics
 from ..agents import Agent
-from ..documents import select_sources
+from ..documents import DocumentIndex, select_sources
+from ..llm import DeadlineExceeded, LLMClient, complete_async, request_deadline
 from ..localization import translate
 from ..observability import TraceRecorder
 from ..schemas import Document, Message, OrchestrationResult, Source
+from ..telemetry import span as telemetry_span
 
 UserResponseProvider = Callable[[str, float], str | None]
+AsyncUserResponseProvider = Callable[[str, float], Awaitable[str | None]]
+MessageChunkHandler = Callable[[Message], None | Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class AgentTurn:
+    agent: Agent
+    conversation: Sequence[Message]
+    documents: Sequence[Document]
+    sources: Sequence[Source]
+    system_prompt: str
+    deadline: float | None = None
+
+
+@dataclass(frozen=True)
+class SummaryTurn:
+    llm: LLMClient
+    agent_name: str
+    system_prompt: str
+    conversation: Sequence[Message]
+    documents: Sequence[Document]
+
+
+@dataclass(frozen=True)
+class UserPrompt:
+    prompt: str
+    timeout_seconds: float
+
+
+@dataclass(frozen=True)
+class ParallelSteps:
+    steps: Tuple[AgentTurn | SummaryTurn, ...]
+    # Checked against the first step's outcome; when true the other steps are cancelled as moot.
+    abandon_rest: Callable[[Any], bool] | None = None
+
+
+OrchestrationStep = AgentTurn | SummaryTurn | UserPrompt | ParallelSteps
+StepGenerator = Generator[OrchestrationStep, Any, OrchestrationResult]
 
 
 class Orchestrator:
@@ -20,11 +68,17 @@ class Orchestrator:
         judge: Agent | None,
         trace: TraceRecorder,
         logger: logging.Logger | None = None,
+        on_message_chunk: MessageChunkHandler | None = None,
+        history_keep_messages: int | None = None,
+        speculative_summary: bool = False,
     ) -> None:
         self.lawyer = lawyer
         self.judge = judge
         self.trace = trace
         self.logger = logger or logging.getLogger(__name__)
+        self.on_message_chunk = on_message_chunk
+        self.history_keep_messages = history_keep_messages
+        self.speculative_summary = speculative_summary
 
     def run(
         self,
@@ -36,7 +90,93 @@ class Orchestrator:
         max_discussion_minutes: float = 15,
         discussion_type: str = "advice",
         user_response_provider: UserResponseProvider | None = None,
+        document_index: DocumentIndex | None = None,
     ) -> OrchestrationResult:
+        steps = self.steps(
+            user_instruction,
+            documents,
+            country,
+            language=language,
+            question_timeout_seconds=question_timeout_seconds,
+            max_discussion_minutes=max_discussion_minutes,
+            discussion_type=discussion_type,
+            document_index=document_index,
+            interactive=user_response_provider is not None,
+        )
+        metrics = RunMetrics(self.trace)
+        reply: Any = None
+        error: DeadlineExceeded | None = None
+        with telemetry_span(
+            "orchestration.run",
+            _run_attributes(country, discussion_type, len(documents)),
+            metric_keys=("discussion.type",),
+        ):
+            while True:
+                try:
+                    step = steps.send(reply) if error is None else steps.throw(error)
+                except StopIteration as stop:
+                    self.trace.record_event("run_summary", metrics.summary())
+                    return stop.value
+                try:
+                    reply, error = self._perform_step(step, user_response_provider, metrics), None
+                except DeadlineExceeded as exc:
+                    reply, error = None, exc
+
+    async def arun(
+        self,
+        user_instruction: str,
+        documents: Sequence[Document],
+        country: str,
+        language: str | None = None,
+        question_timeout_seconds: float = 300,
+        max_discussion_minutes: float = 15,
+        discussion_type: str = "advice",
+        user_response_provider: UserResponseProvider | AsyncUserResponseProvider | None = None,
+        document_index: DocumentIndex | None = None,
+    ) -> OrchestrationResult:
+        steps = self.steps(
+            user_instruction,
+            documents,
+            country,
+            language=language,
+            question_timeout_seconds=question_timeout_seconds,
+            max_discussion_minutes=max_discussion_minutes,
+            discussion_type=discussion_type,
+            document_index=document_index,
+            interactive=user_response_provider is not None,
+        )
+        metrics = RunMetrics(self.trace)
+        reply: Any = None
+        error: DeadlineExceeded | None = None
+        with telemetry_span(
+            "orchestration.run",
+            _run_attributes(country, discussion_type, len(documents)),
+            metric_keys=("discussion.type",),
+        ):
+            while True:
+                try:
+                    step = steps.send(reply) if error is None else steps.throw(error)
+                except StopIteration as stop:
+                    self.trace.record_event("run_summary", metrics.summary())
+                    return stop.value
+                try:
+                    reply = await self._aperform_step(step, user_response_provider, metrics)
+                    error = None
+                except DeadlineExceeded as exc:
+                    reply, error = None, exc
+
+    def steps(
+        self,
+        user_instruction: str,
+        documents: Sequence[Document],
+        country: str,
+        language: str | None = None,
+        question_timeout_seconds: float = 300,
+        max_discussion_minutes: float = 15,
+        discussion_type: str = "advice",
+        document_index: DocumentIndex | None = None,
+        interactive: bool = False,
+    ) -> StepGenerator:
         if not country.strip():
             raise ValueError("country is required.")
         if question_timeout_seconds <= 0:
@@ -72,7 +212,7 @@ class Orchestrator:
         self.trace.record_message(user_message)
         self.logger.info("User instruction: %s", user_instruction)
 
-        citations = select_sources(documents, user_instruction)
+        citations = select_sources(documents, user_instruction, index=document_index)
         lawyer_prompt = _augment_prompt(
             self.lawyer.system_prompt,
             country,
@@ -92,10 +232,16 @@ class Orchestrator:
                 role="judge",
             )
         max_seconds = None if max_discussion_minutes == 0 else max_discussion_minutes * 60
+        compactor = (
+            HistoryCompactor(self.history_keep_messages) if self.history_keep_messages else None
+        )
         start_time = time.monotonic()
+        deadline = None if max_seconds is None else start_time + max_seconds
 
         last_lawyer_message: Message | None = None
         last_judge_message: Message | None = None
+        speculative_summary: str | None = None
+        speculated_at = 0
 
         while True:
             asked_user_question = False
@@ -109,12 +255,23 @@ class Orchestrator:
                 )
                 break
 
-            lawyer_message = self.lawyer.respond(
-                conversation,
-                documents,
-                citations,
-                system_prompt_override=lawyer_prompt,
+            history = yield from self._prompt_history(conversation, compactor)
+            lawyer_message = yield from self._agent_turn(
+                AgentTurn(
+                    self.lawyer,
+                    history,
+                    documents,
+                    citations,
+                    lawyer_prompt,
+                    deadline,
+                )
             )
+            if lawyer_message is None:
+                self.trace.record_event(
+                    "discussion_timeout",
+                    {"max_minutes": max_discussion_minutes},
+                )
+                break
             conversation.append(lawyer_message)
             self.trace.record_message(lawyer_message)
             last_lawyer_message = lawyer_message
@@ -137,10 +294,10 @@ class Orchestrator:
                 )
                 break
 
-            asked, answered, finished = self._maybe_handle_user_question(
+            asked, answered, finished = yield from self._maybe_handle_user_question(
                 lawyer_message,
                 conversation,
-                user_response_provider,
+                interactive,
                 remaining_seconds,
                 question_timeout_seconds,
                 language,
@@ -157,20 +314,31 @@ class Orchestrator:
                 break
             if discussion_type == "advice":
                 if self.judge is not None:
-                    wants_judge = self._prompt_for_judge_review(
+                    wants_judge = yield from self._prompt_for_judge_review(
                         conversation,
-                        user_response_provider,
+                        interactive,
                         remaining_seconds,
                         question_timeout_seconds,
                         language,
                     )
                     if wants_judge:
-                        judge_message = self.judge.respond(
-                            conversation,
-                            [],
-                            citations,
-                            system_prompt_override=judge_prompt,
+                        history = yield from self._prompt_history(conversation, compactor)
+                        judge_message = yield from self._agent_turn(
+                            AgentTurn(
+                                self.judge,
+                                history,
+                                [],
+                                citations,
+                                judge_prompt,
+                                deadline,
+                            )
                         )
+                        if judge_message is None:
+                            self.trace.record_event(
+                                "discussion_timeout",
+                                {"max_minutes": max_discussion_minutes},
+                            )
+                            break
                         conversation.append(judge_message)
                         self.trace.record_message(judge_message)
                         last_judge_message = judge_message
@@ -185,10 +353,10 @@ class Orchestrator:
                             )
                             break
 
-                        asked, answered, finished = self._maybe_handle_user_question(
+                        asked, answered, finished = yield from self._maybe_handle_user_question(
                             judge_message,
                             conversation,
-                            user_response_provider,
+                            interactive,
                             remaining_seconds,
                             question_timeout_seconds,
                             language,
@@ -206,13 +374,31 @@ class Orchestrator:
             else:
                 if self.judge is None or judge_prompt is None:
                     raise ValueError("judge is required for court discussion type")
-                judge_message = self.judge.respond(
-                    conversation,
+                history = yield from self._prompt_history(conversation, compactor)
+                judge_turn = AgentTurn(
+                    self.judge,
+                    history,
                     [],
                     citations,
-                    system_prompt_override=judge_prompt,
+                    judge_prompt,
+                    deadline,
                 )
+                if self.speculative_summary:
+                    judge_message, speculative_summary = yield from self._judge_with_speculation(
+                        judge_turn,
+                        country,
+                        output_language_hint,
+                    )
+                else:
+                    judge_message = yield from self._agent_turn(judge_turn)
+                if judge_message is None:
+                    self.trace.record_event(
+                        "discussion_timeout",
+                        {"max_minutes": max_discussion_minutes},
+                    )
+                    break
                 conversation.append(judge_message)
+                speculated_at = len(conversation)
                 self.trace.record_message(judge_message)
                 last_judge_message = judge_message
                 self.logger.info("Judge response: %s", judge_message.content)
@@ -226,10 +412,10 @@ class Orchestrator:
                     )
                     break
 
-                asked, answered, finished = self._maybe_handle_user_question(
+                asked, answered, finished = yield from self._maybe_handle_user_question(
                     judge_message,
                     conversation,
-                    user_response_provider,
+                    interactive,
                     remaining_seconds,
                     question_timeout_seconds,
                     language,
@@ -249,6 +435,8 @@ class Orchestrator:
                 if decision:
                     self.trace.record_event("judge_decision", {"decision": decision})
                 if decision == "rejected":
+                    self._discard_speculative_summary(speculative_summary)
+                    speculative_summary = None
                     self.logger.info("Judge rejected lawyer response; requesting another solution.")
                     continue
 
@@ -267,9 +455,9 @@ class Orchestrator:
             if asked_user_question and answered_user_question:
                 continue
 
-            should_continue = self._prompt_for_followup(
+            should_continue = yield from self._prompt_for_followup(
                 conversation,
-                user_response_provider,
+                interactive,
                 remaining_seconds,
                 question_timeout_seconds,
                 language,
@@ -296,12 +484,19 @@ class Orchestrator:
                     sources=list(citations),
                 )
 
-        final_text = self._generate_final_summary(
-            conversation,
-            [],
-            country,
-            output_language_hint,
-        )
+        # Only valid if nothing (a question, an answer, a rejection) followed the judge turn.
+        if speculative_summary is not None and len(conversation) == speculated_at:
+            self.trace.record_event("speculative_summary", {"used": True})
+            final_text = speculative_summary
+        else:
+            self._discard_speculative_summary(speculative_summary)
+            history = yield from self._prompt_history(conversation, compactor)
+            final_text = yield from self._generate_final_summary(
+                history,
+                [],
+                country,
+                output_language_hint,
+            )
         final_recommendation, final_rationale = _parse_final_summary(final_text)
         if not final_recommendation:
             final_recommendation = _build_recommendation(
@@ -322,6 +517,7 @@ class Orchestrator:
             messages=conversation,
         )
 
+        self._record_llm_stats()
         self.trace.record_event(
             "result",
             {
@@ -333,26 +529,248 @@ class Orchestrator:
         self.logger.info("Orchestration complete")
         return result
 
+    def _record_llm_stats(self) -> None:
+        clients: List[Any] = [self.lawyer.llm]
+        if self.judge is not None and self.judge.llm is not self.lawyer.llm:
+            clients.append(self.judge.llm)
+        for llm in clients:
+            stats = getattr(llm, "stats", None)
+            if stats is None:
+                continue
+            values = dict(stats())
+            scheduler = values.pop("scheduler", None)
+            self.trace.record_event("llm_stats", {"client": type(llm).__name__, **values})
+            if scheduler is not None:
+                self.trace.record_event(
+                    "llm_scheduler_stats",
+                    {"client": type(llm).__name__, "scope": "process", **scheduler},
+                )
+
+    def _perform_step(
+        self,
+        step: OrchestrationStep,
+        user_response_provider: UserResponseProvider | None,
+        metrics: RunMetrics,
+        abandoned: threading.Event | None = None,
+    ) -> Any:
+        if isinstance(step, AgentTurn):
+            with (
+                metrics.span("agent", step.agent.name, abandoned),
+                request_deadline(step.deadline),
+            ):
+                if self.on_message_chunk is None:
+                    return step.agent.respond(
+                        step.conversation,
+                        step.documents,
+                        step.sources,
+                        system_prompt_override=step.system_prompt,
+                    )
+                deltas: List[str] = []
+                for chunk in step.agent.respond_stream(
+                    step.conversation,
+                    step.documents,
+                    system_prompt_override=step.system_prompt,
+                ):
+                    deltas.append(chunk.content)
+                    self.on_message_chunk(chunk)
+            return _assemble_message(step, deltas)
+        if isinstance(step, SummaryTurn):
+            with metrics.span("summary", step.agent_name, abandoned):
+                return step.llm.complete(
+                    step.agent_name,
+                    step.system_prompt,
+                    step.conversation,
+                    step.documents,
+                )
+        if isinstance(step, ParallelSteps):
+            pool = ThreadPoolExecutor(max_workers=len(step.steps))
+            abandoned = threading.Event()
+            try:
+                futures = [
+                    pool.submit(
+                        contextvars.copy_context().run,
+                        self._perform_step,
+                        parallel_step,
+                        user_response_provider,
+                        metrics,
+                        abandoned,
+                    )
+                    for parallel_step in step.steps
+                ]
+                first = _future_outcome(futures[0])
+                if step.abandon_rest is not None and step.abandon_rest(first):
+                    # A call already in flight can't be stopped; it just must not record anything.
+                    metrics.abandon(abandoned)
+                    return (first,) + (None,) * (len(futures) - 1)
+                return tuple(_future_outcome(future) for future in futures)
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+        if user_response_provider is None:
+            return None
+        with metrics.span("user", "User", abandoned):
+            return user_response_provider(step.prompt, step.timeout_seconds)
+
+    async def _aperform_step(
+        self,
+        step: OrchestrationStep,
+        user_response_provider: UserResponseProvider | AsyncUserResponseProvider | None,
+        metrics: RunMetrics,
+    ) -> Any:
+        if isinstance(step, AgentTurn):
+            with metrics.span("agent", step.agent.name), request_deadline(step.deadline):
+                if self.on_message_chunk is None:
+                    return await step.agent.arespond(
+                        step.conversation,
+                        step.documents,
+                        step.sources,
+                        system_prompt_override=step.system_prompt,
+                    )
+                deltas: List[str] = []
+                async for chunk in step.agent.arespond_stream(
+                    step.conversation,
+                    step.documents,
+                    system_prompt_override=step.system_prompt,
+                ):
+                    deltas.append(chunk.content)
+                    handled = self.on_message_chunk(chunk)
+                    if inspect.isawaitable(handled):
+                        await handled
+            return _assemble_message(step, deltas)
+        if isinstance(step, SummaryTurn):
+            with metrics.span("summary", step.agent_name):
+                return await complete_async(
+                    step.llm,
+                    step.agent_name,
+                    step.system_prompt,
+                    step.conversation,
+                    step.documents,
+                )
+        if isinstance(step, ParallelSteps):
+            tasks = [
+                asyncio.ensure_future(
+                    self._aperform_step(parallel_step, user_response_provider, metrics)
+                )
+                for parallel_step in step.steps
+            ]
+            first = (await asyncio.gather(tasks[0], return_exceptions=True))[0]
+            if step.abandon_rest is not None and step.abandon_rest(first):
+                for task in tasks[1:]:
+                    task.cancel()
+                await asyncio.gather(*tasks[1:], return_exceptions=True)
+                return (first,) + (None,) * (len(tasks) - 1)
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            return tuple(results)
+        if user_response_provider is None:
+            return None
+        with metrics.span("user", "User"):
+            response = user_response_provider(step.prompt, step.timeout_seconds)
+            if inspect.isawaitable(response):
+                response = await response
+        return response
+
+    def _agent_turn(self, turn: AgentTurn) -> Generator[OrchestrationStep, Any, Message | None]:
+        try:
+            return (yield turn)
+        except DeadlineExceeded:
+            self.logger.info("%s turn stopped at the discussion time limit.", turn.agent.name)
+            return None
+
+    def _judge_with_speculation(
+        self,
+        judge_turn: AgentTurn,
+        country: str,
+        output_language_hint: str,
+    ) -> Generator[OrchestrationStep, Any, tuple[Message | None, str | None]]:
+        summary_turn = self._final_summary_turn(
+            judge_turn.conversation,
+            [],
+            country,
+            output_language_hint,
+        )
+        judge_result, summary_result = yield ParallelSteps(
+            (judge_turn, summary_turn),
+            abandon_rest=_judge_rejected,
+        )
+        if _judge_rejected(judge_result):
+            self.trace.record_event("speculative_summary", {"used": False, "cancelled": True})
+        if isinstance(summary_result, BaseException):
+            self.logger.info("Speculative final summary failed: %s", summary_result)
+            summary_result = None
+        if isinstance(judge_result, DeadlineExceeded):
+            self.logger.info("%s turn stopped at the discussion time limit.", judge_turn.agent.name)
+            return None, None
+        if isinstance(judge_result, BaseException):
+            raise judge_result
+        return judge_result, summary_result
+
+    def _discard_speculative_summary(self, speculative_summary: str | None) -> None:
+        if speculative_summary is not None:
+            self.trace.record_event("speculative_summary", {"used": False})
+
     def _generate_final_summary(
         self,
         conversation: Sequence[Message],
         documents: Sequence[Document],
         country: str,
         output_language_hint: str,
-    ) -> str:
-        system_prompt = _final_summary_prompt(country, output_language_hint)
-        llm = self.judge.llm if self.judge is not None else self.lawyer.llm
-        return llm.complete("FinalSummary", system_prompt, conversation, documents)
+    ) -> Generator[OrchestrationStep, Any, str]:
+        return (
+            yield self._final_summary_turn(conversation, documents, country, output_language_hint)
+        )
+
+    def _final_summary_turn(
+        self,
+        conversation: Sequence[Message],
+        documents: Sequence[Document],
+        country: str,
+        output_language_hint: str,
+    ) -> SummaryTurn:
+        return SummaryTurn(
+            self._summary_llm(),
+            "FinalSummary",
+            _final_summary_prompt(country, output_language_hint),
+            list(conversation),
+            documents,
+        )
+
+    def _prompt_history(
+        self,
+        conversation: Sequence[Message],
+        compactor: HistoryCompactor | None,
+    ) -> Generator[OrchestrationStep, Any, List[Message]]:
+        if compactor is None:
+            return list(conversation)
+        if compactor.needs_extension(conversation):
+            summary = yield SummaryTurn(
+                self._summary_llm(),
+                HISTORY_SUMMARY_AGENT,
+                history_summary_prompt(),
+                compactor.extension_input(conversation),
+                [],
+            )
+            folded = compactor.extend(conversation, summary)
+            self.trace.record_event(
+                "history_compacted",
+                {
+                    "folded_messages": folded,
+                    "summarized_until": compactor.summarized_until,
+                    "summary_chars": len(compactor.summary),
+                },
+            )
+        return compactor.compact(conversation)
+
+    def _summary_llm(self) -> LLMClient:
+        return self.judge.llm if self.judge is not None else self.lawyer.llm
 
     def _maybe_handle_user_question(
         self,
         message: Message,
         conversation: List[Message],
-        user_response_provider: UserResponseProvider | None,
+        interactive: bool,
         remaining_seconds: float | None,
         question_timeout_seconds: float,
         language: str | None,
-    ) -> tuple[bool, bool, bool]:
+    ) -> Generator[OrchestrationStep, Any, tuple[bool, bool, bool]]:
         question = _extract_question(message.content)
         if not question:
             return False, False, False
@@ -363,8 +781,8 @@ class Orchestrator:
             prompt_timeout = min(prompt_timeout, max(0.0, remaining_seconds))
         if prompt_timeout <= 0:
             response = None
-        elif user_response_provider is not None:
-            response = user_response_provider(question, prompt_timeout)
+        elif interactive:
+            response = yield UserPrompt(question, prompt_timeout)
         else:
             response = None
 
@@ -395,12 +813,12 @@ class Orchestrator:
     def _prompt_for_followup(
         self,
         conversation: List[Message],
-        user_response_provider: UserResponseProvider | None,
+        interactive: bool,
         remaining_seconds: float | None,
         question_timeout_seconds: float,
         language: str | None,
-    ) -> bool:
-        if user_response_provider is None:
+    ) -> Generator[OrchestrationStep, Any, bool]:
+        if not interactive:
             return False
 
         prompt_timeout = question_timeout_seconds
@@ -410,7 +828,7 @@ class Orchestrator:
             return False
 
         prompt = _followup_prompt(language)
-        response = user_response_provider(prompt, prompt_timeout)
+        response = yield UserPrompt(prompt, prompt_timeout)
         if not response:
             self.trace.record_event(
                 "user_followup_timeout",
@@ -435,12 +853,12 @@ class Orchestrator:
     def _prompt_for_judge_review(
         self,
         conversation: List[Message],
-        user_response_provider: UserResponseProvider | None,
+        interactive: bool,
         remaining_seconds: float | None,
         question_timeout_seconds: float,
         language: str | None,
-    ) -> bool:
-        if user_response_provider is None:
+    ) -> Generator[OrchestrationStep, Any, bool]:
+        if not interactive:
             return False
 
         prompt_timeout = question_timeout_seconds
@@ -450,7 +868,7 @@ class Orchestrator:
             return False
 
         prompt = _judge_review_prompt(language)
-        response = user_response_provider(prompt, prompt_timeout)
+        response = yield UserPrompt(prompt, prompt_timeout)
         if not response:
             self.trace.record_event(
                 "user_judge_review_timeout",
@@ -470,6 +888,23 @@ class Orchestrator:
         return _wants_judge_review(content)
 
 
+def _run_attributes(country: str, discussion_type: str, document_count: int) -> dict:
+    return {
+        "jurisdiction.country": country,
+        "discussion.type": discussion_type,
+        "documents.count": document_count,
+    }
+
+
+def _assemble_message(step: AgentTurn, deltas: Sequence[str]) -> Message:
+    return Message(
+        role="assistant",
+        agent_name=step.agent.name,
+        content="".join(deltas).strip(),
+        sources=list(step.sources),
+    )
+
+
 def _build_recommendation(
     lawyer_message: Message,
     judge_message: Message,
@@ -496,6 +931,17 @@ def _extract_question(content: str) -> str | None:
     return None
 
 
+def _judge_rejected(outcome: Any) -> bool:
+    return (
+        isinstance(outcome, Message) and _parse_judge_decision(outcome.content) == "rejected"
+    )
+
+
+def _future_outcome(future: Future[Any]) -> Any:
+    error = future.exception()
+    return error if error is not None else future.result()
+
+
 def _time_exceeded(start_time: float, max_seconds: float | None) -> bool:
     if max_seconds is None:
         return False
@@ -546,25 +992,26 @@ def _augment_prompt(
             "'Decision: APPROVED' or 'Decision: REJECTED'."
         )
 
+    # Case-independent instructions first so providers can reuse the cached prompt prefix.
     return (
-        f"{base_prompt}\n\n"
+        f"{base_prompt}"
+        f"{court_guidance}"
+        f"{decision_line}\n\n"
         f"Jurisdiction focus: Only use laws/regulations applicable to {country} "
         "or supranational rules accepted in that jurisdiction.\n"
         f"{language_line}"
-        f"{court_guidance}"
-        f"{decision_line}"
     )
 
 
 def _final_summary_prompt(country: str, output_language_hint: str) -> str:
     return (
         "You are preparing the final outcome of the discussion.\n"
-        f"Jurisdiction focus: Only use laws/regulations applicable to {country} "
-        "or supranational rules accepted in that jurisdiction.\n"
-        f"Write the final recommendation and rationale in {output_language_hint}.\n"
         "Return exactly two labeled lines:\n"
         "Recommendation: <text>\n"
-        "Rationale: <text>"
+        "Rationale: <text>\n"
+        f"Jurisdiction focus: Only use laws/regulations applicable to {country} "
+        "or supranational rules accepted in that jurisdiction.\n"
+        f"Write the final recommendation and rationale in {output_language_hint}."
     )
 
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Tuple
 
 
 @dataclass(frozen=True)
@@ -18,11 +18,32 @@ class Message:
     sources: List[Source] = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class DocumentChunk:
+    doc_id: str
+    path: str
+    index: int
+    start: int
+    end: int
+    source_path: str = ""
+    content: str | None = None
+
+    @property
+    def text(self) -> str:
+        if self.content is not None:
+            return self.content
+        with open(self.source_path, "rb") as handle:
+            handle.seek(self.start)
+            data = handle.read(self.end - self.start)
+        return data.decode("utf-8", errors="ignore")
+
+
 @dataclass(frozen=True)
 class Document:
     doc_id: str
     path: str
-    content: str
+    content: str = ""
+    chunks: Tuple[DocumentChunk, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Mapping, Sequence
+
+try:
+    from opentelemetry import metrics as otel_metrics
+    from opentelemetry import propagate
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - opentelemetry is an optional extra.
+    otel_metrics = None
+    otel_trace = None
+    propagate = None
+
+INSTRUMENTATION_NAME = "aijurisdictionagents"
+OPERATION_DURATION = "aijurisdictionagents.operation.duration"
+LLM_TOKENS = "aijurisdictionagents.llm.tokens"
+
+logger = logging.getLogger(__name__)
+
+_request_id: ContextVar[str | None] = ContextVar("telemetry_request_id", default=None)
+_lock = threading.Lock()
+_tracer_provider: Any = None
+_meter_provider: Any = None
+_tracer: Any = None
+_instruments: Dict[str, Any] = {}
+_configured_from_env = False
+
+
+def telemetry_available() -> bool:
+    return otel_trace is not None
+
+
+def configure_telemetry(tracer_provider: Any = None, meter_provider: Any = None) -> None:
+    global _tracer_provider, _meter_provider, _tracer
+    with _lock:
+        _tracer_provider = tracer_provider
+        _meter_provider = meter_provider
+        _tracer = None
+        _instruments.clear()
+
+
+def configure_telemetry_from_env() -> bool:
+    global _configured_from_env
+    if otel_trace is None or otel_metrics is None:
+        return False
+    if not os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        return False
+    if os.getenv("OTEL_SDK_DISABLED", "").lower() == "true":
+        return False
+    with _lock:
+        if _configured_from_env:
+            return True
+        try:
+            from opentelemetry.exporter.otlp.proto.http.metric_exporter import (
+                OTLPMetricExporter,
+            )
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.metrics import MeterProvider
+            from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError:
+            logger.warning(
+                "OTEL_EXPORTER_OTLP_ENDPOINT is set but the OTLP exporter is not installed; "
+                "install the 'otel' extra to export telemetry."
+            )
+            return False
+        resource = Resource.create(
+            {"service.name": os.getenv("OTEL_SERVICE_NAME", INSTRUMENTATION_NAME)}
+        )
+        tracer_provider = TracerProvider(resource=resource)
+        tracer_provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        meter_provider = MeterProvider(
+            resource=resource,
+            metric_readers=[PeriodicExportingMetricReader(OTLPMetricExporter())],
+        )
+        otel_trace.set_tracer_provider(tracer_provider)
+        otel_metrics.set_meter_provider(meter_provider)
+        _configured_from_env = True
+    return True
+
+
+def current_request_id() -> str | None:
+    return _request_id.get()
+
+
+@contextmanager
+def span(
+    name: str,
+    attributes: Mapping[str, Any] | None = None,
+    metric_keys: Sequence[str] = (),
+) -> Iterator[Any]:
+    if otel_trace is None:
+        yield None
+        return
+    span_attributes = _clean(attributes)
+    request_id = _request_id.get()
+    if request_id is not None:
+        span_attributes["request.id"] = request_id
+    metric_attributes = {key: span_attributes[key] for key in metric_keys if key in span_attributes}
+    metric_attributes["operation"] = name
+    status = "ok"
+    started = time.perf_counter()
+    try:
+        with _get_tracer().start_as_current_span(name, attributes=span_attributes) as current:
+            yield current
+    except BaseException as exc:
+        status = "error"
+        metric_attributes["error.type"] = type(exc).__name__
+        raise
+    finally:
+        metric_attributes["status"] = status
+        _instrument(OPERATION_DURATION).record(
+            (time.perf_counter() - started) * 1000, metric_attributes
+        )
+
+
+@contextmanager
+def request_span(
+    name: str,
+    request_id: str,
+    headers: Mapping[str, str] | None = None,
+    attributes: Mapping[str, Any] | None = None,
+) -> Iterator[Any]:
+    token = _request_id.set(request_id)
+    try:
+        if otel_trace is None or propagate is None:
+            yield None
+            return
+        span_attributes = _clean(attributes)
+        span_attributes["request.id"] = request_id
+        with _get_tracer().start_as_current_span(
+            name,
+            context=propagate.extract(dict(headers or {})),
+            kind=otel_trace.SpanKind.SERVER,
+            attributes=span_attributes,
+        ) as current:
+            yield current
+    finally:
+        _request_id.reset(token)
+
+
+def set_attributes(current: Any, attributes: Mapping[str, Any]) -> None:
+    if current is None:
+        return
+    for key, value in _clean(attributes).items():
+        current.set_attribute(key, value)
+
+
+def record_tokens(prompt_tokens: int, completion_tokens: int) -> None:
+    if otel_metrics is None:
+        return
+    histogram = _instrument(LLM_TOKENS)
+    if prompt_tokens:
+        histogram.record(prompt_tokens, {"token.type": "prompt"})
+    if completion_tokens:
+        histogram.record(completion_tokens, {"token.type": "completion"})
+
+
+def _get_tracer() -> Any:
+    global _tracer
+    tracer = _tracer
+    if tracer is None:
+        with _lock:
+            if _tracer is None:
+                provider = _tracer_provider or otel_trace.get_tracer_provider()
+                _tracer = provider.get_tracer(INSTRUMENTATION_NAME)
+            tracer = _tracer
+    return tracer
+
+
+def _instrument(name: str) -> Any:
+    instrument = _instruments.get(name)
+    if instrument is None:
+        with _lock:
+            instrument = _instruments.get(name)
+            if instrument is None:
+                provider = _meter_provider or otel_metrics.get_meter_provider()
+                meter = provider.get_meter(INSTRUMENTATION_NAME)
+                if name == LLM_TOKENS:
+                    instrument = meter.create_histogram(
+                        name, unit="{token}", description="Tokens per LLM response."
+                    )
+                else:
+                    instrument = meter.create_histogram(
+                        name, unit="ms", description="Duration of instrumented operations."
+                    )
+                _instruments[name] = instrument
+    return instrument
+
+
+def _clean(attributes: Mapping[str, Any] | None) -> Dict[str, Any]:
+    cleaned: Dict[str, Any] = {}
+    for key, value in (attributes or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, (str, bool, int, float)):
+            cleaned[key] = value
+        else:
+            cleaned[key] = str(value)
+    return cleaned
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+
+import pytest
+
+FakeResponse = Tuple[int, Dict[str, str], Dict[str, Any]]
+
+
+class FakeChatServer:
+    def __init__(self) -> None:
+        self.responses: Deque[FakeResponse] = deque()
+        self.requests: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def enqueue(
+        self,
+        status: int = 200,
+        content: str = "fake response",
+        headers: Dict[str, str] | None = None,
+    ) -> None:
+        if status == 200:
+            body: Dict[str, Any] = _completion(content)
+        else:
+            body = {"error": {"message": content, "type": "fake_error", "code": str(status)}}
+        self.responses.append((status, headers or {}, body))
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802 - http.server naming.
+                length = int(self.headers.get("Content-Length", "0"))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    server.requests.append(payload)
+                    if server.responses:
+                        status, headers, body = server.responses.popleft()
+                    else:
+                        status, headers, body = 200, {}, _completion("fake response")
+                encoded = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return
+
+        return Handler
+
+
+def _completion(content: str) -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "fake-model",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+
+
+@pytest.fixture
+def fake_chat_server() -> Iterator[FakeChatServer]:
+    server = FakeChatServer()
+    server.start()
+    try:
+        yield server
+    finally:
+        server.stop()
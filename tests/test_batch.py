@@ -0,0 +1,182 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from aijurisdictionagents.batch import (
+    BatchCase,
+    BatchOptions,
+    DocumentCache,
+    read_cases,
+    run_batch,
+)
+from aijurisdictionagents.llm import MockLLMClient
+
+
+def _write_cases(path: Path, cases: list[dict]) -> Path:
+    path.write_text("\n".join(json.dumps(case) for case in cases) + "\n", encoding="utf-8")
+    return path
+
+
+def _read_output(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_read_cases_validates_records(tmp_path: Path) -> None:
+    cases = read_cases(
+        _write_cases(
+            tmp_path / "cases.jsonl",
+            [
+                {"case_id": "a", "instruction": "Late delivery", "country": "SK"},
+                {"instruction": "Unpaid invoice", "country": "CZ", "discussion_type": "court"},
+            ],
+        )
+    )
+
+    assert cases[0] == BatchCase(case_id="a", instruction="Late delivery", country="SK")
+    assert cases[1].case_id == "line-2"
+    assert cases[1].discussion_type == "court"
+
+    with pytest.raises(ValueError, match="duplicate"):
+        read_cases(
+            _write_cases(
+                tmp_path / "dup.jsonl",
+                [
+                    {"case_id": "a", "instruction": "x", "country": "SK"},
+                    {"case_id": "a", "instruction": "y", "country": "SK"},
+                ],
+            )
+        )
+    with pytest.raises(ValueError, match="required"):
+        read_cases(_write_cases(tmp_path / "bad.jsonl", [{"case_id": "a", "country": "SK"}]))
+
+
+def test_run_batch_streams_results_and_resumes(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "contract.txt").write_text("Delivery was late by two weeks.", encoding="utf-8")
+    cases = [
+        BatchCase(case_id="a", instruction="Late delivery", country="SK", data_dir=str(data_dir)),
+        BatchCase(case_id="b", instruction="Unpaid invoice", country="CZ"),
+        BatchCase(
+            case_id="c",
+            instruction="Contract breach",
+            country="SK",
+            data_dir=str(data_dir),
+            discussion_type="court",
+        ),
+    ]
+    output = tmp_path / "out" / "results.jsonl"
+    options = BatchOptions(run_dir=tmp_path / "run", concurrency=2)
+
+    counts = asyncio.run(run_batch(cases, output, MockLLMClient(), options))
+
+    assert counts == {"completed": 3, "failed": 0, "skipped": 0}
+    records = _read_output(output)
+    assert sorted(record["case_id"] for record in records) == ["a", "b", "c"]
+    assert all(record["status"] == "completed" for record in records)
+    assert all(record["final_recommendation"] for record in records)
+    assert (tmp_path / "run" / "cases" / "a" / "trace.jsonl").exists()
+
+    rerun = asyncio.run(run_batch(cases, output, MockLLMClient(), options))
+
+    assert rerun == {"completed": 0, "failed": 0, "skipped": 3}
+    assert len(_read_output(output)) == 3
+
+
+def test_run_batch_retries_failed_and_torn_records(tmp_path: Path) -> None:
+    class FlakyLLM(MockLLMClient):
+        def __init__(self, failing: set[str]) -> None:
+            self.failing = failing
+
+        def complete(self, agent_name, system_prompt, conversation, documents) -> str:
+            if conversation and conversation[0].content in self.failing:
+                raise RuntimeError("provider unavailable")
+            return super().complete(agent_name, system_prompt, conversation, documents)
+
+    cases = [
+        BatchCase(case_id="a", instruction="first", country="SK"),
+        BatchCase(case_id="b", instruction="second", country="SK"),
+        BatchCase(case_id="c", instruction="third", country="SK"),
+    ]
+    output = tmp_path / "results.jsonl"
+    output.write_text(
+        json.dumps({"case_id": "a", "status": "completed"}) + "\n" + '{"case_id": "c", "sta',
+        encoding="utf-8",
+    )
+    options = BatchOptions(run_dir=tmp_path / "run")
+
+    counts = asyncio.run(run_batch(cases, output, FlakyLLM({"second"}), options))
+
+    assert counts == {"completed": 1, "failed": 1, "skipped": 1}
+    failed = [record for record in _read_output_lenient(output) if record["status"] == "failed"]
+    assert failed[0]["case_id"] == "b"
+    assert "provider unavailable" in failed[0]["error"]
+
+    counts = asyncio.run(run_batch(cases, output, FlakyLLM(set()), options))
+
+    assert counts == {"completed": 1, "failed": 0, "skipped": 2}
+
+
+def test_run_batch_bounds_concurrency(tmp_path: Path) -> None:
+    state = {"in_flight": 0, "peak": 0}
+
+    class SlowAsyncLLM(MockLLMClient):
+        async def acomplete(self, agent_name, system_prompt, conversation, documents) -> str:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+            return self.complete(agent_name, system_prompt, conversation, documents)
+
+    cases = [BatchCase(case_id=str(i), instruction=f"case {i}", country="SK") for i in range(6)]
+    options = BatchOptions(run_dir=tmp_path / "run", concurrency=2)
+
+    asyncio.run(run_batch(cases, tmp_path / "results.jsonl", SlowAsyncLLM(), options))
+
+    assert state["peak"] == 2
+
+
+def _read_output_lenient(path: Path) -> list[dict]:
+    records = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records
+
+
+def test_document_cache_releases_a_folder_after_its_last_case(tmp_path: Path) -> None:
+    first, second = tmp_path / "first", tmp_path / "second"
+    for data_dir in (first, second):
+        data_dir.mkdir()
+        (data_dir / "contract.txt").write_text("Delivery was late.", encoding="utf-8")
+    cases = [
+        BatchCase(case_id="a", instruction="Late", country="SK", data_dir=str(first)),
+        BatchCase(case_id="b", instruction="Late", country="SK", data_dir=str(first)),
+        BatchCase(case_id="c", instruction="Late", country="SK", data_dir=str(second)),
+    ]
+    cache = DocumentCache(BatchOptions(run_dir=tmp_path / "run"), cases)
+
+    loaded = cache.load(str(first))
+    cache.load(str(second))
+    cache.release(str(first))
+    assert cache.load(str(first)) is loaded
+
+    cache.release(str(first))
+    cache.release(str(second))
+    assert cache._loaded == {}
+
+
+def test_document_cache_loads_chunks_by_default(tmp_path: Path) -> None:
+    data_dir = tmp_path / "docs"
+    data_dir.mkdir()
+    (data_dir / "contract.txt").write_text("Delivery was late.", encoding="utf-8")
+    case = BatchCase(case_id="a", instruction="Late", country="SK", data_dir=str(data_dir))
+    cache = DocumentCache(BatchOptions(run_dir=tmp_path / "run"), [case])
+
+    documents, _ = cache.load(str(data_dir))
+
+    assert [chunk.text for chunk in documents[0].chunks] == ["Delivery was late."]
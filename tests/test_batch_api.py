@@ -0,0 +1,233 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from aijurisdictionagents.batch import BatchCase, BatchOptions, run_batch_api
+from aijurisdictionagents.llm import LocalBatchEndpoint, MockLLMClient, get_batch_llm_client
+from aijurisdictionagents.llm.batch_api import parse_batch_output
+
+
+def _read_jsonl(path: Path) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def _system_prompt(body: Dict[str, Any]) -> str:
+    return body["messages"][0]["content"]
+
+
+def test_batch_api_drives_discussions_round_by_round(tmp_path: Path) -> None:
+    cases = [
+        BatchCase(case_id="advice", instruction="Late delivery", country="SK"),
+        BatchCase(
+            case_id="court",
+            instruction="Unpaid invoice",
+            country="CZ",
+            discussion_type="court",
+        ),
+    ]
+    endpoint = LocalBatchEndpoint(tmp_path / "endpoint", polls_until_complete=1)
+    options = BatchOptions(run_dir=tmp_path / "run", max_discussion_minutes=0)
+    output = tmp_path / "results.jsonl"
+
+    counts = run_batch_api(cases, output, MockLLMClient(), endpoint, options, poll_seconds=0)
+
+    assert counts == {"completed": 2, "failed": 0, "skipped": 0}
+    records = {record["case_id"]: record for record in _read_jsonl(output)}
+    assert records["court"]["final_recommendation"]
+    rounds = sorted((tmp_path / "run" / "batches").glob("round-*.jsonl"))
+    assert len(rounds) >= 2
+    first_round = _read_jsonl(rounds[0])
+    assert {line["custom_id"] for line in first_round} == {"advice/1/0", "court/1/0"}
+    assert all(line["url"] == "/v1/chat/completions" for line in first_round)
+    assert all(line["body"]["messages"][0]["role"] == "system" for line in first_round)
+
+    rerun = run_batch_api(cases, output, MockLLMClient(), endpoint, options, poll_seconds=0)
+
+    assert rerun == {"completed": 0, "failed": 0, "skipped": 2}
+
+
+def test_batch_api_submits_parallel_steps_in_one_round(tmp_path: Path) -> None:
+    cases = [
+        BatchCase(
+            case_id="court",
+            instruction="Unpaid invoice",
+            country="CZ",
+            discussion_type="court",
+        )
+    ]
+    endpoint = LocalBatchEndpoint(
+        tmp_path / "endpoint",
+        responder=lambda body: "Decision: APPROVED. The claim is well founded.",
+    )
+    options = BatchOptions(
+        run_dir=tmp_path / "run",
+        max_discussion_minutes=0,
+        speculative_summary=True,
+    )
+
+    counts = run_batch_api(
+        cases, tmp_path / "results.jsonl", MockLLMClient(), endpoint, options, poll_seconds=0
+    )
+
+    assert counts["completed"] == 1
+    rounds = [_read_jsonl(path) for path in sorted((tmp_path / "run" / "batches").glob("*.jsonl"))]
+    assert [line["custom_id"] for line in rounds[1]] == ["court/2/0", "court/2/1"]
+
+
+def test_batch_api_records_failed_requests(tmp_path: Path) -> None:
+    def responder(body: Dict[str, Any]) -> str:
+        if "second" in json.dumps(body["messages"]):
+            raise RuntimeError("content filtered")
+        return "Legal position: proceed."
+
+    cases = [
+        BatchCase(case_id="a", instruction="first", country="SK"),
+        BatchCase(case_id="b", instruction="second", country="SK"),
+    ]
+    endpoint = LocalBatchEndpoint(tmp_path / "endpoint", responder=responder)
+    output = tmp_path / "results.jsonl"
+
+    counts = run_batch_api(
+        cases,
+        output,
+        MockLLMClient(),
+        endpoint,
+        BatchOptions(run_dir=tmp_path / "run", max_discussion_minutes=0),
+        poll_seconds=0,
+    )
+
+    assert counts == {"completed": 1, "failed": 1, "skipped": 0}
+    failed = [record for record in _read_jsonl(output) if record["status"] == "failed"]
+    assert failed[0]["case_id"] == "b"
+    assert "content filtered" in failed[0]["error"]
+
+
+def test_batch_api_rejects_clients_without_batch_support(tmp_path: Path) -> None:
+    class LiveOnlyLLM:
+        def complete(self, agent_name, system_prompt, conversation, documents) -> str:
+            return "unused"
+
+    output = tmp_path / "results.jsonl"
+    counts = run_batch_api(
+        [BatchCase(case_id="a", instruction="first", country="SK")],
+        output,
+        LiveOnlyLLM(),
+        LocalBatchEndpoint(tmp_path / "endpoint"),
+        BatchOptions(run_dir=tmp_path / "run"),
+        poll_seconds=0,
+    )
+
+    assert counts["failed"] == 1
+    assert "does not support the Batch API" in _read_jsonl(output)[0]["error"]
+
+
+def test_batch_client_for_router_is_its_primary_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LLM_PROVIDER", "router")
+    monkeypatch.setenv("LLM_ROUTER_BACKENDS", "mock:primary,openai:gpt-4o-mini")
+
+    assert isinstance(get_batch_llm_client(), MockLLMClient)
+
+    monkeypatch.setenv("LLM_ROUTER_BACKENDS", "")
+    with pytest.raises(ValueError, match="LLM_ROUTER_BACKENDS"):
+        get_batch_llm_client()
+
+
+def test_parse_batch_output_reads_responses_and_errors() -> None:
+    lines = [
+        json.dumps(
+            {
+                "custom_id": "a/1/0",
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"message": {"content": " Answer \n"}}]},
+                },
+                "error": None,
+            }
+        ),
+        json.dumps(
+            {
+                "custom_id": "b/1/0",
+                "response": {
+                    "status_code": 429,
+                    "body": {"error": {"message": "Token limit exceeded"}},
+                },
+                "error": None,
+            }
+        ),
+        json.dumps({"custom_id": "c/1/0", "response": None, "error": {"message": "expired"}}),
+    ]
+
+    results = parse_batch_output(lines)
+
+    assert results["a/1/0"].content == "Answer"
+    assert results["b/1/0"].error == "Token limit exceeded"
+    assert results["c/1/0"].error == "expired"
+
+
+def test_openai_client_builds_batch_request_body() -> None:
+    pytest.importorskip("openai")
+    from aijurisdictionagents.llm.openai_client import OpenAIClient, OpenAIConfig
+
+    client = OpenAIClient(OpenAIConfig(api_key="test-key", model="gpt-test", temperature=0.1))
+
+    body = client.batch_request_body("Lawyer", "SYSTEM", [], [])
+
+    assert body["model"] == "gpt-test"
+    assert body["temperature"] == 0.1
+    assert _system_prompt(body) == "SYSTEM"
+
+
+def test_batch_api_reattaches_to_batches_submitted_before_a_crash(tmp_path: Path) -> None:
+    class Crash(Exception):
+        pass
+
+    class CrashingEndpoint(LocalBatchEndpoint):
+        submitted = 0
+
+        def submit(self, input_path: Path) -> str:
+            self.submitted += 1
+            return super().submit(input_path)
+
+        def status(self, batch_id: str) -> str:
+            if self.submitted == 2:
+                raise Crash()
+            return super().status(batch_id)
+
+    cases = [
+        BatchCase(
+            case_id="court",
+            instruction="Unpaid invoice",
+            country="CZ",
+            discussion_type="court",
+        )
+    ]
+    options = BatchOptions(run_dir=tmp_path / "run", max_discussion_minutes=0)
+    output = tmp_path / "results.jsonl"
+    crashing = CrashingEndpoint(tmp_path / "endpoint")
+    with pytest.raises(Crash):
+        run_batch_api(cases, output, MockLLMClient(), crashing, options, poll_seconds=0)
+
+    submissions = _read_jsonl(tmp_path / "results.batches.jsonl")
+    assert [entry["case_ids"] for entry in submissions] == [["court"], ["court"]]
+
+    endpoint = LocalBatchEndpoint(tmp_path / "endpoint")
+    counts = run_batch_api(cases, output, MockLLMClient(), endpoint, options, poll_seconds=0)
+
+    fresh = LocalBatchEndpoint(tmp_path / "fresh")
+    run_batch_api(
+        cases,
+        tmp_path / "fresh.jsonl",
+        MockLLMClient(),
+        fresh,
+        BatchOptions(run_dir=tmp_path / "fresh-run", max_discussion_minutes=0),
+        poll_seconds=0,
+    )
+    batches = [path for path in (tmp_path / "endpoint").iterdir() if path.is_dir()]
+    assert counts["completed"] == 1
+    # The two rounds submitted before the crash are reused, so nothing is billed twice.
+    assert len(batches) == len([path for path in fresh.directory.iterdir() if path.is_dir()])
+    assert _read_jsonl(output)[0]["final_recommendation"] == (
+        _read_jsonl(tmp_path / "fresh.jsonl")[0]["final_recommendation"]
+    )
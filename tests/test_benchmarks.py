@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = Path("benchmarks") / "run_benchmarks.py"
+
+
+def _run(*args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), *args],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_benchmark_runner_writes_json_results(tmp_path: Path) -> None:
+    output = tmp_path / "current.json"
+
+    result = _run(
+        "--quick",
+        "--rounds",
+        "1",
+        "--only",
+        "orchestrator.run",
+        "--only",
+        "select_sources[10]",
+        "--output",
+        str(output),
+    )
+
+    assert result.returncode == 0, result.stderr
+    payload = json.loads(output.read_text(encoding="utf-8"))
+    assert set(payload["benchmarks"]) == {
+        "orchestrator.run[advice]",
+        "orchestrator.run[court]",
+        "select_sources[10]",
+    }
+    assert payload["meta"]["llm"] == "mock"
+    court = payload["benchmarks"]["orchestrator.run[court]"]
+    assert court["rounds"] == 1
+    assert court["median_seconds"] > 0
+    assert payload["benchmarks"]["select_sources[10]"]["ops_per_second"] > 0
+
+
+def test_benchmark_comparison_flags_regressions(tmp_path: Path) -> None:
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    baseline.write_text(
+        json.dumps(
+            {
+                "benchmarks": {
+                    "select_sources[1000]": {"median_seconds": 0.010},
+                    "trace_recorder.record_event": {"median_seconds": 0.100},
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    current.write_text(
+        json.dumps(
+            {
+                "benchmarks": {
+                    "select_sources[1000]": {"median_seconds": 0.011},
+                    "trace_recorder.record_event": {"median_seconds": 0.150},
+                    "case_store.create_case": {"median_seconds": 0.001},
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    result = _run("--compare", str(baseline), "--current", str(current), "--threshold", "0.2")
+
+    assert result.returncode == 1
+    assert "trace_recorder.record_event" in result.stdout
+    assert "1 regression(s) above 20% of 2 compared" in result.stdout
+
+    relaxed = _run("--compare", str(baseline), "--current", str(current), "--threshold", "0.6")
+
+    assert relaxed.returncode == 0, relaxed.stdout
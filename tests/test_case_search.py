@@ -0,0 +1,174 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from aijurisdictionagents.cases import (
+    CaseSearchIndex,
+    CaseStore,
+    SQLiteCaseStore,
+    case_store_from_env,
+    rebuild_search_index,
+)
+from aijurisdictionagents.cases import search
+from aijurisdictionagents.schemas import Message, OrchestrationResult
+
+
+def _messages(instruction: str, question: str, answer: str) -> list[Message]:
+    return [
+        Message(role="user", agent_name="User", content=instruction, sources=[]),
+        Message(role="assistant", agent_name="LawyerSlovakia", content=question, sources=[]),
+        Message(role="user", agent_name="User", content=answer, sources=[]),
+    ]
+
+
+def _result(messages: list[Message]) -> OrchestrationResult:
+    return OrchestrationResult(
+        final_recommendation="", judge_rationale="", citations=[], messages=messages
+    )
+
+
+def _create(store: CaseStore, instruction: str, question: str, answer: str) -> str:
+    messages = _messages(instruction, question, answer)
+    record = store.create_case(
+        instruction=instruction,
+        country="SK",
+        language="en",
+        messages=messages,
+        result=_result(messages),
+        agent_name="LawyerSlovakia",
+        data_dir=None,
+    )
+    return record.case_id
+
+
+def _append(store: CaseStore, case_id: str, question: str, answer: str) -> None:
+    messages = _messages("Follow-up", question, answer)
+    store.append_discussion(
+        case_id=case_id,
+        messages=messages,
+        result=_result(messages),
+        agent_name="LawyerSlovakia",
+        data_dir=None,
+    )
+
+
+def test_case_store_writes_update_the_search_index(tmp_path: Path) -> None:
+    index = CaseSearchIndex(tmp_path / "search.sqlite3")
+    store = CaseStore(tmp_path / "cases", search_index=index)
+    try:
+        invoice = _create(
+            store, "Unpaid invoice from a supplier", "When was it due?", "Due in March."
+        )
+        lease = _create(
+            store, "Tenant refuses to leave the flat", "Is there a lease?", "Signed in 2019."
+        )
+        _append(store, lease, "Who holds the deposit?", "The landlord Novak keeps it.")
+
+        by_instruction = index.search("unpaid invoice")
+        by_answer = index.search("Novak")
+        by_transcript = index.search("deposit")
+        both = index.search("invoice lease", any_terms=True)
+        missing = index.search("insolvency")
+    finally:
+        index.close()
+
+    assert [hit.case_id for hit in by_instruction] == [invoice]
+    assert by_instruction[0].kind == "instruction"
+    assert "[invoice]" in by_instruction[0].snippet
+    assert [hit.case_id for hit in by_answer] == [lease]
+    assert [hit.case_id for hit in by_transcript] == [lease]
+    assert {hit.case_id for hit in both} == {invoice, lease}
+    assert missing == []
+
+
+def test_search_ranks_dedupes_and_normalizes_queries(tmp_path: Path) -> None:
+    index = CaseSearchIndex(tmp_path / "search.sqlite3")
+    try:
+        index.add_case("CASE-1", "Náhrada škody za poškodený tovar")
+        index.add_case("CASE-2", "Penalty for late delivery")
+        for position in range(5):
+            index.add_transcript("CASE-2", f"Penalty clause {position}: penalty penalty.")
+        index.add_case("CASE-3", "Contract penalty mentioned once among many other words here")
+
+        diacritics = index.search("nahrada skody")
+        punctuation = index.search('"penalty"*)(')
+        limited = index.search("penalty", limit=1)
+        empty = index.search("?!")
+        index.remove_case("CASE-2")
+        removed = index.search("penalty")
+    finally:
+        index.close()
+
+    assert [hit.case_id for hit in diacritics] == ["CASE-1"]
+    assert [hit.case_id for hit in punctuation] == ["CASE-2", "CASE-3"]
+    assert punctuation[0].score > punctuation[1].score
+    assert [hit.case_id for hit in limited] == ["CASE-2"]
+    assert empty == []
+    assert [hit.case_id for hit in removed] == ["CASE-3"]
+    with pytest.raises(ValueError):
+        index.search("penalty", limit=0)
+
+
+def test_rebuild_indexes_existing_case_folders(tmp_path: Path) -> None:
+    store = CaseStore(tmp_path / "cases")
+    case_id = _create(store, "Warranty claim for a broken fridge", "Receipt?", "Kept it.")
+    _append(store, case_id, "Which shop sold it?", "Elektro Bratislava.")
+    index = CaseSearchIndex(tmp_path / "search.sqlite3")
+    try:
+        first = rebuild_search_index(store, index)
+        second = rebuild_search_index(store, index)
+        hits = index.search("fridge")
+        transcript = index.search("Elektro")
+        rows = index._connection.execute("SELECT count(*) FROM case_entries").fetchone()[0]
+    finally:
+        index.close()
+
+    assert (first, second) == (1, 1)
+    assert [hit.case_id for hit in hits] == [case_id]
+    assert [hit.case_id for hit in transcript] == [case_id]
+    # Rebuilding replaces a case's rows instead of stacking duplicates.
+    assert rows == 5
+
+
+def test_case_store_from_env_attaches_search_index(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("CASE_STORE", "sqlite")
+    monkeypatch.setenv("CASE_SEARCH_DB", str(tmp_path / "search.sqlite3"))
+    store = case_store_from_env(tmp_path / "cases")
+    try:
+        assert isinstance(store, SQLiteCaseStore)
+        case_id = _create(store, "Dismissal without notice", "When?", "Last Friday.")
+        assert [hit.case_id for hit in store.search_index.search("dismissal")] == [case_id]
+    finally:
+        store.search_index.close()
+        store.close()
+
+    monkeypatch.delenv("CASE_SEARCH_DB")
+    monkeypatch.setenv("CASE_STORE", "files")
+    assert case_store_from_env(tmp_path / "files").search_index is None
+
+
+def test_search_cli_reads_the_index_the_store_writes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    cases = tmp_path / "cases"
+    monkeypatch.setenv("CASE_SEARCH_DB", str(tmp_path / "elsewhere" / "search.sqlite3"))
+    store = case_store_from_env(cases)
+    try:
+        case_id = _create(store, "Dismissal without notice", "When?", "Last Friday.")
+    finally:
+        store.search_index.close()
+
+    monkeypatch.setattr(sys, "argv", ["legal-cases-search", "dismissal", "--cases", str(cases)])
+    assert search.main() == 0
+    found = capsys.readouterr()
+    assert found.out.startswith(case_id)
+    assert found.err == ""
+
+    monkeypatch.delenv("CASE_SEARCH_DB")
+    assert search.main() == 0
+    empty = capsys.readouterr()
+    assert "0 case(s)" in empty.out
+    assert "--rebuild" in empty.err
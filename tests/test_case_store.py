@@ -1,6 +1,12 @@
+import json
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from aijurisdictionagents.cases import CaseStore
+import pytest
+
+from aijurisdictionagents.cases import CaseConflict, CaseStore, SQLiteCaseStore
 from aijurisdictionagents.schemas import Message, OrchestrationResult
 
 
@@ -100,3 +106,246 @@ def test_case_store_appends_discussion(tmp_path: Path) -> None:
 
     assert len(updated.data["discussions"]) == 2
     assert updated.data["open_questions"] == ["Do you have delivery confirmation?"]
+
+
+def _append(store: CaseStore, case_id: str, question: str) -> None:
+    messages = [
+        Message(role="user", agent_name="User", content="Follow-up question.", sources=[]),
+        Message(role="assistant", agent_name="LawyerSlovakia", content=question, sources=[]),
+    ]
+    store.append_discussion(
+        case_id=case_id,
+        messages=messages,
+        result=_build_result(messages),
+        agent_name="LawyerSlovakia",
+        data_dir=None,
+    )
+
+
+def _snapshot(case_dir: Path) -> dict:
+    return json.loads((case_dir / "case.json").read_text(encoding="utf-8"))
+
+
+def test_case_store_journals_discussions_and_snapshots_periodically(tmp_path: Path) -> None:
+    messages = [Message(role="user", agent_name="User", content="Initial", sources=[])]
+    store = CaseStore(tmp_path / "cases", snapshot_every=3)
+    record = store.create_case(
+        instruction="Initial",
+        country="SK",
+        language="en",
+        messages=messages,
+        result=_build_result(messages),
+        agent_name="LawyerSlovakia",
+        data_dir=None,
+    )
+    journal = record.path / "journal.jsonl"
+
+    _append(store, record.case_id, "First question?")
+    _append(store, record.case_id, "Second question?")
+
+    assert _snapshot(record.path)["revision"] == 0
+    assert len(journal.read_text(encoding="utf-8").splitlines()) == 2
+    loaded = store.load_case(record.case_id)
+    assert loaded.data["revision"] == 2
+    assert len(loaded.data["discussions"]) == 3
+    assert loaded.data["open_questions"] == ["Second question?"]
+
+    _append(store, record.case_id, "Third question?")
+
+    assert not journal.exists()
+    snapshot = _snapshot(record.path)
+    assert snapshot["revision"] == 3
+    assert len(snapshot["discussions"]) == 4
+    assert snapshot == store.load_case(record.case_id).data
+    assert [path.name for path in record.path.iterdir() if path.suffix == ".tmp"] == []
+
+
+def test_case_store_recovers_from_torn_journal_and_unfinished_snapshot(tmp_path: Path) -> None:
+    messages = [Message(role="user", agent_name="User", content="Initial", sources=[])]
+    store = CaseStore(tmp_path / "cases", snapshot_every=2)
+    record = store.create_case(
+        instruction="Initial",
+        country="SK",
+        language="en",
+        messages=messages,
+        result=_build_result(messages),
+        agent_name="LawyerSlovakia",
+        data_dir=None,
+    )
+    journal = record.path / "journal.jsonl"
+    _append(store, record.case_id, "First question?")
+    leftover = journal.read_text(encoding="utf-8")
+    _append(store, record.case_id, "Second question?")
+    # Crash after the snapshot was written but before the journal was removed.
+    journal.write_text(leftover + '{"revision": 3, "docum', encoding="utf-8")
+
+    loaded = store.load_case(record.case_id)
+    assert loaded.data["revision"] == 2
+    assert len(loaded.data["discussions"]) == 3
+
+    _append(store, record.case_id, "Third question?")
+
+    reloaded = store.load_case(record.case_id)
+    assert reloaded.data["revision"] == 3
+    assert reloaded.data["open_questions"] == ["Third question?"]
+
+
+def test_case_store_deduplicates_documents_by_content(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "contract.txt").write_text("Contract text", encoding="utf-8")
+    (data_dir / "contract copy.txt").write_text("Contract text", encoding="utf-8")
+    messages = [Message(role="user", agent_name="User", content="Initial", sources=[])]
+    store = CaseStore(tmp_path / "cases")
+
+    def create():
+        return store.create_case(
+            instruction="Initial",
+            country="SK",
+            language="en",
+            messages=messages,
+            result=_build_result(messages),
+            agent_name="LawyerSlovakia",
+            data_dir=data_dir,
+        )
+
+    first = create()
+
+    def no_copy(source: Path) -> None:
+        raise AssertionError(f"{source} is already stored and must not be copied again")
+
+    monkeypatch.setattr(store.blobs, "_store", no_copy)
+    second = create()
+    store.append_discussion(
+        case_id=first.case_id,
+        messages=messages,
+        result=_build_result(messages),
+        agent_name="LawyerSlovakia",
+        data_dir=data_dir,
+    )
+
+    documents = store.load_case(first.case_id).data["documents"]
+    assert [document["original_name"] for document in documents] == [
+        "contract copy.txt",
+        "contract.txt",
+    ]
+    digest = documents[0]["sha256"]
+    assert documents[1]["sha256"] == digest
+    assert documents[0]["size"] == len("Contract text")
+    blob = store.blobs.path_for(digest)
+    assert blob.read_text(encoding="utf-8") == "Contract text"
+    linked = [first.path / document["path"] for document in documents]
+    linked += [second.path / document["path"] for document in second.data["documents"]]
+    assert len(linked) == 4
+    assert {path.stat().st_ino for path in linked} == {blob.stat().st_ino}
+    assert [path for path in store.blobs.root.rglob("*") if path.is_file()] == [blob]
+
+    monkeypatch.undo()
+    (data_dir / "contract.txt").unlink()
+    (data_dir / "contract copy.txt").write_text("Amended contract text", encoding="utf-8")
+    store.append_discussion(
+        case_id=first.case_id,
+        messages=messages,
+        result=_build_result(messages),
+        agent_name="LawyerSlovakia",
+        data_dir=data_dir,
+    )
+
+    documents = store.load_case(first.case_id).data["documents"]
+    assert [document["doc_id"] for document in documents] == ["DOC-001", "DOC-002", "DOC-003"]
+    assert documents[2]["sha256"] != digest
+    assert documents[2]["filename"].endswith(f"_{documents[2]['sha256'][:12]}.txt")
+    assert (first.path / documents[2]["path"]).read_text(encoding="utf-8") == (
+        "Amended contract text"
+    )
+
+
+def _open_store(kind: str, root: Path) -> CaseStore:
+    if kind == "sqlite":
+        return SQLiteCaseStore(root)
+    return CaseStore(root, snapshot_every=7)
+
+
+def _hammer(kind: str, root: str, case_id: str, worker: int, appends: int) -> None:
+    store = _open_store(kind, Path(root))
+    for idx in range(appends):
+        _append(store, case_id, f"Worker {worker} question {idx}?")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses the fork start method")
+@pytest.mark.parametrize("kind", ["files", "sqlite"])
+def test_case_store_serializes_appends_from_many_processes(tmp_path: Path, kind: str) -> None:
+    workers, appends = 8, 12
+    messages = [Message(role="user", agent_name="User", content="Initial", sources=[])]
+    store = _open_store(kind, tmp_path / "cases")
+    record = store.create_case(
+        instruction="Initial",
+        country="SK",
+        language="en",
+        messages=messages,
+        result=_build_result(messages),
+        agent_name="LawyerSlovakia",
+        data_dir=None,
+    )
+
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(_hammer, kind, str(tmp_path / "cases"), record.case_id, worker, appends)
+            for worker in range(workers)
+        ]
+        for future in futures:
+            future.result()
+
+    data = store.load_case(record.case_id).data
+    questions = [entry["questions_asked"][0] for entry in data["discussions"][1:]]
+    assert data["revision"] == workers * appends
+    assert len(questions) == len(set(questions)) == workers * appends
+    for worker in range(workers):
+        mine = [q for q in questions if q.startswith(f"Worker {worker} ")]
+        assert mine == [f"Worker {worker} question {idx}?" for idx in range(appends)]
+    assert len(list((record.path / "discussions").iterdir())) == workers * appends + 1
+
+
+def test_case_store_rejects_stale_revision(tmp_path: Path) -> None:
+    messages = [Message(role="user", agent_name="User", content="Initial", sources=[])]
+    store = CaseStore(tmp_path / "cases")
+    record = store.create_case(
+        instruction="Initial",
+        country="SK",
+        language="en",
+        messages=messages,
+        result=_build_result(messages),
+        agent_name="LawyerSlovakia",
+        data_dir=None,
+        case_id="case-1",
+    )
+
+    def append(expected_revision: int) -> None:
+        store.append_discussion(
+            case_id=record.case_id,
+            messages=messages,
+            result=_build_result(messages),
+            agent_name="LawyerSlovakia",
+            data_dir=None,
+            expected_revision=expected_revision,
+        )
+
+    append(0)
+    with pytest.raises(CaseConflict):
+        append(0)
+    append(1)
+    with pytest.raises(ValueError):
+        store.create_case(
+            instruction="Initial",
+            country="SK",
+            language="en",
+            messages=messages,
+            result=_build_result(messages),
+            agent_name="LawyerSlovakia",
+            data_dir=None,
+            case_id="case-1",
+        )
+    assert store.load_case("case-1").data["revision"] == 2
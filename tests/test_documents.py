@@ -1,6 +1,15 @@
 from pathlib import Path
 
-from aijurisdictionagents.documents import load_documents, select_sources
+import pytest
+
+from aijurisdictionagents.documents import (
+    DocumentIndex,
+    chunk_file,
+    load_documents,
+    loader,
+    select_sources,
+)
+from aijurisdictionagents.schemas import Document
 
 
 def test_load_documents_reads_txt(tmp_path: Path) -> None:
@@ -14,6 +23,18 @@ def test_load_documents_reads_txt(tmp_path: Path) -> None:
     assert documents[0].path.endswith("doc.txt")
 
 
+def test_extraction_cache_dir_is_only_created_for_pdfs(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "notes.txt").write_text("Delivery notes.", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+
+    load_documents(data_dir, allow_pdf=True, cache_dir=cache_dir)
+    load_documents(data_dir, allow_pdf=True, cache_dir=cache_dir, chunk_size=400)
+
+    assert not cache_dir.exists()
+
+
 def test_select_sources_returns_snippet(tmp_path: Path) -> None:
     doc_path = tmp_path / "case.md"
     doc_path.write_text("The contract requires delivery by May 15.", encoding="utf-8")
@@ -24,3 +45,159 @@ def test_select_sources_returns_snippet(tmp_path: Path) -> None:
     assert sources
     assert sources[0].filename == "case.md"
     assert "delivery" in sources[0].snippet.lower()
+
+
+def test_document_index_ranks_by_bm25() -> None:
+    documents = [
+        Document(doc_id="doc-1", path="invoice.txt", content="Invoice for office chairs."),
+        Document(
+            doc_id="doc-2",
+            path="contract.txt",
+            content="The contract sets delivery by May 15. Late delivery incurs a penalty.",
+        ),
+        Document(doc_id="doc-3", path="email.txt", content="Email about the delivery schedule."),
+    ]
+
+    index = DocumentIndex(documents)
+    hits = index.search("late delivery penalty", top_k=2)
+
+    assert [hit.document.doc_id for hit in hits] == ["doc-2", "doc-3"]
+    assert hits[0].score > hits[1].score
+    assert index.document_frequency("delivery") == 2
+
+
+def test_select_sources_with_index_matches_linear_scan() -> None:
+    documents = [
+        Document(doc_id="doc-1", path="notes.md", content="Unrelated meeting notes."),
+        Document(doc_id="doc-2", path="empty.txt", content="   "),
+        Document(doc_id="doc-3", path="case.md", content="The contract requires delivery."),
+    ]
+
+    indexed = select_sources(documents, "delivery contract", index=DocumentIndex(documents))
+    linear = select_sources(documents, "delivery contract")
+
+    assert [source.filename for source in indexed] == ["case.md", "notes.md"]
+    assert indexed == linear
+
+
+def _write_pdf(path: Path, pages: list[str]) -> None:
+    page_ids = [4 + 2 * idx for idx in range(len(pages))]
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{pid} 0 R' for pid in page_ids)}] "
+        f"/Count {len(pages)} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for pid, text in zip(page_ids, pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {pid + 1} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    output = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n"
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+    output += f"startxref\n{xref_offset}\n%%EOF\n"
+    path.write_bytes(output.encode("latin-1"))
+
+
+def test_load_documents_parallel_matches_serial(tmp_path: Path) -> None:
+    pytest.importorskip("pypdf")
+    _write_pdf(tmp_path / "bundle.pdf", [f"Evidence page {idx}" for idx in range(5)])
+    (tmp_path / "notes.txt").write_text("Delivery notes.", encoding="utf-8")
+
+    serial = load_documents(tmp_path, allow_pdf=True)
+    parallel = load_documents(tmp_path, allow_pdf=True, workers=2)
+
+    assert parallel == serial
+    assert [doc.doc_id for doc in parallel] == ["doc-1", "doc-2"]
+    assert "Evidence page 4" in parallel[0].content
+
+
+def test_pdf_shares_cover_every_page_once(tmp_path: Path) -> None:
+    pytest.importorskip("pypdf")
+    path = tmp_path / "bundle.pdf"
+    _write_pdf(path, [f"Evidence page {idx}" for idx in range(5)])
+    for index in range(3):
+        _write_pdf(tmp_path / f"annex-{index}.pdf", [f"Annex {index}"])
+
+    for shares in (1, 2, 3, 7):
+        pages = [
+            page
+            for share in range(shares)
+            for page in loader._extract_pdf_share(str(path), share, shares)
+        ]
+        assert [page.strip() for page in pages] == [f"Evidence page {idx}" for idx in range(5)]
+
+    serial = load_documents(tmp_path, allow_pdf=True)
+    assert load_documents(tmp_path, allow_pdf=True, workers=2) == serial
+
+
+def test_load_documents_reuses_extraction_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytest.importorskip("pypdf")
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_pdf(data_dir / "bundle.pdf", ["Signed delivery protocol"])
+    cache_dir = tmp_path / "cache"
+
+    first = load_documents(data_dir, allow_pdf=True, cache_dir=cache_dir)
+
+    def fail(_path: Path) -> str:
+        raise AssertionError("PDF should be served from the extraction cache.")
+
+    monkeypatch.setattr(loader, "_read_pdf", fail)
+    second = load_documents(data_dir, allow_pdf=True, cache_dir=cache_dir)
+
+    assert second == first
+    assert "Signed delivery protocol" in second[0].content
+
+
+def test_load_documents_chunked_reads_lazily(tmp_path: Path) -> None:
+    paragraphs = [f"Paragraph {idx} about invoices and payments." for idx in range(200)]
+    paragraphs[150] = "The courier confirmed late delivery of the machine on June 3."
+    (tmp_path / "bundle.txt").write_text("\n\n".join(paragraphs), encoding="utf-8")
+
+    documents = load_documents(tmp_path, chunk_size=500)
+
+    document = documents[0]
+    assert document.content == ""
+    assert len(document.chunks) > 10
+    assert all(chunk.content is None for chunk in document.chunks)
+    assert all(chunk.end - chunk.start <= 500 for chunk in document.chunks)
+    assert "".join(chunk.text for chunk in document.chunks) == "\n\n".join(paragraphs)
+
+
+def test_select_sources_uses_best_matching_chunk(tmp_path: Path) -> None:
+    paragraphs = ["Late fees are listed in the appendix."] + [
+        f"Paragraph {idx} about invoices." for idx in range(100)
+    ]
+    paragraphs.append("Late delivery of the machine breached the delivery deadline.")
+    (tmp_path / "bundle.txt").write_text("\n\n".join(paragraphs), encoding="utf-8")
+
+    documents = load_documents(tmp_path, chunk_size=300)
+    linear = select_sources(documents, "late delivery deadline")
+    indexed = select_sources(
+        documents, "late delivery deadline", index=DocumentIndex(documents)
+    )
+
+    assert "breached the delivery deadline" in linear[0].snippet
+    assert "breached the delivery deadline" in indexed[0].snippet
+
+
+def test_chunk_file_splits_oversized_paragraph_on_character_boundary(tmp_path: Path) -> None:
+    path = tmp_path / "long.txt"
+    path.write_text("č" * 1000, encoding="utf-8")
+
+    chunks = chunk_file("doc-1", path, path, chunk_size=301)
+
+    assert "".join(chunk.text for chunk in chunks) == "č" * 1000
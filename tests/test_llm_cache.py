@@ -0,0 +1,173 @@
+import json
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from aijurisdictionagents.agents import create_lawyer
+from aijurisdictionagents.llm import (
+    CachingLLMClient,
+    InMemoryCacheBackend,
+    MockLLMClient,
+    SQLiteCacheBackend,
+    get_llm_client,
+)
+from aijurisdictionagents.observability import TraceRecorder
+from aijurisdictionagents.orchestration import Orchestrator
+from aijurisdictionagents.schemas import Document, Message
+
+
+class CountingLLM:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def complete(self, agent_name: str, _prompt: str, conversation, _docs) -> str:
+        self.calls += 1
+        return f"{agent_name} reply {len(conversation)}"
+
+
+def test_caching_client_reuses_identical_requests() -> None:
+    inner = CountingLLM()
+    client = CachingLLMClient(inner, InMemoryCacheBackend())
+    conversation = [Message(role="user", agent_name="User", content="Late delivery")]
+    documents = [Document(doc_id="doc-1", path="a.txt", content="Contract text")]
+
+    first = client.complete("Lawyer", "PROMPT", conversation, documents)
+    second = client.complete("Lawyer", "PROMPT", conversation, documents)
+    client.complete(
+        "Lawyer",
+        "PROMPT",
+        conversation,
+        [Document(doc_id="doc-1", path="a.txt", content="Amended text")],
+    )
+
+    assert first == second
+    assert inner.calls == 2
+    assert client.stats()["cache_hits"] == 1
+    assert client.stats()["cache_misses"] == 2
+
+
+class ConfiguredLLM(CountingLLM):
+    def __init__(self, model: str) -> None:
+        super().__init__()
+        self.model = model
+
+    def settings(self) -> dict:
+        return {"model": self.model}
+
+
+def test_persistent_cache_is_scoped_to_client_settings(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    conversation = [Message(role="user", agent_name="User", content="Late delivery")]
+
+    def complete(inner: CountingLLM) -> None:
+        backend = SQLiteCacheBackend(path)
+        try:
+            CachingLLMClient(inner, backend).complete("Lawyer", "PROMPT", conversation, [])
+        finally:
+            backend.close()
+
+    recorded, switched, repeated = (
+        ConfiguredLLM("gpt-4o-mini"),
+        ConfiguredLLM("gpt-4o"),
+        ConfiguredLLM("gpt-4o-mini"),
+    )
+    for inner in (recorded, switched, repeated):
+        complete(inner)
+
+    assert (recorded.calls, switched.calls, repeated.calls) == (1, 1, 0)
+
+
+def test_provider_settings_cover_model_sampling_and_context_budget() -> None:
+    openai_client = pytest.importorskip("aijurisdictionagents.llm.openai_client")
+    base = openai_client.OpenAIConfig(api_key="sk-test")
+    variants = [
+        base,
+        replace(base, model="gpt-4o"),
+        replace(base, temperature=0.7),
+        replace(base, context_tokens=4000),
+        replace(base, api_key="sk-other"),
+    ]
+    settings = [openai_client.OpenAIClient(config).settings() for config in variants]
+
+    assert len({json.dumps(item, sort_keys=True) for item in settings}) == 4
+    # Credentials never end up in cache keys.
+    assert settings[-1] == settings[0]
+
+
+def test_in_memory_backend_evicts_least_recently_used() -> None:
+    backend = InMemoryCacheBackend(max_entries=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    assert backend.get("a") == "1"
+    backend.set("c", "3")
+
+    assert backend.get("b") is None
+    assert backend.get("a") == "1"
+    assert backend.get("c") == "3"
+
+
+def test_sqlite_backend_persists_and_evicts(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    backend = SQLiteCacheBackend(path, max_entries=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    backend.get("a")
+    backend.set("c", "3")
+    backend.close()
+
+    reopened = SQLiteCacheBackend(path, max_entries=2)
+    try:
+        assert len(reopened) == 2
+        assert reopened.get("a") == "1"
+        assert reopened.get("b") is None
+    finally:
+        reopened.close()
+
+
+def test_sqlite_backend_expires_entries(tmp_path: Path) -> None:
+    backend = SQLiteCacheBackend(tmp_path / "cache.sqlite3", ttl_seconds=0.05)
+    try:
+        backend.set("a", "1")
+        assert backend.get("a") == "1"
+        time.sleep(0.1)
+        assert backend.get("a") is None
+    finally:
+        backend.close()
+
+
+def test_get_llm_client_wraps_cache_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
+    monkeypatch.setenv("LLM_CACHE", "memory")
+
+    client = get_llm_client()
+
+    assert isinstance(client, CachingLLMClient)
+    assert isinstance(client.inner, MockLLMClient)
+
+
+def test_orchestrator_records_cache_stats(tmp_path: Path) -> None:
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+
+    client = CachingLLMClient(MockLLMClient(), InMemoryCacheBackend())
+    for _ in range(2):
+        trace = TraceRecorder(run_dir)
+        try:
+            Orchestrator(lawyer=create_lawyer(client), judge=None, trace=trace).run(
+                "Late delivery dispute",
+                [],
+                country="SK",
+                question_timeout_seconds=60,
+            )
+        finally:
+            trace.close()
+
+    records = [
+        json.loads(line)
+        for line in (run_dir / "trace.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    stats = [record for record in records if record["type"] == "llm_stats"]
+    assert stats[-1]["cache_hits"] == 2
+    assert stats[-1]["cache_misses"] == 2
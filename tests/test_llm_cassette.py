@@ -0,0 +1,151 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from aijurisdictionagents.agents import create_judge, create_lawyer
+from aijurisdictionagents.llm import (
+    CassetteMiss,
+    MockLLMClient,
+    RecordingLLMClient,
+    ReplayLLMClient,
+    get_llm_client,
+)
+from aijurisdictionagents.observability import TraceRecorder
+from aijurisdictionagents.orchestration import Orchestrator
+from aijurisdictionagents.schemas import Message, OrchestrationResult
+
+
+class _SlowMockLLM(MockLLMClient):
+    def complete(self, agent_name, system_prompt, conversation, documents) -> str:
+        time.sleep(0.01)
+        return super().complete(agent_name, system_prompt, conversation, documents)
+
+
+def _run_court(llm, run_dir: Path) -> OrchestrationResult:
+    run_dir.mkdir()
+    trace = TraceRecorder(run_dir)
+    try:
+        return Orchestrator(
+            lawyer=create_lawyer(llm),
+            judge=create_judge(llm),
+            trace=trace,
+        ).run(
+            "Assess the unpaid invoice claim.",
+            [],
+            country="SK",
+            discussion_type="court",
+        )
+    finally:
+        trace.close()
+
+
+def test_replay_reproduces_recorded_orchestration(tmp_path: Path) -> None:
+    cassette = tmp_path / "cassette.jsonl"
+    recorder = RecordingLLMClient(_SlowMockLLM(), cassette)
+    recorded = _run_court(recorder, tmp_path / "record")
+
+    entries = [json.loads(line) for line in cassette.read_text(encoding="utf-8").splitlines()]
+    assert len(entries) == recorder.stats()["cassette_recorded"] > 0
+    assert all(entry["latency_seconds"] >= 0.01 for entry in entries)
+
+    delays: List[float] = []
+    replay = ReplayLLMClient(cassette, simulate_latency=True, sleep=delays.append)
+    replayed = _run_court(replay, tmp_path / "replay")
+
+    assert replayed.final_recommendation == recorded.final_recommendation
+    assert replayed.judge_rationale == recorded.judge_rationale
+    assert replay.stats()["cassette_hits"] == len(entries)
+    assert delays == [entry["latency_seconds"] for entry in entries]
+
+
+def test_replay_serves_repeated_requests_in_order(tmp_path: Path) -> None:
+    class Counter:
+        calls = 0
+
+        def complete(self, agent_name, system_prompt, conversation, documents) -> str:
+            self.calls += 1
+            return f"answer {self.calls}"
+
+    cassette = tmp_path / "cassette.jsonl"
+    recorder = RecordingLLMClient(Counter(), cassette)
+    recorder.complete("Lawyer", "SYSTEM", [], [])
+    recorder.complete("Lawyer", "SYSTEM", [], [])
+
+    replay = ReplayLLMClient(cassette)
+
+    assert replay.complete("Lawyer", "SYSTEM", [], []) == "answer 1"
+    assert replay.complete("Lawyer", "SYSTEM", [], []) == "answer 2"
+    assert replay.complete("Lawyer", "SYSTEM", [], []) == "answer 2"
+    with pytest.raises(CassetteMiss):
+        replay.complete("Judge", "SYSTEM", [], [])
+    assert replay.stats()["cassette_misses"] == 1
+
+
+def test_replay_streams_with_recorded_first_token_latency(tmp_path: Path) -> None:
+    cassette = tmp_path / "cassette.jsonl"
+    recorder = RecordingLLMClient(MockLLMClient(), cassette)
+    conversation = [Message(role="user", agent_name="User", content="Is the lease valid?")]
+    streamed = "".join(recorder.stream("Lawyer", "SYSTEM", conversation, []))
+
+    entry = json.loads(cassette.read_text(encoding="utf-8"))
+    assert entry["first_token_seconds"] is not None
+
+    replay = ReplayLLMClient(cassette, simulate_latency=True, latency_scale=0.0)
+
+    async def collect() -> str:
+        deltas = [delta async for delta in replay.astream("Lawyer", "SYSTEM", conversation, [])]
+        return "".join(deltas)
+
+    assert asyncio.run(collect()) == streamed
+    assert replay.stats()["cassette_simulated_seconds"] == 0
+
+
+def test_get_llm_client_replays_cassette_from_env(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cassette = tmp_path / "cassette.jsonl"
+    RecordingLLMClient(MockLLMClient(), cassette).complete("Lawyer", "SYSTEM", [], [])
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.delenv("OPENAI_KEY", raising=False)
+    monkeypatch.setenv("LLM_CASSETTE", "replay")
+    monkeypatch.setenv("LLM_CASSETTE_PATH", str(cassette))
+
+    client = get_llm_client()
+
+    assert isinstance(client, ReplayLLMClient)
+    assert client.complete("Lawyer", "SYSTEM", [], []).startswith("Legal position")
+
+
+def test_replay_rejects_responses_recorded_with_other_settings(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class Model(MockLLMClient):
+        def __init__(self, model: str) -> None:
+            self.model = model
+
+        def settings(self) -> dict:
+            return {"provider": "openai", "model": self.model, "temperature": 0.2}
+
+    cassette = tmp_path / "cassette.jsonl"
+    RecordingLLMClient(Model("gpt-4o-mini"), cassette).complete("Lawyer", "SYSTEM", [], [])
+
+    assert json.loads(cassette.read_text(encoding="utf-8"))["settings"]["model"] == "gpt-4o-mini"
+    matching = ReplayLLMClient(cassette, settings=Model("gpt-4o-mini").settings())
+    assert matching.complete("Lawyer", "SYSTEM", [], []).startswith("Legal position")
+    switched = ReplayLLMClient(cassette, settings=Model("gpt-4o").settings())
+    with pytest.raises(CassetteMiss, match="gpt-4o-mini"):
+        switched.complete("Lawyer", "SYSTEM", [], [])
+    assert switched.stats()["cassette_misses"] == 1
+
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_KEY", "sk-test")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4o")
+    monkeypatch.setenv("LLM_CASSETTE", "replay")
+    monkeypatch.setenv("LLM_CASSETTE_PATH", str(cassette))
+    pytest.importorskip("openai")
+    client = get_llm_client()
+    assert client.expected_settings["model"] == "gpt-4o"
@@ -0,0 +1,103 @@
+from aijurisdictionagents.llm.context import estimate_tokens, pack_context
+from aijurisdictionagents.llm.messages import PrefixTracker, build_chat_messages
+from aijurisdictionagents.schemas import Document, Message
+
+
+def _documents() -> list[Document]:
+    filler = "\n\n".join(f"Paragraph {idx} covers routine invoicing." for idx in range(60))
+    return [
+        Document(doc_id="doc-1", path="data/invoices.txt", content=filler),
+        Document(
+            doc_id="doc-2",
+            path="data/contract.txt",
+            content=filler + "\n\nThe seller owes a penalty for late delivery after May 15.",
+        ),
+    ]
+
+
+def test_pack_context_prefers_chunks_matching_latest_turn() -> None:
+    conversation = [
+        Message(role="user", agent_name="User", content="Invoices are attached."),
+        Message(role="user", agent_name="User", content="Is there a late delivery penalty?"),
+    ]
+
+    context = pack_context(_documents(), conversation, max_tokens=60, token_counter=estimate_tokens)
+
+    lines = context.splitlines()
+    assert lines[0] == "Context documents:"
+    assert lines[1].startswith("[contract.txt]")
+    assert "penalty for late delivery" in lines[1]
+
+
+def test_pack_context_respects_token_budget() -> None:
+    conversation = [Message(role="user", agent_name="User", content="routine invoicing")]
+
+    for budget in (40, 120, 400):
+        context = pack_context(
+            _documents(), conversation, max_tokens=budget, token_counter=estimate_tokens
+        )
+        assert sum(estimate_tokens(line) for line in context.splitlines()) <= budget
+
+
+def test_pack_context_stops_counting_once_the_budget_is_spent() -> None:
+    conversation = [Message(role="user", agent_name="User", content="routine invoicing")]
+    documents = [
+        Document(doc_id=f"doc-{idx}", path=f"data/{idx}.txt", content=f"Paragraph {idx}. " * 200)
+        for idx in range(300)
+    ]
+    calls: list[str] = []
+
+    def counter(text: str) -> int:
+        calls.append(text)
+        return estimate_tokens(text)
+
+    pack_context(documents, conversation, max_tokens=1000, token_counter=counter)
+
+    assert len(calls) < 50
+
+
+def test_pack_context_falls_back_to_document_order_without_matches() -> None:
+    conversation = [Message(role="user", agent_name="User", content="xyz")]
+
+    context = pack_context(
+        _documents(), conversation, max_tokens=200, token_counter=estimate_tokens
+    )
+
+    assert context.splitlines()[1].startswith("[invoices.txt] Paragraph 0")
+
+
+def test_chat_messages_keep_document_context_after_conversation() -> None:
+    conversation = [
+        Message(role="system", agent_name="System", content="Question: late delivery"),
+        Message(role="assistant", agent_name="Lawyer", content="Please share the contract."),
+    ]
+
+    messages = build_chat_messages("SYSTEM", conversation, _documents(), context_tokens=60)
+
+    assert messages[0] == {"role": "system", "content": "SYSTEM"}
+    assert messages[1]["content"] == "System: Question: late delivery"
+    assert messages[2]["content"] == "Lawyer: Please share the contract."
+    assert messages[-1]["content"].startswith("Context documents:")
+
+
+def test_prefix_tracker_reports_stable_prefix_per_agent() -> None:
+    tracker = PrefixTracker()
+    conversation = [Message(role="user", agent_name="User", content="Is there a penalty?")]
+    first = build_chat_messages("SYSTEM", conversation, _documents(), context_tokens=60)
+    conversation.append(
+        Message(role="assistant", agent_name="Lawyer", content="Yes, after May 15.")
+    )
+    second = build_chat_messages("SYSTEM", conversation, _documents(), context_tokens=60)
+
+    assert tracker.observe("Lawyer", first) == 0
+    stable = tracker.observe("Lawyer", second)
+    assert tracker.observe("Judge", second) == 0
+
+    shared = len('{"role": "system", "content": "SYSTEM"}') + len(
+        '{"role": "user", "content": "User: Is there a penalty?"}'
+    )
+    assert stable >= shared
+    stats = tracker.stats()
+    assert stats["prompt_calls"] == 3
+    assert stats["prompt_prefix_chars_last"] == 0
+    assert 0 < stats["prompt_prefix_ratio"] < 1
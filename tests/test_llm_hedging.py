@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+from typing import List
+
+import pytest
+
+from aijurisdictionagents.llm import HedgingLLMClient, get_llm_client
+
+
+class _ScriptedLLM:
+    def __init__(self, name: str, delays: List[float] | None = None) -> None:
+        self.name = name
+        self.delays = list(delays or [])
+        self.calls = 0
+        self.cancelled = 0
+
+    def _next_delay(self) -> float:
+        self.calls += 1
+        return self.delays.pop(0) if self.delays else 0.0
+
+    def complete(self, agent_name, system_prompt, conversation, documents) -> str:
+        time.sleep(self._next_delay())
+        return f"{self.name} answer"
+
+    async def acomplete(self, agent_name, system_prompt, conversation, documents) -> str:
+        try:
+            await asyncio.sleep(self._next_delay())
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return f"{self.name} answer"
+
+
+def _warm(client: HedgingLLMClient, samples: int, latency: float = 0.01) -> None:
+    for _ in range(samples):
+        client.window.record(latency)
+        client.calls += 1
+
+
+def test_hedging_waits_for_enough_samples() -> None:
+    primary = _ScriptedLLM("primary", delays=[0.05])
+    hedge = _ScriptedLLM("hedge")
+    client = HedgingLLMClient(primary, hedge=hedge, min_samples=5)
+
+    assert client.complete("Lawyer", "SYSTEM", [], []) == "primary answer"
+    assert hedge.calls == 0
+    assert client.stats()["hedged_requests"] == 0
+
+
+def test_hedging_fires_duplicate_after_percentile_delay() -> None:
+    primary = _ScriptedLLM("primary", delays=[0.5])
+    hedge = _ScriptedLLM("hedge")
+    client = HedgingLLMClient(primary, hedge=hedge, min_samples=5, max_hedge_rate=0.5)
+    _warm(client, 5)
+
+    started = time.monotonic()
+    assert client.complete("Lawyer", "SYSTEM", [], []) == "hedge answer"
+    assert time.monotonic() - started < 0.4
+
+    stats = client.stats()
+    assert stats["hedged_requests"] == 1
+    assert stats["hedge_wins"] == 1
+    assert stats["hedge_delay_ms"] is not None
+
+
+def test_hedging_delay_tracks_the_primary_latency() -> None:
+    primary = _ScriptedLLM("primary", delays=[0.3])
+    hedge = _ScriptedLLM("hedge")
+    client = HedgingLLMClient(primary, hedge=hedge, min_samples=5, max_hedge_rate=0.5)
+    _warm(client, 5)
+
+    assert client.complete("Lawyer", "SYSTEM", [], []) == "hedge answer"
+    deadline = time.monotonic() + 2
+    while len(client.window) < 6 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # The slow primary's own latency lands in the window, not the fast hedged result.
+    assert len(client.window) == 6
+    assert client.window.percentile(0.99) >= 0.3
+
+
+def test_hedging_records_primary_failures() -> None:
+    class Broken:
+        def complete(self, agent_name, system_prompt, conversation, documents) -> str:
+            raise ConnectionError("refused")
+
+    client = HedgingLLMClient(Broken(), min_samples=5)
+
+    with pytest.raises(ConnectionError):
+        client.complete("Lawyer", "SYSTEM", [], [])
+    assert client.window.error_rate == 1.0
+
+
+def test_hedging_respects_rate_cap() -> None:
+    primary = _ScriptedLLM("primary", delays=[0.05])
+    hedge = _ScriptedLLM("hedge")
+    client = HedgingLLMClient(primary, hedge=hedge, min_samples=5, max_hedge_rate=0.0)
+    _warm(client, 5)
+
+    assert client.complete("Lawyer", "SYSTEM", [], []) == "primary answer"
+    assert hedge.calls == 0
+    assert client.stats()["hedge_budget_skips"] == 1
+
+
+def test_hedging_runs_inline_when_every_worker_is_busy() -> None:
+    release = threading.Event()
+
+    class GatedLLM:
+        def complete(self, agent_name, system_prompt, conversation, documents) -> str:
+            if agent_name == "Stuck":
+                release.wait(5)
+            return f"{agent_name} answer"
+
+    hedge = _ScriptedLLM("hedge")
+    client = HedgingLLMClient(
+        GatedLLM(), hedge=hedge, min_samples=5, max_hedge_rate=1.0, max_workers=1
+    )
+    _warm(client, 5)
+    stuck = threading.Thread(target=client.complete, args=("Stuck", "SYSTEM", [], []))
+    stuck.start()
+    try:
+        # Wait until the stuck call has tried to hedge and found its only worker taken.
+        deadline = time.monotonic() + 5
+        while client.saturation_skips < 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        started = time.monotonic()
+        assert client.complete("Lawyer", "SYSTEM", [], []) == "Lawyer answer"
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+        stuck.join(timeout=5)
+
+    stats = client.stats()
+    assert stats["hedge_saturation_skips"] == 2
+    assert stats["hedged_requests"] == 0
+    assert hedge.calls == 0
+    assert stats["hedge_busy_workers"] == 0
+
+
+def test_async_hedging_cancels_the_slower_request() -> None:
+    primary = _ScriptedLLM("primary", delays=[5.0])
+    hedge = _ScriptedLLM("hedge")
+    client = HedgingLLMClient(primary, hedge=hedge, min_samples=5, max_hedge_rate=0.5)
+    _warm(client, 5)
+
+    async def run() -> str:
+        content = await client.acomplete("Lawyer", "SYSTEM", [], [])
+        await asyncio.sleep(0)
+        return content
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=2)) == "hedge answer"
+    assert primary.cancelled == 1
+    # The cancelled primary counts with the time it had already taken, at least the delay.
+    assert len(client.window) == 6
+    assert client.window.percentile(0.99) >= 0.01
+    assert client.stats()["hedge_wins"] == 1
+
+
+def test_get_llm_client_wraps_with_hedging_when_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
+    monkeypatch.setenv("LLM_HEDGE", "1")
+    monkeypatch.setenv("LLM_HEDGE_BACKEND", "mock")
+    monkeypatch.delenv("LLM_CACHE", raising=False)
+
+    client = get_llm_client()
+
+    assert isinstance(client, HedgingLLMClient)
+    assert client.hedge is not client.primary
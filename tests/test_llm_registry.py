@@ -0,0 +1,129 @@
+import asyncio
+import threading
+from typing import Any, Dict, List
+
+import pytest
+
+from aijurisdictionagents.llm import ClientRegistry, PoolConfig, RequestScheduler
+
+
+class _FakeSDKClient:
+    def __init__(self, http: Dict[str, Any]) -> None:
+        self.http = http
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeAsyncSDKClient(_FakeSDKClient):
+    async def close(self) -> None:
+        self.closed = True
+
+
+def test_registry_reuses_clients_per_key() -> None:
+    registry = ClientRegistry()
+    created: List[_FakeSDKClient] = []
+
+    def factory(http: Dict[str, Any]) -> _FakeSDKClient:
+        created.append(_FakeSDKClient(http))
+        return created[-1]
+
+    first = registry.get(("openai", "", "abc"), factory)
+    second = registry.get(("openai", "", "abc"), factory)
+    other = registry.get(("openai", "", "def"), factory)
+
+    assert first is second
+    assert other is not first
+    assert len(created) == 2
+
+    registry.close()
+    assert all(client.closed for client in created)
+    assert len(registry) == 0
+
+
+def test_registry_binds_async_clients_to_event_loop() -> None:
+    registry = ClientRegistry()
+
+    async def fetch() -> tuple[_FakeAsyncSDKClient, _FakeAsyncSDKClient]:
+        first = registry.get_async("key", _FakeAsyncSDKClient)
+        second = registry.get_async("key", _FakeAsyncSDKClient)
+        return first, second
+
+    first, second = asyncio.run(fetch())
+    third, _ = asyncio.run(fetch())
+
+    assert first is second
+    assert third is not first
+    # asyncio.run() shutting a loop down closes the clients bound to it.
+    assert first.closed and third.closed
+    assert len(registry) == 0
+
+    async def shutdown() -> _FakeAsyncSDKClient:
+        client = registry.get_async("key", _FakeAsyncSDKClient)
+        await registry.aclose()
+        return client
+
+    assert asyncio.run(shutdown()).closed
+    assert len(registry) == 0
+
+
+def test_registry_aclose_leaves_other_loops_clients_open() -> None:
+    registry = ClientRegistry()
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+
+    async def fetch() -> _FakeAsyncSDKClient:
+        return registry.get_async("key", _FakeAsyncSDKClient)
+
+    def on_other_loop(coro):
+        return asyncio.run_coroutine_threadsafe(coro, other_loop).result(timeout=5)
+
+    try:
+        other_client = on_other_loop(fetch())
+
+        async def shutdown() -> _FakeAsyncSDKClient:
+            client = registry.get_async("key", _FakeAsyncSDKClient)
+            await registry.aclose()
+            return client
+
+        assert asyncio.run(shutdown()).closed
+        assert not other_client.closed
+        assert on_other_loop(fetch()) is other_client
+
+        on_other_loop(registry.aclose())
+        assert other_client.closed
+        assert len(registry) == 0
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join(timeout=5)
+        other_loop.close()
+
+
+def test_registry_configures_httpx_pool() -> None:
+    pytest.importorskip("httpx")
+    registry = ClientRegistry(PoolConfig(max_connections=7, http2=False))
+
+    client = registry.get("key", _FakeSDKClient)
+
+    http_client = client.http["http_client"]
+    assert http_client is not None
+    registry.close()
+    http_client.close()
+
+
+def test_openai_clients_share_sdk_client(fake_chat_server) -> None:
+    pytest.importorskip("openai")
+    from aijurisdictionagents.llm.openai_client import OpenAIClient, OpenAIConfig
+
+    registry = ClientRegistry()
+    config = OpenAIConfig(api_key="test-key", base_url=fake_chat_server.base_url)
+    first = OpenAIClient(config, scheduler=RequestScheduler(), registry=registry)
+    second = OpenAIClient(config, scheduler=RequestScheduler(), registry=registry)
+
+    assert first.complete("Lawyer", "SYSTEM", [], []) == "fake response"
+    assert second.complete("Judge", "SYSTEM", [], []) == "fake response"
+    assert first._sync_client() is second._sync_client()
+    assert len(registry) == 1
+    registry.close()
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from typing import List
+
+import pytest
+
+from aijurisdictionagents.llm import (
+    DeadlineExceeded,
+    LatencyWindow,
+    RoutingLLMClient,
+    get_llm_client,
+)
+
+
+class _DelayedLLM:
+    def __init__(self, name: str, delay: float = 0.0, error: Exception | None = None) -> None:
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls: List[str] = []
+
+    def complete(self, agent_name, system_prompt, conversation, documents) -> str:
+        self.calls.append(agent_name)
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return f"{self.name} answer"
+
+    async def acomplete(self, agent_name, system_prompt, conversation, documents) -> str:
+        self.calls.append(agent_name)
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return f"{self.name} answer"
+
+
+def test_latency_window_percentiles_and_error_rate() -> None:
+    window = LatencyWindow(size=4)
+    for latency in (0.5, 0.1, 0.2, 0.3, 0.4):
+        window.record(latency)
+    window.record(1.0, ok=False)
+
+    assert len(window) == 4
+    assert window.percentile(0.5) == 0.3
+    assert window.percentile(0.95) == 1.0
+    assert window.error_rate == 0.25
+
+
+def test_router_prefers_the_faster_backend() -> None:
+    slow = _DelayedLLM("slow", delay=0.03)
+    fast = _DelayedLLM("fast")
+    router = RoutingLLMClient([("slow", slow), ("fast", fast)])
+
+    answers = [router.complete("Lawyer", "SYSTEM", [], []) for _ in range(6)]
+
+    assert answers[0] == "slow answer"
+    assert answers[1:] == ["fast answer"] * 5
+    stats = router.stats()["router_backends"]
+    assert stats["slow"]["calls"] == 1
+    assert stats["fast"]["p95_ms"] < stats["slow"]["p95_ms"]
+
+
+def test_router_fails_over_and_cools_down_failing_backend() -> None:
+    broken = _DelayedLLM("broken", error=ConnectionError("refused"))
+    healthy = _DelayedLLM("healthy")
+    router = RoutingLLMClient([("broken", broken), ("healthy", healthy)])
+
+    assert router.complete("Lawyer", "SYSTEM", [], []) == "healthy answer"
+    assert router.complete("Lawyer", "SYSTEM", [], []) == "healthy answer"
+
+    assert len(broken.calls) == 1
+    stats = router.stats()["router_backends"]
+    assert stats["broken"]["cooling_down"] is True
+    assert stats["broken"]["error_rate"] == 1.0
+
+
+def test_router_fails_over_on_timeout() -> None:
+    stuck = _DelayedLLM("stuck", delay=0.5)
+    backup = _DelayedLLM("backup")
+    router = RoutingLLMClient([("stuck", stuck), ("backup", backup)], timeout_seconds=0.05)
+
+    started = time.monotonic()
+    assert router.complete("Lawyer", "SYSTEM", [], []) == "backup answer"
+    assert time.monotonic() - started < 0.4
+
+
+def test_router_skips_backends_saturated_by_timed_out_calls() -> None:
+    stuck = _DelayedLLM("stuck", delay=0.5)
+    backup = _DelayedLLM("backup")
+    # A frozen clock keeps both scores at zero, so the stuck backend stays first in line.
+    router = RoutingLLMClient(
+        [("stuck", stuck), ("backup", backup)],
+        timeout_seconds=0.05,
+        cooldown_seconds=0,
+        max_error_rate=1.0,
+        max_in_flight=1,
+        clock=lambda: 0.0,
+    )
+
+    assert router.complete("Lawyer", "SYSTEM", [], []) == "backup answer"
+    assert router.ranked()[0].name == "stuck"
+    assert router.complete("Lawyer", "SYSTEM", [], []) == "backup answer"
+
+    # The second call skips the stuck backend instead of stacking another abandoned call.
+    assert len(stuck.calls) == 1
+    stats = router.stats()["router_backends"]
+    assert stats["stuck"]["in_flight"] == 1
+    assert stats["stuck"]["failures"] == 1
+    assert stats["backup"]["failures"] == 0
+
+
+def test_router_async_fails_over_on_timeout() -> None:
+    stuck = _DelayedLLM("stuck", delay=0.5)
+    backup = _DelayedLLM("backup")
+    router = RoutingLLMClient([("stuck", stuck), ("backup", backup)], timeout_seconds=0.05)
+
+    assert asyncio.run(router.acomplete("Lawyer", "SYSTEM", [], [])) == "backup answer"
+    assert router.stats()["router_backends"]["stuck"]["failures"] == 1
+
+
+def test_router_does_not_fail_over_on_request_errors() -> None:
+    invalid = _DelayedLLM("invalid", error=ValueError("bad request"))
+    deadline = _DelayedLLM("deadline", error=DeadlineExceeded("late"))
+    other = _DelayedLLM("other")
+
+    with pytest.raises(ValueError):
+        RoutingLLMClient([("invalid", invalid), ("other", other)]).complete("Lawyer", "S", [], [])
+    with pytest.raises(DeadlineExceeded):
+        RoutingLLMClient([("deadline", deadline), ("other", other)]).complete("Lawyer", "S", [], [])
+    assert other.calls == []
+
+
+def test_router_raises_last_error_when_all_backends_fail() -> None:
+    router = RoutingLLMClient(
+        [
+            ("a", _DelayedLLM("a", error=ConnectionError("a down"))),
+            ("b", _DelayedLLM("b", error=ConnectionError("b down"))),
+        ]
+    )
+
+    with pytest.raises(ConnectionError, match="b down"):
+        router.complete("Lawyer", "SYSTEM", [], [])
+
+
+def test_get_llm_client_builds_router_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LLM_PROVIDER", "router")
+    monkeypatch.setenv("LLM_ROUTER_BACKENDS", "mock:primary, mock:secondary")
+    monkeypatch.delenv("LLM_CACHE", raising=False)
+
+    client = get_llm_client()
+
+    assert isinstance(client, RoutingLLMClient)
+    assert [backend.name for backend in client.backends] == ["mock:primary", "mock:secondary"]
@@ -0,0 +1,291 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from aijurisdictionagents.agents.lawyer import create_lawyer
+from aijurisdictionagents.llm import (
+    DeadlineExceeded,
+    RequestScheduler,
+    RetryPolicy,
+    TokenBucket,
+    collect_usage,
+    request_deadline,
+)
+from aijurisdictionagents.observability import TraceRecorder
+from aijurisdictionagents.orchestration import Orchestrator
+
+
+class _FakeResponse:
+    def __init__(self, headers: dict) -> None:
+        self.headers = headers
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code: int, headers: dict | None = None) -> None:
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = _FakeResponse(headers or {})
+
+
+def _scheduler(sleeps: List[float], **kwargs) -> RequestScheduler:
+    return RequestScheduler(
+        policy=RetryPolicy(max_attempts=4, base_delay=0.1, max_delay=1.0),
+        sleep=sleeps.append,
+        **kwargs,
+    )
+
+
+def test_token_bucket_reserves_ahead_and_refills() -> None:
+    now = [0.0]
+    bucket = TokenBucket(capacity=2, refill_per_second=1, clock=lambda: now[0])
+
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    assert bucket.reserve(1) == pytest.approx(2.0)
+    now[0] = 3.0
+    assert bucket.reserve(1) == 0.0
+
+
+def test_scheduler_retries_and_honors_retry_after() -> None:
+    sleeps: List[float] = []
+    scheduler = _scheduler(sleeps)
+    outcomes = [_StatusError(429, {"retry-after": "2"}), _StatusError(503), "done"]
+
+    def request(timeout: float) -> str:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert scheduler.call(request) == "done"
+    assert sleeps[0] == 2.0
+    assert 0 <= sleeps[1] <= 0.2
+    assert scheduler.stats()["llm_retries"] == 2
+    assert scheduler.stats()["llm_requests"] == 3
+
+
+def test_scheduler_does_not_retry_client_errors() -> None:
+    sleeps: List[float] = []
+    scheduler = _scheduler(sleeps)
+
+    def request(timeout: float) -> str:
+        raise _StatusError(400)
+
+    with pytest.raises(_StatusError):
+        scheduler.call(request)
+    assert sleeps == []
+
+
+def test_scheduler_stops_when_backoff_passes_deadline() -> None:
+    sleeps: List[float] = []
+    scheduler = _scheduler(sleeps)
+    timeouts: List[float] = []
+
+    def request(timeout: float) -> str:
+        timeouts.append(timeout)
+        raise _StatusError(429, {"retry-after": "30"})
+
+    with request_deadline(time.monotonic() + 5):
+        with pytest.raises(DeadlineExceeded):
+            scheduler.call(request)
+    assert sleeps == []
+    assert 0 < timeouts[0] <= 5
+    assert scheduler.stats()["llm_deadline_exceeded"] == 1
+
+
+def test_scheduler_throttles_requests_per_minute() -> None:
+    sleeps: List[float] = []
+    scheduler = _scheduler(sleeps, requests_per_minute=60)
+    scheduler.requests = TokenBucket(capacity=1, refill_per_second=1, clock=lambda: 0.0)
+
+    scheduler.call(lambda timeout: "first")
+    scheduler.call(lambda timeout: "second")
+
+    assert sleeps == [pytest.approx(1.0)]
+
+
+def test_scheduler_async_retries() -> None:
+    delays: List[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        delays.append(delay)
+
+    scheduler = RequestScheduler(
+        policy=RetryPolicy(max_attempts=3, base_delay=0.1), async_sleep=fake_sleep
+    )
+    attempts = []
+
+    async def request(timeout: float) -> str:
+        attempts.append(timeout)
+        if len(attempts) == 1:
+            raise _StatusError(429, {"retry-after-ms": "250"})
+        return "ok"
+
+    assert asyncio.run(scheduler.acall(request)) == "ok"
+    assert delays == [0.25]
+
+
+def test_openai_client_retries_rate_limits_against_fake_server(fake_chat_server) -> None:
+    pytest.importorskip("openai")
+    from aijurisdictionagents.llm.openai_client import OpenAIClient, OpenAIConfig
+
+    fake_chat_server.enqueue(429, "slow down", headers={"Retry-After": "0"})
+    fake_chat_server.enqueue(200, "Recovered answer")
+    scheduler = RequestScheduler(
+        tokens_per_minute=10_000, policy=RetryPolicy(max_attempts=3, base_delay=0.01)
+    )
+    client = OpenAIClient(
+        OpenAIConfig(api_key="test-key", base_url=fake_chat_server.base_url),
+        scheduler=scheduler,
+    )
+
+    content = client.complete("Lawyer", "SYSTEM", [], [])
+
+    assert content == "Recovered answer"
+    assert len(fake_chat_server.requests) == 2
+    assert client.stats()["scheduler"]["llm_retries"] == 1
+
+
+def test_scheduler_counters_are_reported_apart_from_run_stats(
+    fake_chat_server, tmp_path: Path
+) -> None:
+    pytest.importorskip("openai")
+    from aijurisdictionagents.llm.openai_client import OpenAIClient, OpenAIConfig
+
+    client = OpenAIClient(
+        OpenAIConfig(api_key="test-key", base_url=fake_chat_server.base_url),
+        scheduler=RequestScheduler(),
+    )
+    trace = TraceRecorder(tmp_path)
+    try:
+        Orchestrator(lawyer=create_lawyer(client), judge=None, trace=trace).run(
+            "Late delivery dispute", [], country="SK"
+        )
+    finally:
+        trace.close()
+
+    records = [
+        json.loads(line)
+        for line in (tmp_path / "trace.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    (run_stats,) = [record for record in records if record["type"] == "llm_stats"]
+    (scheduler,) = [record for record in records if record["type"] == "llm_scheduler_stats"]
+    assert "llm_requests" not in run_stats and "scheduler" not in run_stats
+    assert scheduler["scope"] == "process"
+    assert scheduler["llm_requests"] == len(fake_chat_server.requests)
+
+
+def test_openai_client_reports_usage_to_collector(fake_chat_server) -> None:
+    pytest.importorskip("openai")
+    from aijurisdictionagents.llm.openai_client import OpenAIClient, OpenAIConfig
+
+    client = OpenAIClient(
+        OpenAIConfig(api_key="test-key", base_url=fake_chat_server.base_url),
+        scheduler=RequestScheduler(),
+    )
+
+    with collect_usage() as usage:
+        client.complete("Lawyer", "SYSTEM", [], [])
+        client.complete("Judge", "SYSTEM", [], [])
+
+    total = usage.total()
+    assert (total.prompt_tokens, total.completion_tokens, total.total_tokens) == (20, 10, 30)
+    assert total.calls == total.reported_calls == 2
+
+
+class _FakeStream:
+    def __init__(self) -> None:
+        self.kwargs: dict = {}
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.kwargs = kwargs
+        return iter(
+            [
+                SimpleNamespace(choices=[_delta("Hello ")], usage=None),
+                SimpleNamespace(choices=[_delta("world")], usage=None),
+                SimpleNamespace(
+                    choices=[],
+                    usage=SimpleNamespace(prompt_tokens=30, completion_tokens=12, total_tokens=42),
+                ),
+            ]
+        )
+
+
+def _delta(content: str) -> SimpleNamespace:
+    return SimpleNamespace(delta=SimpleNamespace(content=content))
+
+
+def test_streamed_usage_settles_the_token_bucket() -> None:
+    pytest.importorskip("openai")
+    from aijurisdictionagents.llm.azure_foundry_client import (
+        AzureFoundryClient,
+        AzureFoundryConfig,
+    )
+    from aijurisdictionagents.llm.openai_client import OpenAIClient, OpenAIConfig
+
+    fake = _FakeStream()
+    recorded: List[tuple] = []
+    scheduler = RequestScheduler(tokens_per_minute=10_000)
+    scheduler.record_usage = lambda estimated, actual: recorded.append((estimated, actual))
+    openai_client = OpenAIClient(OpenAIConfig(api_key="test-key"), scheduler=scheduler)
+    openai_client._sync_client = lambda: fake
+
+    assert "".join(openai_client.stream("Lawyer", "SYSTEM", [], [])) == "Hello world"
+    assert recorded[-1][1] == 42
+    assert recorded[-1][0] > 0
+
+    def azure(api_version: str) -> AzureFoundryClient:
+        client = AzureFoundryClient(
+            AzureFoundryConfig(
+                endpoint="https://example.openai.azure.com",
+                deployment="gpt",
+                api_version=api_version,
+                temperature=0.2,
+                api_key="test-key",
+                azure_ad_token=None,
+            ),
+            scheduler=scheduler,
+        )
+        client._sync_client = lambda: fake
+        return client
+
+    assert "".join(azure("2024-10-21").stream("Lawyer", "SYSTEM", [], [])) == "Hello world"
+    assert fake.kwargs["stream_options"] == {"include_usage": True}
+    assert recorded[-1][1] == 42
+    list(azure("2024-02-01").stream("Lawyer", "SYSTEM", [], []))
+    assert "stream_options" not in fake.kwargs
+
+
+class _SlowLLM:
+    def complete(self, agent_name, system_prompt, conversation, documents) -> str:
+        if agent_name == "Lawyer":
+            raise DeadlineExceeded("LLM request deadline exceeded")
+        return "Recommendation: Wait.\nRationale: Time ran out."
+
+
+def test_orchestrator_ends_discussion_when_llm_deadline_passes(tmp_path: Path) -> None:
+    trace = TraceRecorder(tmp_path)
+    try:
+        orchestrator = Orchestrator(lawyer=create_lawyer(_SlowLLM()), judge=None, trace=trace)
+        result = orchestrator.run(
+            user_instruction="Question",
+            documents=[],
+            country="SK",
+            max_discussion_minutes=1,
+        )
+    finally:
+        trace.close()
+
+    assert result.final_recommendation == "Wait."
+    records = [
+        json.loads(line)
+        for line in (tmp_path / "trace.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    assert any(record["type"] == "discussion_timeout" for record in records)
@@ -1,11 +1,18 @@
+import asyncio
+import json
+import threading
+import time
 from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
 
 from aijurisdictionagents.agents import create_judge, create_lawyer
-from aijurisdictionagents.llm import MockLLMClient
+from aijurisdictionagents.llm import MockLLMClient, record_response_usage
 from aijurisdictionagents.observability import TraceRecorder
 from aijurisdictionagents.orchestration import Orchestrator
 from aijurisdictionagents.orchestration.orchestrator import _augment_prompt
-from aijurisdictionagents.schemas import Document
+from aijurisdictionagents.schemas import Document, Message
 
 
 def test_orchestrator_flow(tmp_path: Path) -> None:
@@ -47,6 +54,26 @@ def test_orchestrator_flow(tmp_path: Path) -> None:
     assert "could not answer" in result.messages[-1].content.lower()
 
 
+def test_orchestrator_accepts_user_response_provider_positionally(tmp_path: Path) -> None:
+    questions = []
+
+    def provider(question: str, _timeout: float) -> None:
+        questions.append(question)
+
+    trace = TraceRecorder(tmp_path)
+    try:
+        llm = MockLLMClient()
+        orchestrator = Orchestrator(lawyer=create_lawyer(llm), judge=create_judge(llm), trace=trace)
+        result = orchestrator.run(
+            "Late delivery dispute", [], "SK", None, 60, 15, "court", provider
+        )
+    finally:
+        trace.close()
+
+    assert questions
+    assert "could not answer" in result.messages[-1].content.lower()
+
+
 def test_orchestrator_requires_country(tmp_path: Path) -> None:
     run_dir = tmp_path / "run"
     run_dir.mkdir()
@@ -292,6 +319,25 @@ def test_court_prompt_guidance_included() -> None:
     assert "Decision: APPROVED" in judge_prompt
 
 
+def test_court_prompt_keeps_case_specific_lines_at_the_tail() -> None:
+    prompts = [
+        _augment_prompt(
+            "BASE PROMPT",
+            country=country,
+            output_language_hint=language,
+            discussion_only=True,
+            discussion_type="court",
+            role="judge",
+        )
+        for country, language in (("SK", "Slovak"), ("US", "English"))
+    ]
+
+    static_end = prompts[0].index("Jurisdiction focus:")
+    assert prompts[1].startswith(prompts[0][:static_end])
+    assert "Decision: APPROVED" in prompts[0][:static_end]
+    assert prompts[1].endswith("Respond in English.")
+
+
 def test_discussion_prompt_respects_language_override() -> None:
     base_prompt = "BASE PROMPT"
     prompt = _augment_prompt(
@@ -339,3 +385,436 @@ def test_orchestrator_advice_without_judge(tmp_path: Path) -> None:
         trace.close()
 
     assert result.final_recommendation
+
+
+def test_orchestrator_arun_drives_concurrent_discussions(tmp_path: Path) -> None:
+    state = {"active": 0, "peak": 0}
+
+    class AsyncLLM:
+        def complete(self, agent_name: str, _prompt: str, _conv, _docs) -> str:
+            raise AssertionError("arun should not use the blocking client.")
+
+        async def acomplete(self, agent_name: str, _prompt: str, _conv, _docs) -> str:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            if agent_name == "Judge":
+                return "Decision: APPROVED"
+            if agent_name == "Lawyer":
+                return "LAWYER RESPONSE"
+            return "Recommendation: OK\nRationale: OK"
+
+    async def run_all() -> list:
+        runs = []
+        traces = []
+        for index in range(10):
+            run_dir = tmp_path / f"run-{index}"
+            run_dir.mkdir()
+            trace = TraceRecorder(run_dir)
+            traces.append(trace)
+            llm = AsyncLLM()
+            orchestrator = Orchestrator(
+                lawyer=create_lawyer(llm),
+                judge=create_judge(llm),
+                trace=trace,
+            )
+            runs.append(
+                orchestrator.arun(
+                    "Late delivery dispute",
+                    [],
+                    country="SK",
+                    discussion_type="court",
+                    question_timeout_seconds=60,
+                )
+            )
+        try:
+            return await asyncio.gather(*runs)
+        finally:
+            for trace in traces:
+                trace.close()
+
+    results = asyncio.run(run_all())
+
+    assert len(results) == 10
+    assert all(result.final_recommendation == "OK" for result in results)
+    assert state["peak"] > 1
+
+
+def test_orchestrator_arun_awaits_async_user_provider(tmp_path: Path) -> None:
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+
+    prompts: list[str] = []
+
+    async def provider(prompt: str, _timeout: float) -> str | None:
+        prompts.append(prompt)
+        return "finish"
+
+    trace = TraceRecorder(run_dir)
+    try:
+        llm = MockLLMClient()
+        orchestrator = Orchestrator(
+            lawyer=create_lawyer(llm),
+            judge=create_judge(llm),
+            trace=trace,
+        )
+        result = asyncio.run(
+            orchestrator.arun(
+                "Late delivery dispute",
+                [],
+                country="SK",
+                question_timeout_seconds=60,
+                max_discussion_minutes=0,
+                discussion_type="court",
+                user_response_provider=provider,
+            )
+        )
+    finally:
+        trace.close()
+
+    assert result.messages[-1].content == "finish"
+    assert len(prompts) == 1
+
+
+def test_orchestrator_streams_chunks_and_traces_final_message_once(tmp_path: Path) -> None:
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+
+    chunks: list[Message] = []
+    trace = TraceRecorder(run_dir)
+    try:
+        llm = MockLLMClient()
+        orchestrator = Orchestrator(
+            lawyer=create_lawyer(llm),
+            judge=None,
+            trace=trace,
+            on_message_chunk=chunks.append,
+        )
+        result = orchestrator.run(
+            "Late delivery dispute",
+            [],
+            country="SK",
+            question_timeout_seconds=60,
+            discussion_type="advice",
+        )
+    finally:
+        trace.close()
+
+    lawyer_messages = [message for message in result.messages if message.agent_name == "Lawyer"]
+    assert len(chunks) > 1
+    assert "".join(chunk.content for chunk in chunks).strip() == lawyer_messages[0].content
+    records = [
+        json.loads(line)
+        for line in (run_dir / "trace.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    traced = [
+        record
+        for record in records
+        if record["type"] == "message" and record["message"]["agent_name"] == "Lawyer"
+    ]
+    assert len(traced) == 1
+
+
+def test_orchestrator_arun_streams_chunks(tmp_path: Path) -> None:
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+
+    chunks: list[Message] = []
+
+    async def handler(chunk: Message) -> None:
+        chunks.append(chunk)
+
+    trace = TraceRecorder(run_dir)
+    try:
+        llm = MockLLMClient()
+        orchestrator = Orchestrator(
+            lawyer=create_lawyer(llm),
+            judge=create_judge(llm),
+            trace=trace,
+            on_message_chunk=handler,
+        )
+        result = asyncio.run(
+            orchestrator.arun(
+                "Late delivery dispute",
+                [],
+                country="SK",
+                question_timeout_seconds=60,
+                discussion_type="court",
+            )
+        )
+    finally:
+        trace.close()
+
+    assert {chunk.agent_name for chunk in chunks} == {"Lawyer", "Judge"}
+    assert result.messages[1].content.startswith("Legal position:")
+
+
+def test_orchestrator_compacts_long_history(tmp_path: Path) -> None:
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+
+    calls: list[tuple[str, list[Message]]] = []
+
+    class RecordingLLM:
+        def complete(self, agent_name: str, _prompt: str, conv, _docs) -> str:
+            calls.append((agent_name, list(conv)))
+            if agent_name == "HistorySummary":
+                return f"summary {len(calls)}"
+            if agent_name == "Lawyer":
+                return "LAWYER RESPONSE"
+            return "Recommendation: OK\nRationale: OK"
+
+    followups = iter([f"Follow-up {idx}" for idx in range(12)] + ["finish"])
+
+    def provider(_prompt: str, _timeout: float) -> str | None:
+        return next(followups)
+
+    trace = TraceRecorder(run_dir)
+    try:
+        orchestrator = Orchestrator(
+            lawyer=create_lawyer(RecordingLLM()),
+            judge=None,
+            trace=trace,
+            history_keep_messages=3,
+        )
+        result = orchestrator.run(
+            "Late delivery dispute",
+            [],
+            country="SK",
+            question_timeout_seconds=60,
+            max_discussion_minutes=0,
+            user_response_provider=provider,
+        )
+    finally:
+        trace.close()
+
+    lawyer_calls = [conv for name, conv in calls if name == "Lawyer"]
+    summary_calls = [conv for name, conv in calls if name == "HistorySummary"]
+    assert len(result.messages) == 27
+    assert max(len(conv) for conv in lawyer_calls) <= 2 + 2 * 3
+    assert lawyer_calls[-1][0].content == "Late delivery dispute"
+    assert lawyer_calls[-1][1].agent_name == "DiscussionSummary"
+    assert len(summary_calls) >= 3
+    assert all(len(conv) <= 1 + 3 + 1 for conv in summary_calls)
+    assert all(conv[0].agent_name == "DiscussionSummary" for conv in summary_calls[1:])
+
+
+def _trace_events(run_dir: Path, event_type: str) -> list[dict]:
+    records = [
+        json.loads(line)
+        for line in (run_dir / "trace.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    return [record for record in records if record["type"] == event_type]
+
+
+def test_court_speculative_summary_runs_alongside_judge(tmp_path: Path) -> None:
+    both_started = threading.Barrier(2, timeout=5)
+    calls: list[str] = []
+
+    class CourtLLM:
+        def complete(self, agent_name: str, _prompt: str, _conv, _docs) -> str:
+            calls.append(agent_name)
+            if agent_name == "Lawyer":
+                return "LAWYER RESPONSE"
+            both_started.wait()
+            if agent_name == "Judge":
+                return "Decision: APPROVED"
+            return "Recommendation: Sue.\nRationale: Approved advice."
+
+    trace = TraceRecorder(tmp_path)
+    try:
+        llm = CourtLLM()
+        orchestrator = Orchestrator(
+            lawyer=create_lawyer(llm),
+            judge=create_judge(llm),
+            trace=trace,
+            speculative_summary=True,
+        )
+        result = orchestrator.run(
+            "Late delivery dispute",
+            [],
+            country="SK",
+            discussion_type="court",
+            max_discussion_minutes=0,
+        )
+    finally:
+        trace.close()
+
+    assert result.final_recommendation == "Sue."
+    assert calls.count("FinalSummary") == 1
+    events = _trace_events(tmp_path, "speculative_summary")
+    assert [event["used"] for event in events] == [True]
+
+
+def test_court_speculative_summary_discarded_on_rejection(tmp_path: Path) -> None:
+    state = {"judge_calls": 0}
+    stale_started = threading.Event()
+    release = threading.Event()
+
+    class CourtLLM:
+        def complete(self, agent_name: str, _prompt: str, conv, _docs) -> str:
+            if agent_name == "Judge":
+                state["judge_calls"] += 1
+                if state["judge_calls"] == 1:
+                    stale_started.wait(5)
+                    return "Decision: REJECTED"
+                return "Decision: APPROVED"
+            if agent_name == "Lawyer":
+                return f"LAWYER RESPONSE {state['judge_calls']}"
+            if not any("REJECTED" in message.content for message in conv):
+                # The summary speculated alongside the rejecting judge must not be waited on.
+                stale_started.set()
+                release.wait(5)
+                return "Recommendation: Stale.\nRationale: OK"
+            return "Recommendation: Fresh.\nRationale: OK"
+
+    threads_before = set(threading.enumerate())
+    trace = TraceRecorder(tmp_path)
+    try:
+        llm = CourtLLM()
+        orchestrator = Orchestrator(
+            lawyer=create_lawyer(llm),
+            judge=create_judge(llm),
+            trace=trace,
+            speculative_summary=True,
+        )
+        started = time.monotonic()
+        result = orchestrator.run(
+            "Late delivery dispute",
+            [],
+            country="SK",
+            discussion_type="court",
+            max_discussion_minutes=0,
+        )
+        elapsed = time.monotonic() - started
+    finally:
+        # Let the abandoned summary finish before closing, so a late trace write would show up.
+        release.set()
+        for thread in set(threading.enumerate()) - threads_before:
+            thread.join(timeout=5)
+        trace.close()
+
+    assert elapsed < 4
+    assert result.final_recommendation == "Fresh."
+    events = _trace_events(tmp_path, "speculative_summary")
+    assert [event["used"] for event in events] == [False, True]
+    assert events[0]["cancelled"] is True
+    records = (tmp_path / "trace.jsonl").read_text(encoding="utf-8").splitlines()
+    assert json.loads(records[-1])["type"] == "run_summary"
+    timings = _trace_events(tmp_path, "turn_timing")
+    assert [timing["kind"] for timing in timings].count("summary") == 1
+
+
+def test_court_speculative_summary_overlaps_judge_in_arun(tmp_path: Path) -> None:
+    in_flight = {"count": 0}
+
+    class AsyncCourtLLM:
+        def complete(self, agent_name: str, _prompt: str, _conv, _docs) -> str:
+            raise AssertionError("arun should use acomplete")
+
+        async def acomplete(self, agent_name: str, _prompt: str, _conv, _docs) -> str:
+            if agent_name == "Lawyer":
+                return "LAWYER RESPONSE"
+            in_flight["count"] += 1
+            while in_flight["count"] < 2:
+                await asyncio.sleep(0.001)
+            if agent_name == "Judge":
+                return "Decision: APPROVED"
+            return "Recommendation: Sue.\nRationale: Approved advice."
+
+    trace = TraceRecorder(tmp_path)
+    try:
+        llm = AsyncCourtLLM()
+        orchestrator = Orchestrator(
+            lawyer=create_lawyer(llm),
+            judge=create_judge(llm),
+            trace=trace,
+            speculative_summary=True,
+        )
+        result = asyncio.run(
+            asyncio.wait_for(
+                orchestrator.arun(
+                    "Late delivery dispute",
+                    [],
+                    country="SK",
+                    discussion_type="court",
+                    max_discussion_minutes=0,
+                ),
+                timeout=5,
+            )
+        )
+    finally:
+        trace.close()
+
+    assert result.final_recommendation == "Sue."
+
+
+def test_trace_records_turn_timing_and_run_summary(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("LLM_PRICE_PER_1K_PROMPT_TOKENS", "0.5")
+    monkeypatch.setenv("LLM_PRICE_PER_1K_COMPLETION_TOKENS", "1.5")
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+
+    class MeteredLLM:
+        def complete(self, agent_name: str, _prompt: str, _conv, _docs) -> str:
+            completion = 40 if agent_name == "Judge" else 10
+            record_response_usage(
+                SimpleNamespace(
+                    usage=SimpleNamespace(
+                        prompt_tokens=100,
+                        completion_tokens=completion,
+                        total_tokens=100 + completion,
+                    )
+                )
+            )
+            if agent_name == "Judge":
+                time.sleep(0.02)
+                return "Decision: APPROVED. What is the invoice date?"
+            if agent_name == "Lawyer":
+                return "LAWYER RESPONSE"
+            return "Recommendation: Pay.\nRationale: Approved."
+
+    def provider(prompt: str, _timeout: float) -> str | None:
+        time.sleep(0.01)
+        return "finish"
+
+    trace = TraceRecorder(run_dir)
+    try:
+        llm = MeteredLLM()
+        Orchestrator(
+            lawyer=create_lawyer(llm),
+            judge=create_judge(llm),
+            trace=trace,
+        ).run(
+            "Unpaid invoice",
+            [],
+            country="SK",
+            max_discussion_minutes=0,
+            discussion_type="court",
+            user_response_provider=provider,
+        )
+    finally:
+        trace.close()
+
+    turns = _trace_events(run_dir, "turn_timing")
+    assert [(turn["kind"], turn["name"]) for turn in turns] == [
+        ("agent", "Lawyer"),
+        ("agent", "Judge"),
+        ("user", "User"),
+        ("summary", "FinalSummary"),
+    ]
+    assert turns[1]["total_tokens"] == 140
+    assert turns[2]["llm_calls"] == 0
+    assert turns[2]["duration_ms"] >= 10
+
+    (summary,) = _trace_events(run_dir, "run_summary")
+    assert summary["turns"] == 4
+    assert summary["llm_calls"] == 3
+    assert summary["prompt_tokens"] == 300
+    assert summary["completion_tokens"] == 60
+    assert summary["cost_estimate"] == pytest.approx(0.24)
+    assert summary["slowest_turn"]["name"] == "Judge"
+    assert summary["user_wait_ms"] >= 10
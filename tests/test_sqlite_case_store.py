@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from aijurisdictionagents.cases import (
+    CaseStore,
+    SQLiteCaseStore,
+    case_store_from_env,
+    migrate_case_folders,
+)
+from aijurisdictionagents.cases import store as store_module
+from aijurisdictionagents.schemas import Message, OrchestrationResult
+
+
+def _messages(question: str) -> list[Message]:
+    return [
+        Message(role="user", agent_name="User", content="Initial instruction", sources=[]),
+        Message(role="assistant", agent_name="LawyerSlovakia", content=question, sources=[]),
+    ]
+
+
+def _create(store: CaseStore, country: str, question: str, data_dir: Path | None = None):
+    messages = _messages(question)
+    return store.create_case(
+        instruction="Unpaid invoice",
+        country=country,
+        language="en",
+        messages=messages,
+        result=OrchestrationResult(
+            final_recommendation="Send a demand letter.",
+            judge_rationale="",
+            citations=[],
+            messages=messages,
+        ),
+        agent_name="LawyerSlovakia",
+        data_dir=data_dir,
+    )
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    ticks = (start + timedelta(days=day) for day in range(1000))
+    monkeypatch.setattr(store_module, "_now", lambda: next(ticks))
+    yield
+
+
+def test_sqlite_store_round_trips_cases_without_case_json(tmp_path: Path) -> None:
+    store = SQLiteCaseStore(tmp_path / "cases")
+    try:
+        record = _create(store, "SK", "When was the invoice sent?")
+        followup = _messages("Do you have delivery confirmation?")
+        store.append_discussion(
+            case_id=record.case_id,
+            messages=followup,
+            result=OrchestrationResult(
+                final_recommendation="", judge_rationale="", citations=[], messages=followup
+            ),
+            agent_name="LawyerSlovakia",
+            data_dir=None,
+        )
+
+        loaded = store.load_case(record.case_id)
+        journal_mode = store._connection.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        store.close()
+
+    assert journal_mode == "wal"
+    assert len(loaded.data["discussions"]) == 2
+    assert loaded.data["open_questions"] == ["Do you have delivery confirmation?"]
+    assert loaded.path == record.path
+    assert not (record.path / "case.json").exists()
+    assert len(list((record.path / "discussions").iterdir())) == 2
+
+
+def test_list_cases_filters_and_pages_on_indexed_columns(tmp_path: Path, clock: None) -> None:
+    store = SQLiteCaseStore(tmp_path / "cases")
+    try:
+        slovak = [_create(store, "SK", f"Question {idx}?") for idx in range(5)]
+        _create(store, "CZ", "Question for Czechia?")
+        answered = _create(store, "sk", "No open questions here.")
+
+        newest = store.list_cases(country="SK", has_open_questions=True, limit=2)
+        second_page = store.list_cases(country="SK", has_open_questions=True, limit=2, offset=2)
+        oldest = store.list_cases(country="sk", newest_first=False, limit=1)
+        recent = store.list_cases(created_after=datetime(2025, 1, 7, tzinfo=timezone.utc))
+        plan = store._connection.execute(
+            "EXPLAIN QUERY PLAN SELECT case_id FROM cases WHERE country = ? AND status = ?",
+            ("SK", "intake_open"),
+        ).fetchall()
+
+        assert [r.case_id for r in newest] == [slovak[4].case_id, slovak[3].case_id]
+        assert [r.case_id for r in second_page] == [slovak[2].case_id, slovak[1].case_id]
+        assert [r.case_id for r in oldest] == [slovak[0].case_id]
+        assert [r.case_id for r in recent] == [answered.case_id]
+        assert store.count_cases(country="SK") == 6
+        assert store.count_cases(status="intake_open", has_open_questions=False) == 1
+        assert any("cases_country" in row[-1] for row in plan)
+        with pytest.raises(ValueError):
+            store.list_cases(limit=0)
+    finally:
+        store.close()
+
+
+def test_migration_imports_case_folders_once(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "contract.txt").write_text("Contract text", encoding="utf-8")
+    source = tmp_path / "legacy"
+    legacy = CaseStore(source)
+    first = _create(legacy, "SK", "When was payment made?", data_dir)
+    second = _create(legacy, "SK", "Who signed the contract?")
+    broken = source / "broken"
+    broken.mkdir()
+    (broken / "case.json").write_text("{not json", encoding="utf-8")
+
+    store = SQLiteCaseStore(tmp_path / "cases")
+    try:
+        report = migrate_case_folders(source, store)
+        rerun = migrate_case_folders(source, store)
+        loaded = store.load_case(first.case_id)
+        listed = {record.case_id for record in store.list_cases()}
+    finally:
+        store.close()
+
+    assert (report.imported, report.skipped, report.failed) == (2, 0, ["broken"])
+    assert (rerun.imported, rerun.skipped) == (0, 2)
+    assert loaded.data == first.data
+    assert listed == {first.case_id, second.case_id}
+    assert len(list((loaded.path / "documents").iterdir())) == 1
+    assert not (loaded.path / "case.json").exists()
+
+
+def test_case_store_from_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("CASE_STORE", raising=False)
+    assert type(case_store_from_env(tmp_path / "files")) is CaseStore
+
+    monkeypatch.setenv("CASE_STORE", "sqlite")
+    monkeypatch.setenv("CASE_STORE_DB", str(tmp_path / "db" / "cases.sqlite3"))
+    store = case_store_from_env(tmp_path / "cases")
+    assert isinstance(store, SQLiteCaseStore)
+    assert store.db_path == tmp_path / "db" / "cases.sqlite3"
+    store.close()
+
+    monkeypatch.setenv("CASE_STORE", "postgres")
+    with pytest.raises(ValueError):
+        case_store_from_env(tmp_path / "cases")
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Tuple
+
+import pytest
+
+from aijurisdictionagents import telemetry
+from aijurisdictionagents.agents import create_judge, create_lawyer
+from aijurisdictionagents.cases import CaseStore
+from aijurisdictionagents.documents import load_documents
+from aijurisdictionagents.llm import record_response_usage
+from aijurisdictionagents.llm.scheduler import RequestScheduler
+from aijurisdictionagents.observability import TraceRecorder
+from aijurisdictionagents.orchestration import Orchestrator
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+TRACEPARENT = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def otel() -> Iterator[Tuple[Any, Any]]:
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+    reader = InMemoryMetricReader()
+    telemetry.configure_telemetry(tracer_provider, MeterProvider(metric_readers=[reader]))
+    try:
+        yield exporter, reader
+    finally:
+        telemetry.configure_telemetry()
+
+
+class _ScheduledLLM:
+    def __init__(self) -> None:
+        self.scheduler = RequestScheduler()
+
+    def complete(self, agent_name: str, _prompt: str, _conv, _docs) -> str:
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=20, total_tokens=120)
+        response = self.scheduler.call(lambda _timeout: SimpleNamespace(usage=usage))
+        record_response_usage(response)
+        if agent_name == "Judge":
+            return "Decision: APPROVED."
+        if agent_name == "Lawyer":
+            return "LAWYER RESPONSE"
+        return "Recommendation: Pay.\nRationale: Approved."
+
+
+def _histograms(reader: Any) -> Dict[str, list]:
+    points: Dict[str, list] = {}
+    for resource_metrics in reader.get_metrics_data().resource_metrics:
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                points.setdefault(metric.name, []).extend(metric.data.data_points)
+    return points
+
+
+def test_request_trace_covers_documents_orchestration_and_case_store(
+    tmp_path: Path, otel: Tuple[Any, Any]
+) -> None:
+    exporter, reader = otel
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "invoice.txt").write_text("Invoice 42 is unpaid.", encoding="utf-8")
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+
+    trace = TraceRecorder(run_dir)
+    try:
+        with telemetry.request_span("POST /cases", "req-7", headers={"traceparent": TRACEPARENT}):
+            documents = load_documents(data_dir)
+            llm = _ScheduledLLM()
+            result = Orchestrator(
+                lawyer=create_lawyer(llm),
+                judge=create_judge(llm),
+                trace=trace,
+            ).run("Unpaid invoice", documents, country="SK", discussion_type="court")
+            CaseStore(tmp_path / "cases").create_case(
+                instruction="Unpaid invoice",
+                country="SK",
+                language=None,
+                messages=result.messages,
+                result=result,
+                agent_name="Lawyer",
+                data_dir=data_dir,
+            )
+    finally:
+        trace.close()
+
+    spans = {span.context.span_id: span for span in exporter.get_finished_spans()}
+    by_name: Dict[str, list] = {}
+    for span in spans.values():
+        by_name.setdefault(span.name, []).append(span)
+
+    assert {format(span.context.trace_id, "032x") for span in spans.values()} == {TRACE_ID}
+    (request,) = by_name["POST /cases"]
+    (run,) = by_name["orchestration.run"]
+    (load,) = by_name["documents.load"]
+    (create,) = by_name["case_store.create_case"]
+    for child in (run, load, create):
+        assert child.parent.span_id == request.context.span_id
+        assert child.attributes["request.id"] == "req-7"
+    assert load.attributes["documents.count"] == 1
+    assert run.attributes["discussion.type"] == "court"
+
+    turns = [span for span in spans.values() if span.name.startswith("orchestration.turn.")]
+    assert {span.parent.span_id for span in turns} == {run.context.span_id}
+    judge = next(span for span in turns if span.attributes["agent.name"] == "Judge")
+    assert judge.attributes["llm.prompt_tokens"] == 100
+    assert judge.attributes["turn.status"] == "ok"
+
+    llm_requests = by_name["llm.request"]
+    assert len(llm_requests) == len(turns)
+    assert {spans[span.parent.span_id].name for span in llm_requests} <= {
+        span.name for span in turns
+    }
+    assert all(span.attributes["llm.attempts"] == 1 for span in llm_requests)
+
+    histograms = _histograms(reader)
+    operations = {
+        point.attributes["operation"] for point in histograms[telemetry.OPERATION_DURATION]
+    }
+    assert {"orchestration.run", "orchestration.turn.agent", "llm.request"} <= operations
+    tokens = {
+        point.attributes["token.type"]: point.sum for point in histograms[telemetry.LLM_TOKENS]
+    }
+    assert tokens == {"prompt": 100 * len(turns), "completion": 20 * len(turns)}
+
+
+def test_failed_span_records_error_status(tmp_path: Path, otel: Tuple[Any, Any]) -> None:
+    exporter, reader = otel
+
+    with pytest.raises(FileNotFoundError):
+        CaseStore(tmp_path / "cases").append_discussion(
+            case_id="missing",
+            messages=[],
+            result=None,  # type: ignore[arg-type]
+            agent_name="Lawyer",
+            data_dir=None,
+        )
+
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "case_store.append_discussion"
+    assert not span.status.is_ok
+    (point,) = _histograms(reader)[telemetry.OPERATION_DURATION]
+    assert point.attributes["status"] == "error"
+    assert point.attributes["error.type"] == "FileNotFoundError"
+
+
+def test_spans_are_noops_without_opentelemetry(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(telemetry, "otel_trace", None)
+    monkeypatch.setattr(telemetry, "otel_metrics", None)
+
+    with telemetry.request_span("GET /health", "req-1") as request:
+        assert telemetry.current_request_id() == "req-1"
+        with telemetry.span("orchestration.run") as current:
+            telemetry.set_attributes(current, {"documents.count": 1})
+            telemetry.record_tokens(10, 5)
+
+    assert request is None and current is None
+    assert telemetry.current_request_id() is None
+    assert telemetry.configure_telemetry_from_env() is False